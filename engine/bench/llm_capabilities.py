@@ -0,0 +1,128 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+
+from aiohttp import web
+
+from gabber.lib.llm.capabilities import CapabilityStore, resolve_capabilities
+from gabber.lib.llm.openai_compatible import OpenAICompatibleLLM
+from gabber.lib.llm.token_estimator import DEFAULT_TOKEN_ESTIMATOR
+
+MODEL = "fake-model"
+
+
+async def fake_completions(request: web.Request) -> web.StreamResponse:
+    """Takes probe_s to look at a request, then rejects video like a text
+    only model or streams a one token answer."""
+    app = request.app
+    app["counts"]["requests"] += 1
+    body = await request.json()
+    await asyncio.sleep(app["probe_s"])
+    has_video = any(
+        isinstance(msg["content"], list)
+        and any(part.get("type") == "video_url" for part in msg["content"])
+        for msg in body["messages"]
+    )
+    if has_video and not app["video"]:
+        return web.json_response(
+            {"error": {"message": "video input is not supported"}}, status=400
+        )
+
+    res = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+    await res.prepare(request)
+    chunk = {
+        "id": "bench",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": MODEL,
+        "choices": [{"index": 0, "delta": {"content": "."}, "finish_reason": None}],
+    }
+    await res.write(f"data: {json.dumps(chunk)}\n\n".encode())
+    await res.write(b"data: [DONE]\n\n")
+    return res
+
+
+async def job(args, base_url: str, store: CapabilityStore, override: bool):
+    """What an LLM node does at startup before it can make its first request."""
+    llm = OpenAICompatibleLLM(
+        base_url=base_url,
+        api_key="bench",
+        headers={},
+        model=MODEL,
+        max_context_len=32768,
+        token_estimator=DEFAULT_TOKEN_ESTIMATOR,
+    )
+    start = time.monotonic()
+    await resolve_capabilities(
+        llm,
+        base_url=base_url,
+        model=MODEL,
+        store=store,
+        logger=logging.getLogger("bench"),
+        video_override=args.video if override else None,
+        audio_override=False if override else None,
+    )
+    return time.monotonic() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="LLM node startup time spent on capability probing against a"
+        " local fake OpenAI-compatible server"
+    )
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--probe-ms", type=float, default=300.0)
+    parser.add_argument("--jobs", type=int, default=5)
+    parser.add_argument("--video", action="store_true")
+    args = parser.parse_args()
+
+    app = web.Application()
+    app["probe_s"] = args.probe_ms / 1000
+    app["video"] = args.video
+    app["counts"] = {"requests": 0}
+    app.router.add_post("/v1/chat/completions", fake_completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+    base_url = f"http://127.0.0.1:{args.port}/v1"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "llm_capabilities.json")
+        cases = [
+            # Every job probes, as before the store existed
+            ("no_cache", lambda: CapabilityStore(None), False),
+            # Each job is a fresh process reading the same file
+            ("disk_cache", lambda: CapabilityStore(path), False),
+            ("override", lambda: CapabilityStore(None), True),
+        ]
+        for name, make_store, override in cases:
+            app["counts"]["requests"] = 0
+            times = [
+                await job(args, base_url, make_store(), override)
+                for _ in range(args.jobs)
+            ]
+            print(
+                json.dumps(
+                    {
+                        "store": name,
+                        "first_job_ms": round(times[0] * 1000, 1),
+                        "later_jobs_mean_ms": round(
+                            sum(times[1:]) / max(1, len(times) - 1) * 1000, 1
+                        ),
+                        "probe_requests": app["counts"]["requests"],
+                    }
+                )
+            )
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
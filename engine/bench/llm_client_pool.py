@@ -0,0 +1,161 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import argparse
+import asyncio
+import json
+import time
+
+import openai
+from aiohttp import web
+
+from gabber.core.types import runtime
+from gabber.lib.llm.llm import LLMRequest
+from gabber.lib.llm.openai_compatible import openai_compatible_llm
+from gabber.lib.llm.openai_compatible.openai_compatible_llm import OpenAICompatibleLLM
+from gabber.lib.llm.token_estimator import DEFAULT_TOKEN_ESTIMATOR
+
+MODEL = "fake-model"
+REQUEST = LLMRequest(
+    context=[
+        runtime.ContextMessage(
+            role=runtime.ContextMessageRoleEnum.USER,
+            content=[runtime.ContextMessageContentItem_Text(content="Hi")],
+            tool_calls=[],
+        )
+    ],
+    tool_definitions=[],
+)
+
+
+def chunk(content: str) -> bytes:
+    data = {
+        "id": "bench",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": MODEL,
+        "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+    }
+    return f"data: {json.dumps(data)}\n\n".encode()
+
+
+def on_new_connection(request: web.Request) -> float:
+    """Setup delay for the request's connection, paid by its first request.
+
+    Stands in for the TCP and TLS round trips to a remote endpoint, which a
+    loopback server doesn't have."""
+    app = request.app
+    transport = request.transport
+    if transport is None or transport in app["connections"]:
+        return 0.0
+    app["connections"].add(transport)
+    return app["connect_s"]
+
+
+async def fake_models(request: web.Request) -> web.Response:
+    await asyncio.sleep(on_new_connection(request))
+    return web.json_response({"object": "list", "data": []})
+
+
+async def fake_completions(request: web.Request) -> web.StreamResponse:
+    await asyncio.sleep(on_new_connection(request) + request.app["first_token_s"])
+    res = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+    await res.prepare(request)
+    for word in ("Hello", " there", "."):
+        await res.write(chunk(word))
+    await res.write(b"data: [DONE]\n\n")
+    return res
+
+
+async def first_token(llm: OpenAICompatibleLLM) -> float:
+    start = time.monotonic()
+    handle = await llm.create_completion(
+        request=REQUEST, audio_support=False, video_support=False
+    )
+    ttft = 0.0
+    async for delta in handle:
+        if delta.content and not ttft:
+            ttft = time.monotonic() - start
+    return ttft
+
+
+async def job(args, base_url: str, *, shared: bool, prewarm: bool) -> list[float]:
+    """One LLM node: created at graph start, its first turn comes a little
+    later and the next after the user has been quiet for a while."""
+    llm = OpenAICompatibleLLM(
+        base_url=base_url,
+        api_key="bench",
+        headers={},
+        model=MODEL,
+        max_context_len=32768,
+        token_estimator=DEFAULT_TOKEN_ESTIMATOR,
+    )
+    if not shared:
+        # What every node did before the registry: a client of its own with
+        # httpx's default keep-alive
+        llm._client = openai.AsyncClient(api_key="bench", base_url=base_url)
+    if prewarm:
+        asyncio.create_task(llm.prewarm())
+    await asyncio.sleep(args.first_turn_s)
+    first = await first_token(llm)
+    await asyncio.sleep(args.idle_s)
+    after_idle = await first_token(llm)
+    return [first, after_idle]
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Time to first token of an LLM node's first turn and of a"
+        " turn after an idle gap, against a local fake streaming server"
+    )
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--connect-ms", type=float, default=150.0)
+    parser.add_argument("--first-token-ms", type=float, default=100.0)
+    # Time from graph start to the first user turn
+    parser.add_argument("--first-turn-s", type=float, default=0.5)
+    parser.add_argument("--idle-s", type=float, default=6.0)
+    parser.add_argument("--jobs", type=int, default=2)
+    args = parser.parse_args()
+
+    app = web.Application()
+    app["connect_s"] = args.connect_ms / 1000
+    app["first_token_s"] = args.first_token_ms / 1000
+    app["connections"] = set()
+    app.router.add_get("/v1/models", fake_models)
+    app.router.add_post("/v1/chat/completions", fake_completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+    base_url = f"http://127.0.0.1:{args.port}/v1"
+
+    cases = [
+        ("per_node_client", False, False),
+        ("shared_client", True, False),
+        ("shared_client_prewarm", True, True),
+    ]
+    for name, shared, prewarm in cases:
+        openai_compatible_llm._clients.clear()
+        # Jobs run one after another in the same engine process
+        results = [
+            await job(args, base_url, shared=shared, prewarm=prewarm)
+            for _ in range(args.jobs)
+        ]
+        firsts = [r[0] for r in results]
+        idles = [r[1] for r in results]
+        print(
+            json.dumps(
+                {
+                    "client": name,
+                    "first_turn_ttft_ms": round(sum(firsts) / len(firsts) * 1000, 1),
+                    "after_idle_ttft_ms": round(sum(idles) / len(idles) * 1000, 1),
+                    "connections": len(app["connections"]),
+                }
+            )
+        )
+        app["connections"].clear()
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+
+from gabber.lib.llm.llm import AsyncLLMResponseHandle, LLMRequest
+from gabber.lib.llm.mock import MockLLM
+from gabber.lib.llm.request_policy import RequestPolicy, RequestScheduler
+
+# Seconds at which user turns arrive, in bursts like fragmented STT turns
+ARRIVALS = [0.0, 0.3, 0.35, 0.4, 1.5, 1.6, 3.0, 3.05, 3.1, 4.5, 4.55]
+
+
+@dataclass
+class Generation:
+    # How many turns the request's context included
+    turns: int
+    tokens: int = 0
+    cancelled: bool = False
+    finished_at: float = 0.0
+
+
+class Bench:
+    def __init__(self, args):
+        self.llm = MockLLM(first_token_s=args.first_token_ms / 1000)
+        self.arrived = 0
+        self.generations: list[Generation] = []
+        self._started: dict[int, tuple[Generation, AsyncLLMResponseHandle]] = {}
+        self.start = time.monotonic()
+
+    async def start_request(self, turn: int) -> asyncio.Task:
+        # Like LLMContext, the request sees every turn that has arrived
+        gen = Generation(turns=self.arrived)
+        self.generations.append(gen)
+        handle = self.llm.create_generation(LLMRequest(context=[], tool_definitions=[]))
+        self._started[turn] = (gen, handle)
+        return asyncio.create_task(self._consume(handle, gen))
+
+    def cancel_request(self, turn: int):
+        gen, handle = self._started[turn]
+        gen.cancelled = True
+        handle.cancel()
+
+    async def _consume(self, handle: AsyncLLMResponseHandle, gen: Generation):
+        async for _ in handle:
+            gen.tokens += 1
+        gen.finished_at = time.monotonic() - self.start
+
+    async def arrivals(self, submit):
+        for i, at in enumerate(ARRIVALS):
+            await asyncio.sleep(max(0.0, at - (time.monotonic() - self.start)))
+            self.arrived = i + 1
+            submit(i)
+
+    def summary(self, name: str, stats: dict | None = None) -> dict:
+        answered = [g for g in self.generations if not g.cancelled]
+        covered = max((g.turns for g in answered), default=0)
+        last_answer_ms = None
+        if covered == len(ARRIVALS):
+            last = max(answered, key=lambda g: g.turns)
+            last_answer_ms = round((last.finished_at - ARRIVALS[-1]) * 1000)
+        res = {
+            "policy": name,
+            "turns": len(ARRIVALS),
+            "generations": len(self.generations),
+            "tokens": sum(g.tokens for g in self.generations),
+            "unanswered_turns": len(ARRIVALS) - covered,
+            # From the last turn arriving to the end of the answer to it
+            "last_answer_ms": last_answer_ms,
+        }
+        if stats is not None:
+            res.update(stats)
+        return res
+
+
+async def run_skip(args) -> dict:
+    # What BaseLLM did before request policies: drop turns while busy
+    bench = Bench(args)
+    running: asyncio.Task | None = None
+    pending: list[asyncio.Task] = []
+
+    def submit(turn: int):
+        nonlocal running
+        if running is not None and not running.done():
+            return
+
+        async def start():
+            await (await bench.start_request(turn))
+
+        running = asyncio.create_task(start())
+        pending.append(running)
+
+    await bench.arrivals(submit)
+    await asyncio.gather(*pending)
+    return bench.summary("skip")
+
+
+async def run_policy(args, policy: RequestPolicy) -> dict:
+    bench = Bench(args)
+    dropped: list[int] = []
+    scheduler = RequestScheduler[int](
+        start=bench.start_request,
+        drop=dropped.append,
+        cancel=bench.cancel_request,
+        logger=logging.getLogger("bench"),
+    )
+    scheduler_t = asyncio.create_task(scheduler.run())
+    await bench.arrivals(lambda turn: scheduler.submit(turn, policy))
+    while scheduler.busy or bench.generations[-1].turns < len(ARRIVALS):
+        await asyncio.sleep(0.01)
+    scheduler_t.cancel()
+
+    # Every turn either ran or was folded into a later request
+    ran = len(bench.generations)
+    assert ran + len(dropped) == len(ARRIVALS), (ran, dropped)
+    assert scheduler.stats.coalesced == len(dropped)
+    return bench.summary(policy.value, scheduler.stats.to_dict())
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Turns answered, work done and answer latency for bursty"
+        " run triggers under each request policy"
+    )
+    parser.add_argument("--first-token-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    print(json.dumps(await run_skip(args)))
+    for policy in RequestPolicy:
+        print(json.dumps(await run_policy(args, policy)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
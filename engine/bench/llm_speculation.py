@@ -0,0 +1,168 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from gabber.core.types import runtime
+from gabber.lib.llm.llm import AsyncLLMResponseHandle, LLMRequest
+from gabber.lib.llm.mock import MockLLM
+from gabber.lib.llm.speculation import (
+    Speculation,
+    SpeculationStats,
+    normalize_transcript,
+    transcript_message,
+)
+
+SYSTEM = runtime.ContextMessage(
+    role=runtime.ContextMessageRoleEnum.SYSTEM,
+    content=[runtime.ContextMessageContentItem_Text(content="Be brief.")],
+    tool_calls=[],
+)
+
+
+@dataclass
+class Turn:
+    # Words as the STT hears them, "|" marks a pause mid-turn
+    spoken: str
+    # What the STT settles on at the end of the turn
+    final: str
+
+
+TURNS = [
+    Turn(
+        "what's the weather like in boston today",
+        "What's the weather like in Boston today?",
+    ),
+    Turn(
+        "i want to book a table | for four people at seven",
+        "I want to book a table for four people at seven.",
+    ),
+    Turn("book a flight to austin", "Book a flight to Boston."),
+    Turn("yes", "Yes."),
+    Turn("set a timer for ten minutes", "Set a timer for two minutes."),
+    Turn(
+        "can you read me the last message",
+        "Can you read me the last message?",
+    ),
+]
+
+
+class MockSTT:
+    """Replays a turn as interim transcripts at speaking pace. Like the STT
+    node, a transcript that goes unrevised for stable_s is reported stable."""
+
+    def __init__(self, args):
+        self._word_s = args.word_ms / 1000
+        self._pause_s = args.pause_ms / 1000
+        self._end_of_turn_s = args.end_of_turn_ms / 1000
+        self._stable_s = args.stable_ms / 1000
+
+    async def speak(
+        self, turn: Turn, on_stable: Callable[[str], Awaitable[None]] | None
+    ) -> None:
+        """Returns at the end of turn."""
+        stable_t: asyncio.Task | None = None
+
+        async def stable(text: str):
+            await asyncio.sleep(self._stable_s)
+            if on_stable is not None:
+                await on_stable(text)
+
+        words: list[str] = []
+        for word in turn.spoken.split():
+            if word == "|":
+                await asyncio.sleep(self._pause_s)
+                continue
+            await asyncio.sleep(self._word_s)
+            words.append(word)
+            if stable_t is not None:
+                stable_t.cancel()
+            if on_stable is not None:
+                stable_t = asyncio.create_task(stable(" ".join(words)))
+        await asyncio.sleep(self._end_of_turn_s)
+        if stable_t is not None:
+            stable_t.cancel()
+
+
+async def first_token(handle: AsyncLLMResponseHandle, since: float) -> float:
+    async for _ in handle:
+        break
+    handle.cancel()
+    return time.monotonic() - since
+
+
+async def run(args, speculative: bool) -> dict:
+    llm = MockLLM(first_token_s=args.first_token_ms / 1000)
+    stt = MockSTT(args)
+    stats = SpeculationStats()
+    ttfts: list[float] = []
+    context = [SYSTEM]
+    for turn in TURNS:
+        speculation: Speculation | None = None
+
+        async def on_stable(text: str):
+            nonlocal speculation
+            if speculation is not None:
+                if speculation.normalized == normalize_transcript(text):
+                    return
+                speculation.handle.cancel()
+                stats.cancelled += 1
+            request = Speculation.request(text, context, [])
+            speculation = Speculation(
+                transcript=text,
+                context=context,
+                handle=llm.create_generation(request),
+                estimated_prompt_tokens=0,
+            )
+            stats.started += 1
+
+        await stt.speak(turn, on_stable if speculative else None)
+        end_of_turn = time.monotonic()
+        final = [*context, transcript_message(turn.final)]
+        if speculation is not None and speculation.matches(final, audio_support=False):
+            stats.commit(speculation)
+            handle = speculation.handle
+        else:
+            if speculation is not None:
+                speculation.handle.cancel()
+                stats.cancelled += 1
+            handle = llm.create_generation(
+                LLMRequest(context=final, tool_definitions=[])
+            )
+        ttfts.append(await first_token(handle, end_of_turn))
+
+    res: dict = {
+        "mode": "speculative" if speculative else "end_of_turn",
+        "ttft_mean_ms": round(sum(ttfts) / len(ttfts) * 1000, 1),
+        "ttft_ms": [round(t * 1000) for t in ttfts],
+    }
+    if speculative:
+        res["speculation"] = stats.to_dict()
+    return res
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Time to first token after end of turn, with and without"
+        " speculating on stable interim transcripts"
+    )
+    parser.add_argument("--first-token-ms", type=float, default=400.0)
+    parser.add_argument("--word-ms", type=float, default=250.0)
+    parser.add_argument("--pause-ms", type=float, default=500.0)
+    # Silence the STT waits for before ending the turn
+    parser.add_argument("--end-of-turn-ms", type=float, default=700.0)
+    # Matches STABLE_TRANSCRIPTION_S in the STT node
+    parser.add_argument("--stable-ms", type=float, default=300.0)
+    args = parser.parse_args()
+
+    for speculative in (False, True):
+        print(json.dumps(await run(args, speculative)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import argparse
+import asyncio
+import json
+import time
+
+from gabber.core.types import runtime
+from gabber.lib.llm.llm import LLMRequest
+from gabber.lib.llm.mock import MockLLM
+from gabber.lib.llm.tool_calls import ToolCallAssembler
+
+TOOL_CALLS = [
+    ("get_weather", {"city": "San Francisco", "unit": "celsius"}),
+    ("get_calendar", {"date": "2025-06-01", "calendar": "work"}),
+    ("search_contacts", {"query": "Alice", "limit": 5}),
+]
+
+
+async def call_tool(args, tc: runtime.ToolCall) -> str:
+    # Earlier calls are slower, so results finish out of order
+    delay = args.tool_ms / 1000 * (len(TOOL_CALLS) - tc.index)
+    await asyncio.sleep(delay)
+    return f"{tc.name} result"
+
+
+async def run(args, *, incremental: bool) -> dict:
+    llm = MockLLM(token_s=args.token_ms / 1000, tool_calls=TOOL_CALLS)
+    assembler = ToolCallAssembler()
+    tasks: dict[int, asyncio.Task[str]] = {}
+    first_dispatch_s = None
+    start = time.monotonic()
+
+    def dispatch(completed: list[runtime.ToolCall]):
+        nonlocal first_dispatch_s
+        for tc in completed:
+            if first_dispatch_s is None:
+                first_dispatch_s = time.monotonic() - start
+            tasks[tc.index] = asyncio.create_task(call_tool(args, tc))
+
+    handle = llm.create_generation(LLMRequest(context=[], tool_definitions=[]))
+    async for delta in handle:
+        completed = assembler.push(delta)
+        if incremental:
+            dispatch(completed)
+    stream_s = time.monotonic() - start
+    # Before the assembler every call was dispatched once the stream ended
+    dispatch(assembler.finish() if incremental else assembler.calls)
+
+    results = [await tasks[tc.index] for tc in assembler.calls]
+    assert results == [f"{name} result" for name, _ in TOOL_CALLS], results
+    assert [tc.arguments for tc in assembler.calls] == [a for _, a in TOOL_CALLS]
+    return {
+        "dispatch": "incremental" if incremental else "after_stream",
+        "stream_ms": round(stream_s * 1000),
+        "first_dispatch_ms": round((first_dispatch_s or 0.0) * 1000),
+        "wall_ms": round((time.monotonic() - start) * 1000),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Wall time of a response with parallel tool calls, from"
+        " the request to every tool result being ready, against a mock LLM"
+    )
+    parser.add_argument("--token-ms", type=float, default=30.0)
+    # The last call takes this long, each earlier one this much longer
+    parser.add_argument("--tool-ms", type=float, default=200.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    for incremental in (False, True):
+        results = [await run(args, incremental=incremental) for _ in range(args.runs)]
+        print(
+            json.dumps(
+                {
+                    **results[-1],
+                    "wall_ms": round(sum(r["wall_ms"] for r in results) / args.runs),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
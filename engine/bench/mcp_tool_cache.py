@@ -0,0 +1,101 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.server.fastmcp import Context, FastMCP
+
+from gabber.lib.mcp.tool_cache import ToolDefinitionCache
+
+TOOLS = 20
+
+
+def serve():
+    """Local stdio MCP server with a handful of tools, one of which adds
+    another tool and notifies the client."""
+    server = FastMCP("bench", log_level="WARNING")
+
+    for i in range(TOOLS):
+
+        def tool(query: str, limit: int = 10) -> str:
+            return query
+
+        server.add_tool(tool, name=f"tool_{i}", description=f"Bench tool {i}")
+
+    @server.tool()
+    async def add_tool(name: str, ctx: Context) -> str:
+        """Registers a new tool."""
+        server.add_tool(lambda: name, name=name, description="Added at runtime")
+        await ctx.session.send_tool_list_changed()
+        return name
+
+    server.run("stdio")
+
+
+async def turns(
+    args, session: ClientSession, cache: ToolDefinitionCache | None
+) -> list[float]:
+    """Time each LLM turn spends getting the MCP tool definitions."""
+    times: list[float] = []
+    for _ in range(args.turns):
+        start = time.monotonic()
+        if cache is None:
+            # What MCP.to_tool_definitions did before the cache
+            await ToolDefinitionCache().get(session)
+        else:
+            await cache.get(session)
+        times.append(time.monotonic() - start)
+    return times
+
+
+async def main(args):
+    params = StdioServerParameters(
+        command=sys.executable, args=["-m", __spec__.name, "--serve"]
+    )
+    cache = ToolDefinitionCache()
+    async with stdio_client(params) as (read_stream, write_stream):
+        async with ClientSession(
+            read_stream, write_stream, message_handler=cache.on_message
+        ) as session:
+            await session.initialize()
+            # Like the MCP node, warm the cache once the session is up
+            await cache.get(session)
+            for name, turn_cache in (("list_tools", None), ("cached", cache)):
+                times = await turns(args, session, turn_cache)
+                times.sort()
+                print(
+                    json.dumps(
+                        {
+                            "tool_definitions": name,
+                            "mean_ms": round(sum(times) / len(times) * 1000, 4),
+                            "p95_ms": round(times[int(len(times) * 0.95)] * 1000, 4),
+                        }
+                    )
+                )
+
+            # The notification invalidates the cache before the call returns
+            await session.call_tool("add_tool", {"name": "added"})
+            names = [td.name for td in await cache.get(session)]
+            assert "added" in names and len(names) == TOOLS + 2, names
+            print(json.dumps({"after_list_changed": len(names)}))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Per-turn time spent getting MCP tool definitions from a"
+        " local stdio MCP server, with and without the cache"
+    )
+    parser.add_argument("--turns", type=int, default=50)
+    # Run as the server, which the benchmark spawns itself
+    parser.add_argument("--serve", action="store_true")
+    args = parser.parse_args()
+    if args.serve:
+        serve()
+    else:
+        asyncio.run(main(args))
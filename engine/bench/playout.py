@@ -0,0 +1,104 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+from gabber.core.types.runtime import AudioFrameData
+from gabber.lib.audio import PlayoutClock
+
+LEAD_S = 0.25
+FRAME = AudioFrameData(
+    data=np.zeros((1, 480), dtype=np.int16), sample_rate=24000, num_channels=1
+)
+
+
+async def contend(stop: asyncio.Event, max_block_s: float):
+    """Blocks the event loop for random stretches, like CPU-heavy nodes."""
+    while not stop.is_set():
+        time.sleep(random.uniform(0, max_block_s))
+        await asyncio.sleep(random.uniform(0, 0.01))
+
+
+class Listener:
+    """Plays emitted audio back to back, hearing silence whenever the buffer
+    runs dry, and records how much audio was buffered at each emission."""
+
+    def __init__(self):
+        self.start = time.monotonic()
+        self._playhead: float | None = None
+        self.buffered: list[float] = []
+        self.underruns = 0
+
+    def receive(self, duration: float):
+        now = time.monotonic()
+        if self._playhead is None:
+            self._playhead = now
+        else:
+            self.buffered.append(self._playhead - now)
+            if self._playhead < now:
+                self.underruns += 1
+                self._playhead = now
+        self._playhead += duration
+
+    def summary(self, name: str, audio_s: float) -> dict:
+        levels = np.array(self.buffered) * 1000
+        elapsed = time.monotonic() - self.start
+        return {
+            "pacer": name,
+            "buffer_p1_ms": round(float(np.percentile(levels, 1)), 1),
+            "buffer_p50_ms": round(float(np.percentile(levels, 50)), 1),
+            "underruns": self.underruns,
+            # How far emission ended from the ideal (audio length minus lead)
+            "end_error_ms": round((elapsed - (audio_s - LEAD_S)) * 1000, 1),
+        }
+
+
+async def legacy(frames: int) -> dict:
+    # The loop nodes used before PlayoutClock
+    listener = Listener()
+    played_time = 0.0
+    start = time.time()
+    for _ in range(frames):
+        listener.receive(FRAME.duration)
+        played_time += FRAME.duration
+        while (played_time + start) - time.time() > LEAD_S:
+            await asyncio.sleep(0.05)
+    return listener.summary("legacy", played_time)
+
+
+async def clock(frames: int) -> dict:
+    listener = Listener()
+    c = PlayoutClock(lead_s=LEAD_S)
+    for _ in range(frames):
+        listener.receive(FRAME.duration)
+        c.push(FRAME)
+        await c.wait()
+    return {**listener.summary("clock", c.emitted_s), "clock": c.stats()}
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Audio pacing accuracy with the event loop under contention"
+    )
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--max-block-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    frames = int(args.seconds / FRAME.duration)
+    for pacer in (legacy, clock):
+        stop = asyncio.Event()
+        contention = asyncio.create_task(contend(stop, args.max_block_ms / 1000))
+        res = await pacer(frames)
+        stop.set()
+        await contention
+        print(json.dumps(res))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
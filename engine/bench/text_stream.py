@@ -0,0 +1,105 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import argparse
+import asyncio
+import json
+import time
+
+from gabber.core.types.runtime import TextStream
+
+
+class QueueStream:
+    """The stream before cursors: one queue that consumers compete for."""
+
+    def __init__(self):
+        self._queue = asyncio.Queue[str | None]()
+
+    def push_text(self, text: str):
+        self._queue.put_nowait(text)
+
+    def eos(self):
+        self._queue.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        item = await self._queue.get()
+        if item is None:
+            # Let the other consumers see the end too
+            self._queue.put_nowait(None)
+            raise StopAsyncIteration
+        return item
+
+
+class CopyStream:
+    """Fanout by copying every chunk into a queue per consumer."""
+
+    def __init__(self, consumers: int):
+        self._queues = [asyncio.Queue[str | None]() for _ in range(consumers)]
+        self._next = 0
+
+    def push_text(self, text: str):
+        for q in self._queues:
+            q.put_nowait(text)
+
+    def eos(self):
+        for q in self._queues:
+            q.put_nowait(None)
+
+    def __aiter__(self):
+        queue = self._queues[self._next]
+        self._next += 1
+
+        async def read():
+            while (item := await queue.get()) is not None:
+                yield item
+
+        return read()
+
+
+async def consume(stream) -> list[str]:
+    return [text async for text in stream]
+
+
+async def run(name: str, stream, args) -> dict:
+    tokens = [f"token{i} " for i in range(args.tokens)]
+    consumers = [asyncio.create_task(consume(stream)) for _ in range(args.consumers)]
+    # Let every consumer start waiting before the first push
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    for i, token in enumerate(tokens):
+        stream.push_text(token)
+        if i % args.burst == 0:
+            await asyncio.sleep(0)
+    stream.eos()
+    received = await asyncio.gather(*consumers)
+    elapsed = time.perf_counter() - start
+    return {
+        "stream": name,
+        "complete_consumers": sum(r == tokens for r in received),
+        "received_per_consumer": [len(r) for r in received],
+        "tokens_per_s": round(args.tokens / elapsed),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="TextStream fanout correctness and throughput"
+    )
+    parser.add_argument("--consumers", type=int, default=4)
+    parser.add_argument("--tokens", type=int, default=200_000)
+    # Yield to the consumers after this many pushes
+    parser.add_argument("--burst", type=int, default=1)
+    args = parser.parse_args()
+
+    res = await run("text_stream", TextStream(), args)
+    assert res["complete_consumers"] == args.consumers, res
+    print(json.dumps(res))
+    print(json.dumps(await run("copy_per_consumer", CopyStream(args.consumers), args)))
+    print(json.dumps(await run("shared_queue", QueueStream(), args)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
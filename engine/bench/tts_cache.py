@@ -0,0 +1,138 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from typing import cast
+
+import numpy as np
+
+from gabber.core import pad
+from gabber.core.types.runtime import AudioFrame, AudioFrameData
+from gabber.lib.tts.cache import TTSCache
+from gabber.lib.tts.tts import TTS, TTSSession
+from gabber.nodes.tts.tts import TTSJob
+
+PHRASES = [
+    "Hi there, how can I help you today?",
+    "Sure, one moment.",
+    "Sorry, could you say that again?",
+    "Thanks for calling, goodbye!",
+]
+
+SAMPLE_RATE = 24000
+
+
+class FakeTTS(TTS):
+    """Backend with a fixed time to first audio that then streams 20ms frames
+    at faster than real-time, standing in for a hosted TTS service."""
+
+    def __init__(self, *, first_audio_s: float, speedup: float):
+        self._first_audio_s = first_audio_s
+        self._speedup = speedup
+        self._logger = logging.getLogger("bench")
+
+    def start_session(self, *, voice: str) -> TTSSession:
+        session = TTSSession(voice=voice, logger=self._logger)
+        asyncio.create_task(self._synthesize(session))
+        return session
+
+    async def _synthesize(self, session: TTSSession):
+        text = ""
+        while (chunk := await session._text_queue.get()) is not None:
+            text += chunk
+        await asyncio.sleep(self._first_audio_s)
+        # Roughly 15 characters per second of speech
+        frames = max(1, int(len(text) / 15 * 50))
+        frame_len = SAMPLE_RATE // 50
+        for i in range(frames):
+            data = np.full((1, frame_len), i % 100, dtype=np.int16)
+            frame_data = AudioFrameData(
+                data=data, sample_rate=SAMPLE_RATE, num_channels=1
+            )
+            session._output_queue.put_nowait(
+                AudioFrame(
+                    start_timestamp=time.time(),
+                    original_data=frame_data,
+                    data_16000hz=frame_data,
+                    data_24000hz=frame_data,
+                    data_44100hz=frame_data,
+                    data_48000hz=frame_data,
+                )
+            )
+            await asyncio.sleep(0.02 / self._speedup)
+        session._output_queue.put_nowait(None)
+
+    async def run(self):
+        await asyncio.Event().wait()
+
+
+async def time_to_first_audio(
+    tts: TTS, cache: TTSCache, text: str
+) -> tuple[float, float]:
+    """Seconds until the first frame and until the last, draining the job."""
+    ctx = cast(pad.RequestContext, None)
+    job = TTSJob(
+        tts,
+        ctx,
+        voice="bench",
+        cache=cache,
+        backend="fake",
+        model="",
+        slots=asyncio.Semaphore(1),
+    )
+    start = time.perf_counter()
+    job.say(text)
+    first: float | None = None
+    async for _ in job:
+        if first is None:
+            first = time.perf_counter() - start
+    return first or 0.0, time.perf_counter() - start
+
+
+async def measure(tts: TTS, cache: TTSCache, repeats: int) -> dict:
+    ttfas = []
+    for _ in range(repeats):
+        for text in PHRASES:
+            ttfa, _ = await time_to_first_audio(tts, cache, text)
+            ttfas.append(ttfa * 1000)
+    return {
+        "ttfa_p50_ms": round(float(np.percentile(ttfas, 50)), 3),
+        "ttfa_p95_ms": round(float(np.percentile(ttfas, 95)), 3),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Time-to-first-audio of TTS jobs on cache misses and hits"
+    )
+    parser.add_argument("--first-audio-s", type=float, default=0.3)
+    parser.add_argument("--speedup", type=float, default=4.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    tts = FakeTTS(first_audio_s=args.first_audio_s, speedup=args.speedup)
+    directory = tempfile.mkdtemp()
+
+    # Misses only: a fresh cache each round
+    miss = await measure(tts, TTSCache(max_bytes=0), args.repeats)
+    print(json.dumps({"case": "miss", **miss}))
+
+    cache = TTSCache(directory=directory)
+    for text in PHRASES:
+        await time_to_first_audio(tts, cache, text)
+    memory = await measure(tts, cache, args.repeats)
+    print(json.dumps({"case": "memory_hit", **memory, **cache.stats()}))
+
+    # Same directory, empty memory: the first lookup of each phrase reads disk
+    disk_cache = TTSCache(directory=directory, max_bytes=0)
+    disk = await measure(tts, disk_cache, args.repeats)
+    print(json.dumps({"case": "disk_hit", **disk, **disk_cache.stats()}))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import time
+from typing import AsyncIterator
+
+import numpy as np
+
+from gabber.core.types.runtime import AudioFrameData
+from gabber.lib.tts.text_chunker import TextChunker, chunk_text
+from gabber.lib.tts.tts import TTSSession
+
+RESPONSE = (
+    "Let me take a look, I'm pulling up your account details right now. Your "
+    "order shipped on Monday, and according to the carrier it should arrive by "
+    "Thursday afternoon. If it doesn't show up by then, just reply to the "
+    "confirmation email and we'll send a replacement right away. Is there "
+    "anything else I can help you with today?"
+)
+
+SAMPLE_RATE = 24000
+# Speaking rate of the synthesized audio
+CHARS_PER_SECOND = 15
+# Text that ends at a sentence or clause boundary
+_BOUNDARY_END = re.compile(r"[.!?,;:—][\"')\]]*\s*$")
+
+
+class FakeProvider:
+    """Synthesizes each text message in turn. Every message pays a fixed
+    request overhead on top of synthesis time, like a hosted provider."""
+
+    def __init__(self, *, overhead_s: float, synth_chars_per_s: float):
+        self._overhead_s = overhead_s
+        self._synth_chars_per_s = synth_chars_per_s
+        self.messages = 0
+
+    def start_session(self) -> TTSSession:
+        session = TTSSession(voice="bench", logger=logging.getLogger("bench"))
+        asyncio.create_task(self._synthesize(session))
+        return session
+
+    async def _synthesize(self, session: TTSSession):
+        while (text := await session._text_queue.get()) is not None:
+            self.messages += 1
+            await asyncio.sleep(self._overhead_s + len(text) / self._synth_chars_per_s)
+            samples = int(len(text) / CHARS_PER_SECOND * SAMPLE_RATE)
+            data = AudioFrameData(
+                data=np.zeros((1, samples), dtype=np.int16),
+                sample_rate=SAMPLE_RATE,
+                num_channels=1,
+            )
+            session._output_queue.put_nowait(session._resampler.frame(data))
+        session._output_queue.put_nowait(None)
+
+
+async def llm(tokens_per_s: float) -> AsyncIterator[str]:
+    for token in re.findall(r"\S+\s*", RESPONSE):
+        await asyncio.sleep(1 / tokens_per_s)
+        yield token
+
+
+async def run(
+    args, name: str, chunker: TextChunker | None, tokens_per_s: float
+) -> dict:
+    provider = FakeProvider(
+        overhead_s=args.overhead_s, synth_chars_per_s=args.synth_chars_per_s
+    )
+    session = provider.start_session()
+    start = time.monotonic()
+    sent: list[str] = []
+
+    async def send():
+        stream = llm(tokens_per_s)
+        if chunker is not None:
+            stream = chunk_text(stream, chunker)
+        async for text in stream:
+            sent.append(text)
+            session.push_text(text)
+        session.eos()
+
+    send_t = asyncio.create_task(send())
+    first_audio: float | None = None
+    # When the listener hears the last sample, playing frames back to back
+    playhead = 0.0
+    async for frame in session:
+        now = time.monotonic() - start
+        if first_audio is None:
+            first_audio = now
+        playhead = max(playhead, now) + frame.original_data.duration
+    await send_t
+    return {
+        "chunking": name,
+        "tokens_per_s": tokens_per_s,
+        "provider_messages": provider.messages,
+        # Chunks the flush timer cut off mid-clause
+        "mid_clause_chunks": sum(
+            1 for text in sent[:-1] if not _BOUNDARY_END.search(text)
+        ),
+        "first_audio_ms": round((first_audio or 0) * 1000, 1),
+        "playout_end_s": round(playhead, 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Provider messages and first-audio latency with and without"
+        " text chunking"
+    )
+    parser.add_argument(
+        "--tokens-per-s",
+        default="20,30,40",
+        help="Comma-separated LLM token rates, typical rates are 20-40",
+    )
+    parser.add_argument("--overhead-s", type=float, default=0.05)
+    parser.add_argument("--synth-chars-per-s", type=float, default=300.0)
+    args = parser.parse_args()
+
+    for tokens_per_s in [float(t) for t in args.tokens_per_s.split(",")]:
+        cases = [
+            ("deltas", None),
+            ("sentences", TextChunker(first_chunk_chars=10**6)),
+            ("eager_first_clause", TextChunker()),
+        ]
+        for name, chunker in cases:
+            print(json.dumps(await run(args, name, chunker, tokens_per_s)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
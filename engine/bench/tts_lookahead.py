@@ -0,0 +1,86 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import argparse
+import asyncio
+import json
+import time
+from typing import cast
+
+from bench.tts_cache import FakeTTS
+from gabber.core import pad
+from gabber.lib.audio import PlayoutClock
+from gabber.lib.tts.cache import TTSCache
+from gabber.nodes.tts.tts import TTSJob
+
+RESPONSES = [
+    "Sure, I can help with that.",
+    "Your order shipped yesterday and should arrive on Thursday.",
+    "The tracking number is in the confirmation email.",
+    "Is there anything else I can do for you?",
+]
+
+
+async def play(jobs: list[TTSJob]) -> list[float]:
+    """Play jobs back to back with the node's pacing and return the silence
+    before each job after the first."""
+    gaps: list[float] = []
+    # Wall time at which everything emitted so far has finished playing
+    playhead: float | None = None
+    clock = PlayoutClock()
+    for job in jobs:
+        clock.reset()
+        first = True
+        async for frame in job:
+            now = time.time()
+            if first and playhead is not None:
+                gaps.append(max(0.0, now - playhead))
+            first = False
+            playhead = max(playhead or now, now) + frame.original_data.duration
+            clock.push(frame.original_data)
+            await clock.wait()
+    return gaps
+
+
+async def run(args, lookahead: int) -> dict:
+    tts = FakeTTS(first_audio_s=args.first_audio_s, speedup=args.speedup)
+    slots = asyncio.Semaphore(lookahead + 1)
+    # Nothing is cached so every job goes to the provider
+    cache = TTSCache(max_bytes=0)
+    ctx = cast(pad.RequestContext, None)
+    jobs = []
+    for i, text in enumerate(RESPONSES):
+        job = TTSJob(
+            tts,
+            ctx,
+            voice="bench",
+            cache=cache,
+            backend="fake",
+            model=str(i),
+            slots=slots,
+        )
+        job.say(text)
+        jobs.append(job)
+
+    gaps = await play(jobs)
+    return {
+        "lookahead": lookahead,
+        "gap_mean_ms": round(sum(gaps) / len(gaps) * 1000, 1),
+        "gap_max_ms": round(max(gaps) * 1000, 1),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Silence between consecutive TTS jobs for different look-aheads"
+    )
+    parser.add_argument("--first-audio-s", type=float, default=0.3)
+    parser.add_argument("--speedup", type=float, default=4.0)
+    args = parser.parse_args()
+
+    for lookahead in (0, 1, 2):
+        print(json.dumps(await run(args, lookahead)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,219 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import time
+from typing import Any
+
+import numpy as np
+from aiohttp import web
+
+from gabber.core.types.runtime import AudioFrameData
+from gabber.lib.audio import Resampler
+from gabber.lib.tts.tts import MultiplexWebSocketTTS
+
+SAMPLE_RATE = 24000
+CHUNK_SAMPLES = 480
+
+
+async def fake_tts_endpoint(request: web.Request) -> web.WebSocketResponse:
+    """Answers each context with a tone whose pitch depends on the context,
+    sending 20ms chunks so concurrent contexts interleave on the socket."""
+    seconds = request.app["seconds"]
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+
+    async def speak(context_id: str, index: int):
+        t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        tone = 8000 * np.sin(2 * np.pi * (200 + 150 * index) * t)
+        pcm = tone.astype(np.int16)
+        for start in range(0, pcm.shape[0], CHUNK_SAMPLES):
+            chunk = pcm[start : start + CHUNK_SAMPLES].tobytes()
+            await ws.send_json(
+                {"context_id": context_id, "audio": base64.b64encode(chunk).decode()}
+            )
+            await asyncio.sleep(0)
+        await ws.send_json({"context_id": context_id, "final": True})
+
+    tasks = []
+    async for msg in ws:
+        payload = json.loads(msg.data)
+        if payload.get("eos"):
+            tasks.append(asyncio.create_task(speak(payload["context_id"], len(tasks))))
+    await asyncio.gather(*tasks)
+    return ws
+
+
+class FakeTTS(MultiplexWebSocketTTS):
+    def __init__(self, *, url: str):
+        super().__init__(logger=logging.getLogger("bench"))
+        self._url = url
+        # Chunks in the order they arrived, across all sessions
+        self.arrivals: list[tuple[str, bytes]] = []
+
+    def get_url(self) -> str:
+        return self._url
+
+    def get_headers(self) -> dict[str, str]:
+        return {}
+
+    def start_session_payload(
+        self, *, context_id: str, voice: str
+    ) -> dict[str, Any] | None:
+        return None
+
+    def push_text_payload(
+        self, *, context_id: str, voice: str, text: str
+    ) -> dict[str, Any] | None:
+        return None
+
+    def eos_payloads(self, *, context_id: str, voice: str) -> list[dict[str, Any]]:
+        return [{"context_id": context_id, "eos": True}]
+
+    def get_context_id(self, msg: dict[str, Any]) -> str | None:
+        return msg.get("context_id")
+
+    def get_pcm_bytes(self, msg: dict[str, Any]) -> bytes:
+        pcm = base64.b64decode(msg["audio"])
+        self.arrivals.append((msg["context_id"], pcm))
+        return pcm
+
+    def get_error_message(self, msg: dict[str, Any]) -> str:
+        return ""
+
+    def is_audio_message(self, msg: dict[str, Any]) -> bool:
+        return "audio" in msg
+
+    def is_final_message(self, msg: dict[str, Any]) -> bool:
+        return bool(msg.get("final"))
+
+    def is_error_message(self, msg: dict[str, Any]) -> bool:
+        return False
+
+
+def resample_chunks(resampler: Resampler, chunks: list[bytes], rate: int) -> np.ndarray:
+    out = []
+    for chunk in chunks:
+        data = AudioFrameData(
+            data=np.frombuffer(chunk, dtype=np.int16).reshape(1, -1),
+            sample_rate=SAMPLE_RATE,
+            num_channels=1,
+        )
+        out.append(resampler.push_audio(data).data.reshape(-1))
+    return np.concatenate(out)
+
+
+def snr_db(reference: np.ndarray, test: np.ndarray) -> float:
+    n = min(reference.shape[0], test.shape[0])
+    ref = reference[:n].astype(np.float64)
+    noise = np.sum((ref - test[:n]) ** 2)
+    if noise == 0:
+        return float("inf")
+    return float(10 * np.log10(np.sum(ref**2) / noise))
+
+
+async def run(args, rates: list[int]) -> dict:
+    app = web.Application()
+    app["seconds"] = args.seconds
+    app.router.add_get("/", fake_tts_endpoint)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+
+    tts = FakeTTS(url=f"ws://127.0.0.1:{args.port}/")
+    run_t = asyncio.create_task(tts.run())
+    try:
+        sessions = [tts.start_session(voice="bench") for _ in range(args.sessions)]
+        outputs: dict[str, dict[int, list[np.ndarray]]] = {}
+
+        async def consume(session) -> None:
+            out = outputs[session.context_id] = {rate: [] for rate in rates}
+            async for frame in session:
+                for rate in rates:
+                    data = getattr(frame, f"data_{rate}hz")
+                    out[rate].append(data.data.reshape(-1))
+
+        for session in sessions:
+            session.eos()
+        cpu_start = time.process_time()
+        await asyncio.gather(*(consume(s) for s in sessions))
+        cpu_s = time.process_time() - cpu_start
+    finally:
+        await tts.close()
+        run_t.cancel()
+        await runner.cleanup()
+
+    # Each session against its own audio resampled in isolation, and what
+    # one resampler shared by every session (the old behaviour) would give
+    shared = {rate: Resampler(rate) for rate in rates}
+    shared_out: dict[str, dict[int, list[np.ndarray]]] = {
+        s.context_id: {rate: [] for rate in rates} for s in sessions
+    }
+    for context_id, chunk in tts.arrivals:
+        for rate in rates:
+            shared_out[context_id][rate].append(
+                resample_chunks(shared[rate], [chunk], rate)
+            )
+
+    per_session_snr = []
+    shared_snr = []
+    for s in sessions:
+        chunks = [c for ctx, c in tts.arrivals if ctx == s.context_id]
+        for rate in rates:
+            if rate == SAMPLE_RATE:
+                continue
+            reference = resample_chunks(Resampler(rate), chunks, rate)
+            per_session_snr.append(
+                snr_db(reference, np.concatenate(outputs[s.context_id][rate]))
+            )
+            shared_snr.append(
+                snr_db(reference, np.concatenate(shared_out[s.context_id][rate]))
+            )
+
+    audio_s = args.sessions * args.seconds
+    return {
+        "sessions": args.sessions,
+        "rates_read": rates,
+        "cpu_ms_per_audio_s": round(cpu_s / audio_s * 1000, 3),
+        "min_snr_db_per_session": round(min(per_session_snr), 1),
+        "min_snr_db_shared": round(min(shared_snr), 1),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Interleaved MultiplexWebSocketTTS sessions against a local"
+        " fake TTS server"
+    )
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=7105)
+    parser.add_argument(
+        "--long-seconds",
+        type=float,
+        default=120.0,
+        help="Length of one session that runs past MAX_PENDING_FRAMES",
+    )
+    args = parser.parse_args()
+
+    # Typical playout only reads 48kHz, STT-style consumers read 16kHz too
+    for rates in ([48000], [16000, 48000], [16000, 24000, 44100, 48000]):
+        print(json.dumps(await run(args, rates)))
+
+    # Long enough that the rates playout never reads pass MAX_PENDING_FRAMES
+    long_args = argparse.Namespace(
+        **{**vars(args), "sessions": 1, "seconds": args.long_seconds}
+    )
+    print(
+        json.dumps(
+            {"long_session_s": args.long_seconds, **await run(long_args, [48000])}
+        )
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
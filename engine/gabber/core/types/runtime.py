@@ -8,7 +8,15 @@ import base64
 from abc import abstractmethod, ABC
 from dataclasses import dataclass
 from enum import Enum as PyEnum
-from typing import Annotated, Any, Literal, cast, TypeVar
+from typing import (
+    Annotated,
+    Any,
+    Literal,
+    Protocol,
+    cast,
+    runtime_checkable,
+    TypeVar,
+)
 from pydantic.types import Json
 
 import cv2
@@ -77,14 +85,64 @@ class AudioFrameData:
         return "audio_frame_data"
 
 
-@dataclass
+# Runtime checkable so pydantic models embedding AudioFrame can validate it
+@runtime_checkable
+class AudioFrameResampler(Protocol):
+    def resample(self, frame: AudioFrame, sample_rate: int) -> AudioFrameData: ...
+
+
+class _ResampledData:
+    """AudioFrame field holding the frame at one output rate.
+
+    Frames built with a resampler and without the data compute it on first
+    access, so rates nobody reads are never resampled.
+    """
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+
+    def __set_name__(self, owner: type, name: str):
+        self._attr = f"_{name}"
+
+    def __get__(self, frame: AudioFrame | None, owner: type) -> AudioFrameData:
+        if frame is None:
+            # Dataclass default for the field
+            return cast(AudioFrameData, None)
+        data = frame.__dict__.get(self._attr)
+        if data is None:
+            if frame.resampler is None:
+                raise ValueError(f"AudioFrame has no {self.sample_rate}Hz data")
+            data = frame.resampler.resample(frame, self.sample_rate)
+            frame.__dict__[self._attr] = data
+        return data
+
+    def __set__(self, frame: AudioFrame, data: AudioFrameData | None):
+        frame.__dict__[self._attr] = data
+
+
+# The generated repr and eq would read, and so resample, every data_* field
+@dataclass(repr=False, eq=False)
 class AudioFrame(BaseRuntimeType):
     start_timestamp: float
     original_data: AudioFrameData
-    data_16000hz: AudioFrameData
-    data_24000hz: AudioFrameData
-    data_44100hz: AudioFrameData
-    data_48000hz: AudioFrameData
+    data_16000hz: AudioFrameData = _ResampledData(16000)  # type: ignore[assignment]
+    data_24000hz: AudioFrameData = _ResampledData(24000)  # type: ignore[assignment]
+    data_44100hz: AudioFrameData = _ResampledData(44100)  # type: ignore[assignment]
+    data_48000hz: AudioFrameData = _ResampledData(48000)  # type: ignore[assignment]
+    # Fills in whichever data_* fields were not given
+    resampler: AudioFrameResampler | None = None
+
+    def __repr__(self) -> str:
+        # Only the rates computed so far
+        rates = [
+            d.sample_rate
+            for d in vars(AudioFrame).values()
+            if isinstance(d, _ResampledData) and self.__dict__.get(d._attr) is not None
+        ]
+        return (
+            f"AudioFrame(start_timestamp={self.start_timestamp!r}, "
+            f"original_data={self.original_data!r}, resampled_rates={rates!r})"
+        )
 
     @staticmethod
     def silence(duration: float):
@@ -283,29 +341,64 @@ class AVClip(BaseRuntimeType):
 
 @dataclass
 class TextStream(BaseRuntimeType):
+    """Append-only text stream that every consumer reads in full.
+
+    A source pad hands the same stream to each connected sink, so each
+    `async for` gets its own cursor into the shared chunks instead of
+    competing for them.
+    """
+
     def __init__(self):
-        self._output_queue = asyncio.Queue[str | None]()
+        self._chunks: list[str] = []
+        self._eos = False
+        # Resolved on the next push or eos, shared by all waiting consumers
+        self._changed: asyncio.Future[None] | None = None
 
     def push_text(self, text: str):
-        self._output_queue.put_nowait(text)
+        self._chunks.append(text)
+        self._notify()
 
     def eos(self):
-        self._output_queue.put_nowait(None)
+        self._eos = True
+        self._notify()
 
-    def __aiter__(self):
-        return self
+    def _notify(self):
+        if self._changed is not None:
+            if not self._changed.done():
+                self._changed.set_result(None)
+            self._changed = None
 
-    async def __anext__(self):
-        item = await self._output_queue.get()
-        if item is None:
-            raise StopAsyncIteration
+    async def _wait(self):
+        if self._changed is None:
+            self._changed = asyncio.get_running_loop().create_future()
+        await asyncio.shield(self._changed)
 
-        return item
+    def __aiter__(self) -> "_TextStreamCursor":
+        return _TextStreamCursor(self)
 
     def log_type(self) -> str:
         return "text_stream"
 
 
+class _TextStreamCursor:
+    def __init__(self, stream: TextStream):
+        self._stream = stream
+        self._pos = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        stream = self._stream
+        while self._pos >= len(stream._chunks):
+            if stream._eos:
+                raise StopAsyncIteration
+            await stream._wait()
+        text = stream._chunks[self._pos]
+        self._pos += 1
+        return text
+
+
 class ToolCall(BaseModel, BaseRuntimeType):
     call_id: str
     index: int
@@ -1,7 +1,8 @@
 # Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
 # SPDX-License-Identifier: SUL-1.0
 
-from .resampler import Resampler
+from .playout_clock import PlayoutClock
+from .resampler import FrameResampler, Resampler
 from . import vad
 
-__all__ = ["Resampler", "vad"]
+__all__ = ["FrameResampler", "PlayoutClock", "Resampler", "vad"]
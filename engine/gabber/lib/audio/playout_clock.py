@@ -0,0 +1,94 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import asyncio
+import time
+
+from gabber.core.types import runtime
+
+
+class PlayoutClock:
+    """Paces audio emission to real time on a monotonic clock.
+
+    Position is counted in samples and every wait targets an absolute
+    deadline, so neither float accumulation nor late wake-ups add up over a
+    stream. Emission runs at most lead_s ahead of the listener. If the
+    listener catches up (an underrun), the clock is re-anchored so later
+    frames are not bursted out to make up for the gap.
+    """
+
+    def __init__(self, *, lead_s: float = 0.25):
+        self._lead_s = lead_s
+        self.reset()
+
+    def reset(self):
+        """Start a new stream, its first frame plays immediately."""
+        self._start: float | None = None
+        self._sample_rate = 0
+        self._samples = 0
+        # Emitted time at sample rates used earlier in the stream
+        self._offset_s = 0.0
+        self.frames = 0
+        self.underruns = 0
+        self.underrun_s = 0.0
+        self.max_lateness_s = 0.0
+        self._total_lateness_s = 0.0
+        self._waits = 0
+
+    @property
+    def emitted_s(self) -> float:
+        """Seconds of audio emitted so far, exact to the sample."""
+        if self._sample_rate == 0:
+            return self._offset_s
+        return self._offset_s + self._samples / self._sample_rate
+
+    def position_s(self) -> float:
+        """Seconds of audio the listener has heard so far."""
+        if self._start is None:
+            return 0.0
+        return min(self.emitted_s, time.monotonic() - self._start)
+
+    def push(self, frame_data: runtime.AudioFrameData):
+        """Account for a frame that is being emitted now."""
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+        else:
+            # Everything emitted before this frame has already played out
+            gap = now - (self._start + self.emitted_s)
+            if gap > 0:
+                self.underruns += 1
+                self.underrun_s += gap
+                self._start += gap
+
+        if frame_data.sample_rate != self._sample_rate:
+            self._offset_s = self.emitted_s
+            self._sample_rate = frame_data.sample_rate
+            self._samples = 0
+        self._samples += frame_data.sample_count
+        self.frames += 1
+
+    async def wait(self):
+        """Sleep until the emitted audio is within lead_s of the listener."""
+        if self._start is None:
+            return
+        deadline = self._start + self.emitted_s - self._lead_s
+        delay = deadline - time.monotonic()
+        if delay <= 0:
+            return
+        await asyncio.sleep(delay)
+        lateness = time.monotonic() - deadline
+        self._waits += 1
+        self._total_lateness_s += lateness
+        self.max_lateness_s = max(self.max_lateness_s, lateness)
+
+    def stats(self) -> dict[str, float | int]:
+        mean_lateness = self._total_lateness_s / self._waits if self._waits else 0.0
+        return {
+            "frames": self.frames,
+            "emitted_s": round(self.emitted_s, 3),
+            "underruns": self.underruns,
+            "underrun_s": round(self.underrun_s, 3),
+            "mean_lateness_ms": round(mean_lateness * 1000, 2),
+            "max_lateness_ms": round(self.max_lateness_s * 1000, 2),
+        }
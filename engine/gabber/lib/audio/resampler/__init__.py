@@ -1,6 +1,7 @@
 # Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
 # SPDX-License-Identifier: SUL-1.0
 
+from .frame_resampler import FrameResampler
 from .resampler import Resampler
 
-__all__ = ["Resampler"]
+__all__ = ["FrameResampler", "Resampler"]
@@ -0,0 +1,86 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import time
+from collections import deque
+
+from gabber.core.types import runtime
+
+from .resampler import Resampler
+
+# AudioFrame field for each output rate
+FIELDS = {
+    16000: "data_16000hz",
+    24000: "data_24000hz",
+    44100: "data_44100hz",
+    48000: "data_48000hz",
+}
+
+# Frames nobody has read a rate of yet are dropped past this many, so a long
+# stream doesn't hold on to its whole history
+MAX_PENDING_FRAMES = 500
+
+
+class FrameResampler:
+    """Builds the AudioFrames of one mono stream, resampling lazily.
+
+    Each output rate is only resampled once something reads it, and the
+    frame's native rate is passed through untouched. Rates are resampled in
+    stream order, so reading a later frame first catches up on the earlier
+    ones and filter state stays continuous. Use one instance per stream,
+    sharing one between interleaved streams mixes their filter state.
+
+    Only the last MAX_PENDING_FRAMES unread frames are kept per rate, so a
+    rate nobody reads costs no resampling. Reading a frame older than that
+    resamples it on its own, and the next frame starts from a reset state.
+    """
+
+    def __init__(self):
+        self._resamplers: dict[int, Resampler] = {}
+        # Frames not yet resampled to each rate, oldest first
+        self._pending: dict[int, deque[runtime.AudioFrame]] = {
+            rate: deque() for rate in FIELDS
+        }
+
+    def frame(
+        self, data: runtime.AudioFrameData, start_timestamp: float | None = None
+    ) -> runtime.AudioFrame:
+        passthrough = {}
+        if data.sample_rate in FIELDS:
+            passthrough[FIELDS[data.sample_rate]] = data
+        frame = runtime.AudioFrame(
+            start_timestamp=time.time() if start_timestamp is None else start_timestamp,
+            original_data=data,
+            resampler=self,
+            **passthrough,
+        )
+        for rate, pending in self._pending.items():
+            if rate == data.sample_rate:
+                continue
+            pending.append(frame)
+            if len(pending) > MAX_PENDING_FRAMES:
+                pending.popleft()
+                # The filter state no longer follows the pending frames
+                self._resamplers.pop(rate, None)
+        return frame
+
+    def _resample_next(self, rate: int) -> runtime.AudioFrame:
+        frame = self._pending[rate].popleft()
+        resampler = self._resamplers.get(rate)
+        if resampler is None:
+            resampler = self._resamplers[rate] = Resampler(rate)
+        setattr(frame, FIELDS[rate], resampler.push_audio(frame.original_data))
+        return frame
+
+    def resample(
+        self, frame: runtime.AudioFrame, sample_rate: int
+    ) -> runtime.AudioFrameData:
+        if frame.resampler is not self:
+            raise ValueError("Frame was not built by this FrameResampler")
+        pending = self._pending[sample_rate]
+        if not any(f is frame for f in pending):
+            # Dropped from pending, or read without ever being pending
+            return Resampler(sample_rate).push_audio(frame.original_data)
+        while self._resample_next(sample_rate) is not frame:
+            pass
+        return getattr(frame, FIELDS[sample_rate])
@@ -5,28 +5,81 @@ import av
 import numpy as np
 from gabber.core.types import runtime
 
+from .polyphase import PolyphaseResampler, supports_rates
+
 
 class Resampler:
     def __init__(self, output_rate):
         self._output_rate = output_rate
-        self._resampler = av.AudioResampler(
-            format="s16",
-            layout="mono",
-            rate=output_rate,
-        )
+        self._polyphase: PolyphaseResampler | None = None
+        self._av_resampler: av.AudioResampler | None = None
+
+    def push_audio(
+        self,
+        frame_data: runtime.AudioFrameData,
+        out: np.ndarray | None = None,
+    ) -> runtime.AudioFrameData:
+        """Resample a mono frame to the output rate.
 
-    def push_audio(self, frame_data: runtime.AudioFrameData) -> runtime.AudioFrameData:
+        If out is given the samples are written into it, see output_size().
+        """
         if frame_data.sample_rate == self._output_rate:
             return frame_data
+
+        if not supports_rates(frame_data.sample_rate, self._output_rate):
+            return self._push_av(frame_data)
+
+        flushed: np.ndarray | None = None
+        if (
+            self._polyphase is None
+            or self._polyphase.input_rate != frame_data.sample_rate
+        ):
+            if self._polyphase is not None:
+                flushed = self._polyphase.eos()
+            self._polyphase = PolyphaseResampler(
+                input_rate=frame_data.sample_rate, output_rate=self._output_rate
+            )
+
+        data = self._polyphase.push_audio(frame_data.data, out=out)
+        if flushed is not None and flushed.shape[0] > 0:
+            data = np.concatenate([flushed, data])
+        return runtime.AudioFrameData(
+            data=data.reshape(1, -1),
+            sample_rate=self._output_rate,
+            num_channels=1,
+        )
+
+    def output_size(self, frame_data: runtime.AudioFrameData) -> int:
+        """Buffer length needed to push frame_data with an out buffer."""
+        if self._polyphase is None or self._polyphase.input_rate != (
+            frame_data.sample_rate
+        ):
+            return (
+                frame_data.sample_count * self._output_rate // frame_data.sample_rate
+                + 1
+            )
+        return self._polyphase.output_size(frame_data.sample_count)
+
+    def _push_av(self, frame_data: runtime.AudioFrameData) -> runtime.AudioFrameData:
+        if self._av_resampler is None:
+            self._av_resampler = av.AudioResampler(
+                format="s16",
+                layout="mono",
+                rate=self._output_rate,
+            )
         f = av.AudioFrame.from_ndarray(
             frame_data.data,
             format="s16",
             layout="mono",
         )
         f.sample_rate = frame_data.sample_rate
-        frames = self._resampler.resample(f)
+        frames = self._av_resampler.resample(f)
+        return self._concat_av(frames)
+
+    def _concat_av(self, frames: list[av.AudioFrame]) -> runtime.AudioFrameData:
         concatted_frames = np.concatenate(
             [np.frombuffer(frame.to_ndarray(), dtype=np.int16) for frame in frames]
+            or [np.zeros(0, dtype=np.int16)]
         )
         return runtime.AudioFrameData(
             data=concatted_frames.reshape(1, -1),
@@ -35,12 +88,14 @@ class Resampler:
         )
 
     def eos(self) -> runtime.AudioFrameData:
-        frames = self._resampler.resample(None)
-        concatted_frames = np.concatenate(
-            [np.frombuffer(frame.to_ndarray(), dtype=np.int16) for frame in frames]
-        )
+        if self._av_resampler is not None:
+            return self._concat_av(self._av_resampler.resample(None))
+        if self._polyphase is None:
+            data = np.zeros(0, dtype=np.int16)
+        else:
+            data = self._polyphase.eos()
         return runtime.AudioFrameData(
-            data=concatted_frames.reshape(1, -1),
+            data=data.reshape(1, -1),
             sample_rate=self._output_rate,
             num_channels=1,
         )
@@ -2,11 +2,20 @@
 # SPDX-License-Identifier: SUL-1.0
 
 from . import mock, openai_compatible
+from .capabilities import (
+    CapabilityStore,
+    LLMCapabilities,
+    default_capability_store,
+    resolve_capabilities,
+)
 from .llm import (
     AsyncLLMResponseHandle,
     BaseLLM,
     LLMRequest,
 )
+from .request_policy import RequestPolicy, RequestPolicyStats, RequestScheduler
+from .speculation import Speculation, SpeculationStats, normalize_transcript
+from .tool_calls import ToolCallAssembler
 from .token_estimator import (
     TokenEstimator,
     DEFAULT_TOKEN_ESTIMATOR,
@@ -18,6 +27,17 @@ __all__ = [
     "BaseLLM",
     "LLMRequest",
     "AsyncLLMResponseHandle",
+    "CapabilityStore",
+    "LLMCapabilities",
+    "default_capability_store",
+    "resolve_capabilities",
+    "RequestPolicy",
+    "RequestPolicyStats",
+    "RequestScheduler",
+    "Speculation",
+    "SpeculationStats",
+    "normalize_transcript",
+    "ToolCallAssembler",
     "TokenEstimator",
     "DEFAULT_TOKEN_ESTIMATOR",
     "OPENAI_TOKEN_ESTIMATOR",
@@ -0,0 +1,212 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+
+from gabber.core.types import runtime
+
+from .llm import LLMRequest
+from .openai_compatible import OpenAICompatibleLLM, OpenAICompatibleLLMError
+
+DEFAULT_TTL_S = 24 * 60 * 60
+# Attempts to reach an endpoint that may still be starting up
+PROBE_ATTEMPTS = 20
+PROBE_RETRY_S = 5.0
+
+
+@dataclass(frozen=True)
+class LLMCapabilities:
+    video: bool
+    audio: bool
+
+
+class CapabilityStore:
+    """Probed capabilities per (base_url, model), kept in a JSON file.
+
+    Entries expire after ttl_s so an endpoint that gains or loses support is
+    probed again. Without a path the store only lives for the process.
+    """
+
+    def __init__(self, path: str | None = None, *, ttl_s: float = DEFAULT_TTL_S):
+        self._path = path
+        self._ttl_s = ttl_s
+        self._entries: dict[str, dict] | None = None
+
+    @staticmethod
+    def key(base_url: str, model: str) -> str:
+        return f"{base_url.rstrip('/')}|{model}"
+
+    def get(self, base_url: str, model: str) -> LLMCapabilities | None:
+        entry = self._load().get(self.key(base_url, model))
+        if entry is None or time.time() - entry["probed_at"] > self._ttl_s:
+            return None
+        return LLMCapabilities(video=entry["video"], audio=entry["audio"])
+
+    def put(self, base_url: str, model: str, capabilities: LLMCapabilities):
+        entries = self._load()
+        entries[self.key(base_url, model)] = {
+            **asdict(capabilities),
+            "probed_at": time.time(),
+        }
+        if self._path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            tmp = f"{self._path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp, self._path)
+        except OSError:
+            logging.warning("Failed to write LLM capability cache", exc_info=True)
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            self._entries = {}
+            if self._path is not None and os.path.exists(self._path):
+                try:
+                    with open(self._path) as f:
+                        self._entries = json.load(f)
+                except (OSError, ValueError):
+                    logging.warning(
+                        "Ignoring unreadable LLM capability cache", exc_info=True
+                    )
+        return self._entries
+
+
+_default_store: CapabilityStore | None = None
+
+
+def default_capability_store() -> CapabilityStore:
+    """Process-wide store shared by every LLM node.
+
+    GABBER_LLM_CAPABILITY_CACHE sets the file, empty to keep it in memory,
+    and GABBER_LLM_CAPABILITY_TTL_S how long entries stay valid.
+    """
+    global _default_store
+    if _default_store is None:
+        path = os.environ.get(
+            "GABBER_LLM_CAPABILITY_CACHE",
+            os.path.join(
+                os.path.expanduser("~"), ".cache", "gabber", "llm_capabilities.json"
+            ),
+        )
+        _default_store = CapabilityStore(
+            path or None,
+            ttl_s=float(
+                os.environ.get("GABBER_LLM_CAPABILITY_TTL_S", str(DEFAULT_TTL_S))
+            ),
+        )
+    return _default_store
+
+
+async def resolve_capabilities(
+    llm: OpenAICompatibleLLM,
+    *,
+    base_url: str,
+    model: str,
+    store: CapabilityStore,
+    logger: logging.Logger | logging.LoggerAdapter,
+    video_override: bool | None = None,
+    audio_override: bool | None = None,
+) -> LLMCapabilities:
+    """Capabilities from the overrides, then the store, probing the
+    endpoint only for what is neither overridden nor cached.
+
+    Endpoints addressed without a model name, like local servers, are keyed
+    by the first model they list. If they list none the store is bypassed,
+    so switching the served model can't reuse another model's entry.
+    """
+    if video_override is not None and audio_override is not None:
+        return LLMCapabilities(video=video_override, audio=audio_override)
+
+    if not model:
+        model = await llm.served_model() or ""
+    cacheable = bool(model)
+
+    cached = store.get(base_url, model) if cacheable else None
+    if cached is not None:
+        logger.info(f"Using cached LLM capabilities for {model}: {cached}")
+        video, audio = cached.video, cached.audio
+    else:
+        audio = await probe_audio(llm)
+        if video_override is None:
+            video, conclusive = await _probe_video_with_retries(llm, logger)
+            if conclusive and cacheable:
+                store.put(base_url, model, LLMCapabilities(video=video, audio=audio))
+        else:
+            video = video_override
+
+    return LLMCapabilities(
+        video=video if video_override is None else video_override,
+        audio=audio if audio_override is None else audio_override,
+    )
+
+
+async def _probe_video_with_retries(
+    llm: OpenAICompatibleLLM, logger: logging.Logger | logging.LoggerAdapter
+) -> tuple[bool, bool]:
+    """Video support and whether the endpoint actually answered."""
+    for i in range(PROBE_ATTEMPTS):
+        try:
+            return await probe_video(llm, logger), True
+        except Exception:
+            if i == PROBE_ATTEMPTS - 1:
+                break
+            logger.error(
+                f"Failed to check video support, trying again in {PROBE_RETRY_S}s",
+                exc_info=True,
+            )
+        await asyncio.sleep(PROBE_RETRY_S)
+
+    logger.error(f"Failed to check video support after {PROBE_ATTEMPTS} attempts.")
+    return False, False
+
+
+async def probe_video(
+    llm: OpenAICompatibleLLM, logger: logging.Logger | logging.LoggerAdapter
+) -> bool:
+    logger.info("Checking if LLM supports video...")
+    dummy_request = LLMRequest(
+        context=[
+            runtime.ContextMessage(
+                role=runtime.ContextMessageRoleEnum.SYSTEM,
+                content=[
+                    runtime.ContextMessageContentItem_Text(content="."),
+                    runtime.ContextMessageContentItem_Video(
+                        clip=runtime.VideoClip(
+                            video=[runtime.VideoFrame.black_frame(16, 16, 0.0)] * 10
+                        )
+                    ),
+                ],
+                tool_calls=[],
+            )
+        ],
+        tool_definitions=[],
+    )
+    try:
+        handle = await llm.create_completion(
+            request=dummy_request,
+            video_support=True,
+            audio_support=False,
+            max_completion_tokens=1,
+        )
+        async for _ in handle:
+            pass
+    except OpenAICompatibleLLMError as e:
+        logger.info(f"Video support check failed with error code: {e.code}, {e.msg}")
+        if e.code == 500 or e.code == 400:
+            return False
+
+        raise e
+
+    return True
+
+
+async def probe_audio(llm: OpenAICompatibleLLM) -> bool:
+    # Audio input is not probed yet, set the override to enable it
+    return False
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: SUL-1.0
 
 import asyncio
+import json
 import logging
 
 from gabber.core.types import runtime
@@ -18,7 +19,18 @@ MOCK_RESPONSES = [
 
 
 class MockLLM(BaseLLM):
-    def __init__(self):
+    def __init__(
+        self,
+        *,
+        first_token_s: float = 0.0,
+        token_s: float = 0.1,
+        tool_calls: list[tuple[str, dict]] | None = None,
+    ):
+        """With tool_calls set, every response streams those calls one after
+        another instead of text, a few argument characters per token."""
+        self._first_token_s = first_token_s
+        self._token_s = token_s
+        self._tool_calls = tool_calls
         self._loop = asyncio.get_event_loop()
         self._idx = 0
         self._tasks: set[asyncio.Task] = set()
@@ -29,21 +41,47 @@ class MockLLM(BaseLLM):
             self._idx = 0
         handle = AsyncLLMResponseHandle()
 
+        def delta(
+            *,
+            content: str | None = None,
+            tool_call: runtime.ContextMessageContent_ToolCallDelta | None = None,
+        ):
+            return runtime.ContextMessageContent_ChoiceDelta(
+                content=content,
+                tool_calls=[tool_call] if tool_call is not None else [],
+                refusal=None,
+                role=runtime.ContextMessageRole(
+                    value=runtime.ContextMessageRoleEnum.ASSISTANT
+                ),
+                usage=None,
+            )
+
+        async def stream_tool_calls(tool_calls: list[tuple[str, dict]]):
+            for index, (name, args) in enumerate(tool_calls):
+                await asyncio.sleep(self._token_s)
+                tc = runtime.ContextMessageContent_ToolCallDelta(
+                    index=index, id=f"call_{index}", name=name, arguments=None
+                )
+                handle.put_thread_safe(delta(tool_call=tc))
+                args_json = json.dumps(args)
+                for i in range(0, len(args_json), 4):
+                    await asyncio.sleep(self._token_s)
+                    tc = runtime.ContextMessageContent_ToolCallDelta(
+                        index=index, id=None, name=None, arguments=args_json[i : i + 4]
+                    )
+                    handle.put_thread_safe(delta(tool_call=tc))
+
         async def resp_task():
             try:
-                resp = MOCK_RESPONSES[self._idx]
-                split = resp.split(" ")
-                for i in range(len(split)):
-                    await asyncio.sleep(0.1)
-                    handle.put_thread_safe(
-                        runtime.ContextMessageContent_ChoiceDelta(
-                            content=split[i] + " ",
-                            tool_calls=[],
-                            refusal=None,
-                            role=runtime.ContextMessageRole.ASSISTANT,
-                            usage=None,
-                        )
-                    )
+                await asyncio.sleep(self._first_token_s)
+                if self._tool_calls:
+                    await stream_tool_calls(self._tool_calls)
+                else:
+                    resp = MOCK_RESPONSES[self._idx]
+                    split = resp.split(" ")
+                    for i in range(len(split)):
+                        await asyncio.sleep(self._token_s)
+                        handle.put_thread_safe(delta(content=split[i] + " "))
             except Exception:
                 logging.error("Error while processing mock response", exc_info=True)
             except asyncio.CancelledError:
@@ -3,8 +3,10 @@
 
 import asyncio
 import logging
+import weakref
 from typing import Any, cast
 
+import httpx
 import openai
 from gabber.core.types.runtime import (
     ContextMessageContent_ChoiceDelta,
@@ -25,6 +27,49 @@ class OpenAICompatibleLLMError(Exception):
         self.msg = msg
 
 
+# Keep idle connections well past httpx's 5s default, conversational turns
+# are often further apart than that
+CONNECTION_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=120.0
+)
+
+# Clients are bound to the event loop they first connect on
+_ClientKey = tuple[str, str, str | None, tuple[tuple[str, str], ...]]
+_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[_ClientKey, openai.AsyncClient]
+] = weakref.WeakKeyDictionary()
+
+
+def shared_client(
+    *,
+    base_url: str,
+    api_key: str,
+    headers: dict[str, str],
+    uds_path: str | None = None,
+) -> openai.AsyncClient:
+    """Client shared by every LLM in the process with the same endpoint and
+    credentials, so requests reuse its pooled keep-alive connections."""
+    clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    key = (base_url, api_key, uds_path, tuple(sorted(headers.items())))
+    client = clients.get(key)
+    if client is None:
+        if uds_path is not None:
+            # The host in base_url is still sent but the connection goes
+            # through the socket
+            transport = httpx.AsyncHTTPTransport(uds=uds_path, limits=CONNECTION_LIMITS)
+            http_client = openai.DefaultAsyncHttpxClient(transport=transport)
+        else:
+            http_client = openai.DefaultAsyncHttpxClient(limits=CONNECTION_LIMITS)
+        client = openai.AsyncClient(
+            api_key=api_key,
+            default_headers=headers,
+            base_url=base_url,
+            http_client=http_client,
+        )
+        clients[key] = client
+    return client
+
+
 class OpenAICompatibleLLM:
     def __init__(
         self,
@@ -35,16 +80,38 @@ class OpenAICompatibleLLM:
         model: str,
         max_context_len: int,
         token_estimator: TokenEstimator,
+        uds_path: str | None = None,
     ):
         self._model = model
-        self._client = openai.AsyncClient(
-            api_key=api_key,
-            default_headers=headers,
-            base_url=base_url,
+        self._client = shared_client(
+            base_url=base_url, api_key=api_key, headers=headers, uds_path=uds_path
         )
         self._token_estimator = token_estimator
         self._max_context_len = max_context_len
         self._tasks = set[asyncio.Task]()
+        self._served_model_t: asyncio.Task[str | None] | None = None
+
+    async def prewarm(self):
+        """Open a pooled connection ahead of the first completion."""
+        await self.served_model()
+
+    async def served_model(self) -> str | None:
+        """First model id listed by the endpoint, fetched once, or None if
+        the endpoint didn't list any."""
+        if self._served_model_t is None:
+            self._served_model_t = asyncio.create_task(self._list_models())
+        # Shared by prewarm and capability resolution, one caller being
+        # cancelled mustn't cancel it for the other
+        return await asyncio.shield(self._served_model_t)
+
+    async def _list_models(self) -> str | None:
+        try:
+            models = await self._client.models.list()
+        except Exception:
+            # Any response at all leaves a connection in the pool
+            logging.debug("LLM prewarm request failed", exc_info=True)
+            return None
+        return models.data[0].id if models.data else None
 
     async def create_completion(
         self,
@@ -0,0 +1,109 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Awaitable, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class RequestPolicy(str, Enum):
+    # Run every request in arrival order
+    QUEUE = "queue"
+    # Cancel the running generation and run only the newest request
+    LATEST_WINS = "latest_wins"
+    # Let the running generation finish, then run only the newest request
+    COALESCE = "coalesce"
+
+
+@dataclass
+class RequestPolicyStats:
+    queued: int = 0
+    cancelled: int = 0
+    coalesced: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "queued": self.queued,
+            "cancelled": self.cancelled,
+            "coalesced": self.coalesced,
+        }
+
+
+class RequestScheduler(Generic[T]):
+    """Runs LLM requests one at a time under a RequestPolicy.
+
+    start(request) makes the request and returns the task consuming it, or
+    None if it failed to start. drop(request) is called for requests that are
+    superseded by a newer one and will never run. cancel(request) stops the
+    running generation of a request superseded under LATEST_WINS, which
+    should then publish nothing.
+    """
+
+    def __init__(
+        self,
+        *,
+        start: Callable[[T], Awaitable[asyncio.Task | None]],
+        drop: Callable[[T], None],
+        cancel: Callable[[T], None],
+        logger: logging.Logger | logging.LoggerAdapter,
+    ):
+        self._start = start
+        self._drop = drop
+        self._cancel = cancel
+        self._logger = logger
+        self._policy = RequestPolicy.LATEST_WINS
+        self._pending: deque[T] = deque()
+        self._changed = asyncio.Event()
+        self._running: tuple[T, asyncio.Task] | None = None
+        self.stats = RequestPolicyStats()
+
+    @property
+    def busy(self) -> bool:
+        return self._running is not None and not self._running[1].done()
+
+    def submit(self, request: T, policy: RequestPolicy):
+        self._policy = policy
+        if policy != RequestPolicy.QUEUE:
+            # Only the newest pending request is ever worth running
+            while self._pending:
+                self._drop(self._pending.popleft())
+                self.stats.coalesced += 1
+                self._logger.info(
+                    f"Coalesced LLM request into a newer one: {self.stats.to_dict()}"
+                )
+        if policy != RequestPolicy.LATEST_WINS and (self.busy or self._pending):
+            # Waits for the running generation to finish
+            self.stats.queued += 1
+        self._pending.append(request)
+        self._changed.set()
+
+    async def run(self):
+        while True:
+            while not self._pending:
+                self._changed.clear()
+                await self._changed.wait()
+
+            if self._running is not None:
+                running, task = self._running
+                if not task.done() and self._policy == RequestPolicy.LATEST_WINS:
+                    self._cancel(running)
+                    self.stats.cancelled += 1
+                    self._logger.info(
+                        "Cancelled LLM generation for a newer request: "
+                        f"{self.stats.to_dict()}"
+                    )
+                # A finished generation publishes its message before the next
+                # request reads the context, a cancelled one just stops
+                await asyncio.wait([task])
+                self._running = None
+
+            # A newer request may have superseded this one while waiting
+            request = self._pending.popleft()
+            task = await self._start(request)
+            if task is not None:
+                self._running = (request, task)
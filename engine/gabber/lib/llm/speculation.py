@@ -0,0 +1,123 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import time
+import unicodedata
+from dataclasses import dataclass
+
+from gabber.core.types import runtime
+
+from .llm import AsyncLLMResponseHandle, LLMRequest
+
+
+def normalize_transcript(text: str) -> str:
+    """Casefold, drop punctuation and collapse whitespace, so that STT
+    revisions to casing or punctuation don't count as a different turn."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = "".join(" " if unicodedata.category(c).startswith("P") else c for c in text)
+    return " ".join(text.split())
+
+
+def transcript_message(transcript: str) -> runtime.ContextMessage:
+    return runtime.ContextMessage(
+        role=runtime.ContextMessageRoleEnum.USER,
+        content=[runtime.ContextMessageContentItem_Text(content=transcript)],
+        tool_calls=[],
+    )
+
+
+def transcript_text(msg: runtime.ContextMessage, *, audio_support: bool) -> str | None:
+    """Text the LLM would see for a user message, or None if it also carries
+    content that a speculation on the transcript alone did not include."""
+    parts: list[str] = []
+    for cnt in msg.content:
+        if isinstance(cnt, runtime.ContextMessageContentItem_Text):
+            parts.append(cnt.content)
+        elif isinstance(cnt, runtime.ContextMessageContentItem_Audio):
+            if audio_support or cnt.clip.transcription is None:
+                return None
+            parts.append(cnt.clip.transcription)
+        else:
+            return None
+    return " ".join(parts)
+
+
+class Speculation:
+    """An LLM generation started on a stable interim transcript.
+
+    The generation streams into its handle while the user finishes the turn.
+    Nothing is read from the handle until the final context arrives: if it is
+    the speculated context plus one user message with the same normalized
+    transcript, the handle is consumed as if the request had just been made
+    and the tokens generated so far come out at once. Otherwise it is
+    cancelled.
+    """
+
+    def __init__(
+        self,
+        *,
+        transcript: str,
+        context: list[runtime.ContextMessage],
+        handle: AsyncLLMResponseHandle,
+        estimated_prompt_tokens: int,
+    ):
+        self.transcript = transcript
+        self.normalized = normalize_transcript(transcript)
+        self.context = context
+        self.handle = handle
+        self.estimated_prompt_tokens = estimated_prompt_tokens
+        self.started_at = time.monotonic()
+
+    @staticmethod
+    def request(
+        transcript: str,
+        context: list[runtime.ContextMessage],
+        tool_definitions: list[runtime.ToolDefinition],
+    ) -> LLMRequest:
+        return LLMRequest(
+            context=[*context, transcript_message(transcript)],
+            tool_definitions=tool_definitions,
+        )
+
+    def matches(
+        self, context: list[runtime.ContextMessage], *, audio_support: bool
+    ) -> bool:
+        # The context is only ever extended with the same message objects, so
+        # identity is enough for the prefix and avoids comparing media
+        if len(context) != len(self.context) + 1:
+            return False
+        if any(a is not b for a, b in zip(self.context, context)):
+            return False
+        final = context[-1]
+        if final.role != runtime.ContextMessageRoleEnum.USER:
+            return False
+        text = transcript_text(final, audio_support=audio_support)
+        return text is not None and normalize_transcript(text) == self.normalized
+
+
+@dataclass
+class SpeculationStats:
+    started: int = 0
+    committed: int = 0
+    cancelled: int = 0
+    # How far ahead of the end of turn committed speculations were started
+    head_start_s: float = 0.0
+
+    def commit(self, speculation: Speculation):
+        self.committed += 1
+        self.head_start_s += time.monotonic() - speculation.started_at
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.committed + self.cancelled
+        return self.committed / total if total else 0.0
+
+    def to_dict(self) -> dict[str, float | int]:
+        head_start = self.head_start_s / self.committed if self.committed else 0.0
+        return {
+            "started": self.started,
+            "committed": self.committed,
+            "cancelled": self.cancelled,
+            "hit_rate": round(self.hit_rate, 3),
+            "mean_head_start_ms": round(head_start * 1000, 1),
+        }
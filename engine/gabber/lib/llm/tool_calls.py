@@ -0,0 +1,121 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+import json_repair
+
+from gabber.core.types import runtime
+
+
+@dataclass
+class _PartialToolCall:
+    index: int
+    call_id: str = ""
+    name: str = ""
+    arguments: list[str] = field(default_factory=list)
+    done: bool = False
+
+    def parse_complete(self) -> dict[str, Any] | None:
+        """The arguments if they already form a whole JSON object.
+
+        Nothing can follow a closed top level object, so a call whose
+        arguments parse is finished even though the stream isn't."""
+        if not self.arguments or not self.arguments[-1].rstrip().endswith("}"):
+            return None
+        try:
+            args = json.loads("".join(self.arguments))
+        except ValueError:
+            return None
+        return args if isinstance(args, dict) else None
+
+    def to_tool_call(self, arguments: dict[str, Any]) -> runtime.ToolCall:
+        self.done = True
+        return runtime.ToolCall(
+            name=self.name,
+            arguments=arguments,
+            call_id=self.call_id,
+            index=self.index,
+        )
+
+
+class ToolCallAssembler:
+    """Builds tool calls from streamed choice deltas as they arrive.
+
+    push() returns the calls whose arguments completed with that delta, so
+    they can be dispatched while the model is still streaming the rest. A
+    call is complete once its arguments parse as a JSON object or a delta
+    for a later call starts. finish() returns whatever is left at the end of
+    the stream, repairing truncated arguments like get_tool_calls_from_deltas.
+    """
+
+    def __init__(self):
+        self._partials: dict[int, _PartialToolCall] = {}
+        self._calls: dict[int, runtime.ToolCall] = {}
+
+    @property
+    def calls(self) -> list[runtime.ToolCall]:
+        """Every call completed so far, in index order."""
+        return [self._calls[i] for i in sorted(self._calls)]
+
+    def push(
+        self, delta: runtime.ContextMessageContent_ChoiceDelta
+    ) -> list[runtime.ToolCall]:
+        if not delta.tool_calls:
+            return []
+
+        touched: list[_PartialToolCall] = []
+        for tc_delta in delta.tool_calls:
+            partial = self._partials.get(tc_delta.index)
+            if partial is None:
+                partial = _PartialToolCall(index=tc_delta.index)
+                self._partials[tc_delta.index] = partial
+            if partial.done:
+                continue
+            if tc_delta.id:
+                partial.call_id = tc_delta.id
+            if tc_delta.name:
+                partial.name = tc_delta.name
+            if tc_delta.arguments:
+                partial.arguments.append(tc_delta.arguments)
+            if partial not in touched:
+                touched.append(partial)
+
+        completed: list[runtime.ToolCall] = []
+        newest = max(self._partials)
+        # Sorted so calls completing together are dispatched in order
+        for i in sorted(self._partials):
+            partial = self._partials[i]
+            if partial.done:
+                continue
+            args = None
+            if partial in touched:
+                args = partial.parse_complete()
+            if args is None and partial.index < newest:
+                # Calls are streamed one after another
+                args = self._repair(partial)
+            if args is not None:
+                completed.append(self._complete(partial, args))
+        return completed
+
+    def finish(self) -> list[runtime.ToolCall]:
+        completed: list[runtime.ToolCall] = []
+        for i in sorted(self._partials):
+            partial = self._partials[i]
+            if not partial.done:
+                completed.append(self._complete(partial, self._repair(partial)))
+        return completed
+
+    def _complete(
+        self, partial: _PartialToolCall, arguments: dict[str, Any]
+    ) -> runtime.ToolCall:
+        tc = partial.to_tool_call(arguments)
+        self._calls[tc.index] = tc
+        return tc
+
+    @staticmethod
+    def _repair(partial: _PartialToolCall) -> dict[str, Any]:
+        args = cast(Any, json_repair.loads("".join(partial.arguments)))
+        return args if isinstance(args, dict) else {}
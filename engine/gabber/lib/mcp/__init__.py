@@ -0,0 +1,6 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+from .tool_cache import ToolDefinitionCache
+
+__all__ = ["ToolDefinitionCache"]
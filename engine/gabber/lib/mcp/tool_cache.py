@@ -0,0 +1,57 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+from mcp import ClientSession, types
+from mcp.shared.session import RequestResponder
+
+from gabber.core.types import runtime
+
+
+class ToolDefinitionCache:
+    """Tool definitions of one MCP client session.
+
+    The server's tool list is fetched once and reused for every LLM turn
+    until the server sends notifications/tools/list_changed. Pass
+    on_message as the session's message_handler so the cache sees it, and
+    use a new cache for every new session.
+    """
+
+    def __init__(self):
+        self._tool_definitions: list[runtime.ToolDefinition] | None = None
+        # Bumped on invalidation so a listing already in flight isn't cached
+        self._version = 0
+
+    def invalidate(self):
+        self._version += 1
+        self._tool_definitions = None
+
+    async def on_message(
+        self,
+        message: RequestResponder[types.ServerRequest, types.ClientResult]
+        | types.ServerNotification
+        | Exception,
+    ):
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            self.invalidate()
+
+    async def get(self, session: ClientSession) -> list[runtime.ToolDefinition]:
+        if self._tool_definitions is not None:
+            return list(self._tool_definitions)
+
+        version = self._version
+        mcp_tools_res = await session.list_tools()
+        tool_defs: list[runtime.ToolDefinition] = []
+        for t in mcp_tools_res.tools:
+            tool_def = runtime.ToolDefinition(
+                name=t.name,
+                description=t.description or "",
+                parameters=t.inputSchema,
+                destination=runtime.ToolDefinitionDestination_Client(),
+            )
+            tool_defs.append(tool_def)
+
+        if version == self._version:
+            self._tool_definitions = tool_defs
+        return list(tool_defs)
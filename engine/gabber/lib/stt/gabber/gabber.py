@@ -4,14 +4,17 @@
 import asyncio
 import logging
 import base64
+from .audio_ring import AudioRing, AudioRingFull
 from .messages import (
     RequestPayload_StartSession,
     RequestPayload_AudioData,
+    RequestPayload_AudioRing,
     Response,
     Request,
 )
 
 import aiohttp
+import numpy as np
 
 from gabber.core.types.runtime import AudioClip, AudioFrame
 from gabber.utils import short_uuid
@@ -25,6 +28,9 @@ from ..stt import (
     STTEvent_Viseme,
 )
 
+# 10s at 16kHz, well past the point where the server drops a lagging session
+RING_CAPACITY = 16000 * 10
+
 
 class Gabber(STT):
     def __init__(
@@ -33,9 +39,17 @@ class Gabber(STT):
         logger: logging.Logger | logging.LoggerAdapter,
         url: str = "ws://localhost:7004",
         viseme_mode: bool = False,
+        uds_path: str | None = None,
+        shared_memory: bool = False,
     ):
+        """uds_path connects over a unix socket instead of the url's host and
+        port. shared_memory additionally passes audio through a shared ring,
+        which needs uds_path since it only works when both ends share a host.
+        """
         self.logger = logger
         self._viseme_mode = viseme_mode
+        self._uds_path = uds_path
+        self._shared_memory = shared_memory and uds_path is not None
         self._process_queue = asyncio.Queue[AudioFrame | None]()
         self._closed = False
         self._output_queue = asyncio.Queue[STTEvent | None]()
@@ -58,6 +72,9 @@ class Gabber(STT):
         running_words: list[str] = []
         dur: float = 0
         audio_window = AudioWindow(max_dur_s=180.0)
+        ring: AudioRing | None = None
+        if self._shared_memory:
+            ring = AudioRing.create(RING_CAPACITY)
 
         async def rec_task(ws: aiohttp.ClientWebSocketResponse) -> None:
             nonlocal running_words, audio_window
@@ -107,6 +124,19 @@ class Gabber(STT):
                     self._output_queue.put_nowait(
                         STTEvent_Viseme(viseme=payload.viseme, id="")
                     )
+                elif payload.type == "overloaded":
+                    self.logger.error(f"STT server overloaded: {payload.reason}")
+                elif payload.type == "degraded":
+                    self.logger.warning(
+                        f"STT degraded: {payload.degraded} lag: {payload.lag_s:.2f}s"
+                    )
+                elif payload.type == "qos":
+                    self.logger.info(
+                        f"STT interim level: {payload.level} "
+                        f"interval: {payload.interim_interval_s}"
+                    )
+                elif payload.type == "error":
+                    self.logger.error(f"STT error: {payload.message}")
 
         async def send_task(ws: aiohttp.ClientWebSocketResponse) -> None:
             nonlocal dur
@@ -115,6 +145,8 @@ class Gabber(STT):
                 sample_rate=16000,
                 lipsync_enabled=self._viseme_mode,
                 stt_enabled=not self._viseme_mode,
+                shm_name=ring.name if ring is not None else None,
+                shm_capacity=ring.capacity if ring is not None else 0,
             )
             start_msg = Request(payload=start_payload, session_id=session_id)
             await ws.send_str(start_msg.model_dump_json())
@@ -138,13 +170,24 @@ class Gabber(STT):
                     chunk = audio_bytes[i : i + 3200]
                     if len(chunk) != 3200:
                         break
-                    b64_audio = base64.b64encode(chunk).decode("utf-8")
-                    payload = RequestPayload_AudioData(b64_data=b64_audio)
-                    msg = Request(payload=payload, session_id=session_id)
-                    await ws.send_str(msg.model_dump_json())
+                    await ws.send_str(audio_msg(chunk).model_dump_json())
 
                 audio_bytes = audio_bytes[(len(audio_bytes) // 3200) * 3200 :]
 
+        def audio_msg(chunk: bytes) -> Request:
+            if ring is not None:
+                try:
+                    end = ring.write(np.frombuffer(chunk, dtype=np.int16))
+                    payload = RequestPayload_AudioRing(end_sample=end)
+                    return Request(payload=payload, session_id=session_id)
+                except AudioRingFull:
+                    # Ordered with the ring messages, so falling back is safe
+                    self.logger.warning("Audio ring full, sending inline")
+
+            b64_audio = base64.b64encode(chunk).decode("utf-8")
+            payload = RequestPayload_AudioData(b64_data=b64_audio)
+            return Request(payload=payload, session_id=session_id)
+
         async def keepalive_task(ws: aiohttp.ClientWebSocketResponse) -> None:
             while not self._closed:
                 await asyncio.sleep(2)
@@ -152,13 +195,20 @@ class Gabber(STT):
                     break
                 await ws.ping()
 
-        async with aiohttp.ClientSession() as session:
-            async with session.ws_connect(self._url) as ws:  # Adjust port as needed
-                await asyncio.gather(
-                    rec_task(ws),
-                    send_task(ws),
-                    keepalive_task(ws),
-                )
+        connector = (
+            aiohttp.UnixConnector(path=self._uds_path) if self._uds_path else None
+        )
+        try:
+            async with aiohttp.ClientSession(connector=connector) as session:
+                async with session.ws_connect(self._url) as ws:
+                    await asyncio.gather(
+                        rec_task(ws),
+                        send_task(ws),
+                        keepalive_task(ws),
+                    )
+        finally:
+            if ring is not None:
+                ring.close()
 
     def __aiter__(self):
         return self
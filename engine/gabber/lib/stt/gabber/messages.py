@@ -7,6 +7,8 @@ class RequestPayload_StartSession(BaseModel):
     sample_rate: int
     stt_enabled: bool
     lipsync_enabled: bool
+    shm_name: str | None = None
+    shm_capacity: int = 0
 
 
 class RequestPayload_AudioData(BaseModel):
@@ -14,12 +16,20 @@ class RequestPayload_AudioData(BaseModel):
     b64_data: str
 
 
+class RequestPayload_AudioRing(BaseModel):
+    type: Literal["audio_ring"] = "audio_ring"
+    end_sample: int
+
+
 class RequestPayload_EndSession(BaseModel):
     type: Literal["end_session"] = "end_session"
 
 
 RequestPayload = Annotated[
-    RequestPayload_StartSession | RequestPayload_AudioData | RequestPayload_EndSession,
+    RequestPayload_StartSession
+    | RequestPayload_AudioData
+    | RequestPayload_AudioRing
+    | RequestPayload_EndSession,
     Field(discriminator="type"),
 ]
 
@@ -34,6 +44,23 @@ class ResponsePayload_Error(BaseModel):
     message: str
 
 
+class ResponsePayload_Overloaded(BaseModel):
+    type: Literal["overloaded"] = "overloaded"
+    reason: str
+
+
+class ResponsePayload_Degraded(BaseModel):
+    type: Literal["degraded"] = "degraded"
+    degraded: bool
+    lag_s: float
+
+
+class ResponsePayload_QoS(BaseModel):
+    type: Literal["qos"] = "qos"
+    level: str
+    interim_interval_s: float | None
+
+
 class ResponsePayload_InterimTranscription(BaseModel):
     type: Literal["interim_transcription"] = "interim_transcription"
     trans_id: int
@@ -66,6 +93,9 @@ class ResponsePayload_LipSyncViseme(BaseModel):
 
 ResponsePayload = Annotated[
     ResponsePayload_Error
+    | ResponsePayload_Overloaded
+    | ResponsePayload_Degraded
+    | ResponsePayload_QoS
     | ResponsePayload_InterimTranscription
     | ResponsePayload_SpeakingStarted
     | ResponsePayload_FinalTranscription
@@ -0,0 +1,213 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import asyncio
+import hashlib
+import logging
+import os
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gabber.core.types.runtime import AudioFrame, AudioFrameData
+from gabber.lib.audio import FrameResampler
+
+# Long responses rarely repeat word for word, so only short phrases
+# (greetings, fillers, fixed prompts) are worth keeping
+MAX_CACHED_CHARS = 200
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Replayed audio is cut into 20ms frames like a streaming backend would send
+REPLAY_FRAMES_PER_SECOND = 50
+
+# Hit rate is logged every this many lookups
+LOG_INTERVAL = 100
+
+# On-disk entries start with the sample rate as a little-endian uint32
+_HEADER = np.dtype("<u4")
+
+
+@dataclass(frozen=True)
+class CachedAudio:
+    # Mono PCM at the backend's native rate
+    pcm: NDArray[np.int16]
+    sample_rate: int
+
+    @property
+    def nbytes(self) -> int:
+        return self.pcm.nbytes
+
+    async def frames(self) -> AsyncIterator[AudioFrame]:
+        resampler = FrameResampler()
+        step = self.sample_rate // REPLAY_FRAMES_PER_SECOND
+        for start in range(0, self.pcm.shape[0], step):
+            original = AudioFrameData(
+                data=self.pcm[start : start + step].reshape(1, -1),
+                sample_rate=self.sample_rate,
+                num_channels=1,
+            )
+            yield resampler.frame(original)
+
+
+class TTSCache:
+    """LRU of synthesized phrases, optionally backed by a directory.
+
+    Entries are keyed by backend, voice, model and normalized text, and hold
+    PCM at the backend's native rate so a hit replays exactly what the
+    backend produced. The directory is not size-limited, memory is capped at
+    max_bytes.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        directory: str | None = None,
+    ):
+        self._max_bytes = max_bytes
+        self._directory = directory
+        self._entries = OrderedDict[str, CachedAudio]()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    @classmethod
+    def cacheable(cls, text: str) -> bool:
+        normalized = cls.normalize_text(text)
+        return 0 < len(normalized) <= MAX_CACHED_CHARS
+
+    @classmethod
+    def key(cls, *, backend: str, voice: str, model: str, text: str) -> str:
+        parts = [backend, voice, model, cls.normalize_text(text)]
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "entries": len(self._entries),
+            "bytes": self._nbytes,
+        }
+
+    async def get(self, key: str) -> CachedAudio | None:
+        audio = self._entries.get(key)
+        if audio is not None:
+            self._entries.move_to_end(key)
+        elif self._directory is not None:
+            audio = await asyncio.to_thread(self._read, key)
+            if audio is not None:
+                self._insert(key, audio)
+
+        if audio is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        if (self.hits + self.misses) % LOG_INTERVAL == 0:
+            logging.info(f"TTS cache stats: {self.stats()}")
+        return audio
+
+    async def put(self, key: str, audio: CachedAudio):
+        self._insert(key, audio)
+        if self._directory is not None:
+            try:
+                await asyncio.to_thread(self._write, key, audio)
+            except OSError as e:
+                logging.warning(f"Failed to write TTS cache entry: {e}")
+
+    def _insert(self, key: str, audio: CachedAudio):
+        if audio.nbytes > self._max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._nbytes -= old.nbytes
+        self._entries[key] = audio
+        self._nbytes += audio.nbytes
+        while self._nbytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._nbytes -= evicted.nbytes
+
+    def _path(self, key: str) -> str:
+        assert self._directory is not None
+        return os.path.join(self._directory, f"{key}.pcm")
+
+    def _read(self, key: str) -> CachedAudio | None:
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < _HEADER.itemsize or (len(data) - _HEADER.itemsize) % 2:
+            logging.warning(f"Ignoring corrupt TTS cache entry {key}")
+            return None
+        sample_rate = int(np.frombuffer(data, dtype=_HEADER, count=1)[0])
+        pcm = np.frombuffer(data, dtype=np.int16, offset=_HEADER.itemsize)
+        return CachedAudio(pcm=pcm, sample_rate=sample_rate)
+
+    def _write(self, key: str, audio: CachedAudio):
+        path = self._path(key)
+        # Write then rename so concurrent readers never see a partial entry
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(np.array([audio.sample_rate], dtype=_HEADER).tobytes())
+            f.write(audio.pcm.tobytes())
+        os.replace(tmp, path)
+
+
+_default_cache: TTSCache | None = None
+
+
+def default_cache() -> TTSCache:
+    """Process-wide cache shared by every TTS node.
+
+    GABBER_TTS_CACHE_DIR enables the on-disk cache and
+    GABBER_TTS_CACHE_MAX_MB sets the in-memory budget.
+    """
+    global _default_cache
+    if _default_cache is None:
+        max_mb = float(os.environ.get("GABBER_TTS_CACHE_MAX_MB", "64"))
+        _default_cache = TTSCache(
+            max_bytes=int(max_mb * 1024 * 1024),
+            directory=os.environ.get("GABBER_TTS_CACHE_DIR") or None,
+        )
+    return _default_cache
+
+
+class CacheRecorder:
+    """Collects a backend's output frames so a finished phrase can be cached."""
+
+    def __init__(self):
+        self._chunks: list[NDArray[np.int16]] = []
+        self._sample_rate: int | None = None
+        self._valid = True
+
+    def push(self, frame: AudioFrame):
+        data = frame.original_data
+        if self._sample_rate is None:
+            self._sample_rate = data.sample_rate
+        if data.sample_rate != self._sample_rate or data.num_channels != 1:
+            self._valid = False
+            return
+        self._chunks.append(data.data.reshape(-1))
+
+    def finish(self) -> CachedAudio | None:
+        if not self._valid or self._sample_rate is None or not self._chunks:
+            return None
+        return CachedAudio(
+            pcm=np.concatenate(self._chunks), sample_rate=self._sample_rate
+        )
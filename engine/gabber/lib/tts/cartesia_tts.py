@@ -103,6 +103,9 @@ class CartesiaTTS(MultiplexWebSocketTTS):
     def is_error_message(self, msg: dict[str, Any]) -> bool:
         return msg["type"] == "error"
 
+    def get_sample_rate(self) -> int:
+        return SAMPLE_RATE
+
     def get_url(self) -> str:
         return "wss://api.cartesia.ai/tts/websocket?cartesia_version=2025-04-16"
 
@@ -84,6 +84,9 @@ class ElevenLabsTTS(MultiplexWebSocketTTS):
     def is_error_message(self, msg: dict[str, Any]) -> bool:
         return False
 
+    def get_sample_rate(self) -> int:
+        return SAMPLE_RATE
+
     def get_url(self) -> str:
         return f"wss://api.elevenlabs.io/v1/text-to-speech/{self._voice}/multi-stream-input?output_format=pcm_24000"
 
@@ -78,6 +78,9 @@ class GabberTTS(MultiplexWebSocketTTS):
     def is_error_message(self, msg: dict[str, Any]) -> bool:
         return msg["type"] == "error"
 
+    def get_sample_rate(self) -> int:
+        return SAMPLE_RATE
+
     def get_url(self) -> str:
         # return f"wss://api.gabber.dev/voice/websocket?api-key={self._api_key}"
         return f"wss://api.gabber.dev/voice/websocket?api-key={self._api_key}"
@@ -4,11 +4,9 @@ from typing import Any, Literal
 
 import aiohttp
 import numpy as np
-import time
 
-from gabber.lib.audio import Resampler
 from gabber.utils import EmojiRemover, ItalicRemover, ParenthesisRemover
-from gabber.core.types.runtime import AudioFrame, AudioFrameData
+from gabber.core.types.runtime import AudioFrameData
 
 from .tts import TTS, TTSSession
 
@@ -88,9 +86,6 @@ class MinimaxTTS(TTS):
             await task
 
     async def session_task(self, session: "TTSSession"):
-        r_16000hz = Resampler(16000)
-        r_44100hz = Resampler(44100)
-        r_48000hz = Resampler(48000)
         headers = self.get_headers()
 
         async def receive_task(ws: aiohttp.ClientWebSocketResponse):
@@ -125,17 +120,7 @@ class MinimaxTTS(TTS):
                     )
                     if len(bytes_24000) == 0:
                         continue
-                    frame_data_16000 = r_16000hz.push_audio(frame_data_24000)
-                    frame_data_44100 = r_44100hz.push_audio(frame_data_24000)
-                    frame_data_48000 = r_48000hz.push_audio(frame_data_24000)
-                    frame = AudioFrame(
-                        start_timestamp=time.time(),
-                        original_data=frame_data_24000,
-                        data_16000hz=frame_data_16000,
-                        data_24000hz=frame_data_24000,
-                        data_44100hz=frame_data_44100,
-                        data_48000hz=frame_data_48000,
-                    )
+                    frame = session._resampler.frame(frame_data_24000)
                     session._output_queue.put_nowait(frame)
                 elif receive_item.get("event") == "task_failed":
                     self.logger.error(f"TTS error for session: {receive_item}")
@@ -1,15 +1,13 @@
 # Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
 # SPDX-License-Identifier: SUL-1.0
 
-import time
 import asyncio
 import logging
 
 import numpy as np
 from openai import AsyncOpenAI
 
-from gabber.core.types.runtime import AudioFrame, AudioFrameData
-from gabber.lib.audio import Resampler
+from gabber.core.types.runtime import AudioFrameData
 
 from .tts import TTS, TTSSession
 
@@ -58,9 +56,6 @@ class OpenAITTSSession(TTSSession):
         self.model = model
 
     async def run(self):
-        r_16000hz = Resampler(16000)
-        r_44100hz = Resampler(44100)
-        r_48000hz = Resampler(48000)
         text = ""
         while True:
             chunk = await self._text_queue.get()
@@ -88,17 +83,7 @@ class OpenAITTSSession(TTSSession):
                         sample_rate=24000,
                         num_channels=1,
                     )
-                    frame_data_16000 = r_16000hz.push_audio(frame_data_24000)
-                    frame_data_44100 = r_44100hz.push_audio(frame_data_24000)
-                    frame_data_48000 = r_48000hz.push_audio(frame_data_24000)
-                    frame = AudioFrame(
-                        start_timestamp=time.time(),
-                        original_data=frame_data_24000,
-                        data_16000hz=frame_data_16000,
-                        data_24000hz=frame_data_24000,
-                        data_44100hz=frame_data_44100,
-                        data_48000hz=frame_data_48000,
-                    )
+                    frame = self._resampler.frame(frame_data_24000)
                     running_chunk = b""
                     self._output_queue.put_nowait(frame)
 
@@ -110,17 +95,7 @@ class OpenAITTSSession(TTSSession):
                     sample_rate=24000,
                     num_channels=1,
                 )
-                frame_data_16000 = r_16000hz.push_audio(frame_data_24000)
-                frame_data_44100 = r_44100hz.push_audio(frame_data_24000)
-                frame_data_48000 = r_48000hz.push_audio(frame_data_24000)
-                frame = AudioFrame(
-                    start_timestamp=time.time(),
-                    original_data=frame_data_24000,
-                    data_16000hz=frame_data_16000,
-                    data_24000hz=frame_data_24000,
-                    data_44100hz=frame_data_44100,
-                    data_48000hz=frame_data_48000,
-                )
+                frame = self._resampler.frame(frame_data_24000)
                 self._output_queue.put_nowait(frame)
 
             self._output_queue.put_nowait(None)
@@ -0,0 +1,135 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import asyncio
+import re
+import time
+from typing import AsyncIterable, AsyncIterator
+
+# Punctuation followed by whitespace, so decimals and URLs don't split
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s")
+_CLAUSE_END = re.compile(r"[,;:—]\s|\s[-–]\s")
+
+
+class TextChunker:
+    """Coalesces streamed LLM deltas into clause- or sentence-sized chunks.
+
+    The first chunk is cut at the first clause boundary once it has at least
+    first_chunk_chars, so the first provider request is small. Later chunks
+    end at sentence boundaries, or at a clause boundary once they pass
+    max_chunk_chars. Buffered text is flushed once no text has arrived for
+    max_wait_s, which bounds latency when the LLM stalls mid-sentence without
+    cutting sentences that are just slow to stream.
+    """
+
+    def __init__(
+        self,
+        *,
+        first_chunk_chars: int = 20,
+        max_chunk_chars: int = 250,
+        max_wait_s: float = 0.4,
+    ):
+        self._first_chunk_chars = first_chunk_chars
+        self._max_chunk_chars = max_chunk_chars
+        self._max_wait_s = max_wait_s
+        self._buffer = ""
+        self._first = True
+        # When text last arrived
+        self._last_push = time.monotonic()
+
+    def push_text(self, text: str) -> list[str]:
+        if not text:
+            return []
+        self._last_push = time.monotonic()
+        self._buffer += text
+        return self._split()
+
+    def deadline(self) -> float | None:
+        """Monotonic time at which buffered text should be flushed."""
+        if not self._buffer:
+            return None
+        return self._last_push + self._max_wait_s
+
+    def flush_due(self) -> list[str]:
+        """Emit buffered text up to the last word boundary, the timer fired."""
+        cut = self._buffer.rfind(" ") + 1
+        if cut <= 0:
+            # A single unfinished word, one more wait won't hurt
+            self._last_push = time.monotonic()
+            return []
+        return [self._take(cut)]
+
+    def eos(self) -> list[str]:
+        if not self._buffer.strip():
+            self._buffer = ""
+            return []
+        return [self._take(len(self._buffer))]
+
+    def _take(self, end: int) -> str:
+        chunk, self._buffer = self._buffer[:end], self._buffer[end:]
+        self._first = False
+        return chunk
+
+    def _split(self) -> list[str]:
+        chunks = []
+        while True:
+            end = self._next_boundary()
+            if end is None:
+                break
+            chunks.append(self._take(end))
+        return chunks
+
+    def _next_boundary(self) -> int | None:
+        sentence = _SENTENCE_END.search(self._buffer)
+        min_clause = self._max_chunk_chars
+        if self._first:
+            min_clause = self._first_chunk_chars
+        for m in _CLAUSE_END.finditer(self._buffer):
+            if sentence is not None and m.end() >= sentence.end():
+                break
+            if m.end() >= min_clause:
+                return m.end()
+        if sentence is not None:
+            return sentence.end()
+
+        # No boundary in a long run of text: cut at the last word
+        if len(self._buffer) > self._max_chunk_chars:
+            cut = self._buffer.rfind(" ", 0, self._max_chunk_chars) + 1
+            return cut or self._max_chunk_chars
+        return None
+
+
+async def chunk_text(
+    stream: AsyncIterable[str], chunker: TextChunker | None = None
+) -> AsyncIterator[str]:
+    """Re-chunk a stream of text deltas, see TextChunker."""
+    chunker = chunker or TextChunker()
+    deltas = aiter(stream)
+    next_t: asyncio.Task[str] | None = None
+    try:
+        while True:
+            if next_t is None:
+                next_t = asyncio.ensure_future(anext(deltas))
+            timeout = None
+            if (deadline := chunker.deadline()) is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+            done, _ = await asyncio.wait([next_t], timeout=timeout)
+            if not done:
+                for chunk in chunker.flush_due():
+                    yield chunk
+                continue
+
+            try:
+                text = next_t.result()
+            except StopAsyncIteration:
+                break
+            finally:
+                next_t = None
+            for chunk in chunker.push_text(text):
+                yield chunk
+
+        for chunk in chunker.eos():
+            yield chunk
+    finally:
+        if next_t is not None:
+            next_t.cancel()
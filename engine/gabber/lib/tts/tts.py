@@ -2,7 +2,6 @@
 # SPDX-License-Identifier: SUL-1.0
 
 import asyncio
-import time
 import logging
 from abc import ABC, abstractmethod
 from typing import Any, Protocol
@@ -12,7 +11,7 @@ import numpy as np
 from gabber.core.types.runtime import AudioFrame, AudioFrameData
 from gabber.utils import short_uuid
 
-from gabber.lib.audio import Resampler
+from gabber.lib.audio import FrameResampler
 
 
 class TTS(Protocol):
@@ -68,9 +67,7 @@ class MultiplexWebSocketTTS(ABC, TTS):
                 break
 
     async def run(self):
-        r_16000hz = Resampler(16000)
-        r_44100hz = Resampler(44100)
-        r_48000hz = Resampler(48000)
+        sample_rate = self.get_sample_rate()
 
         async def send_task(ws: aiohttp.ClientWebSocketResponse):
             while True:
@@ -126,23 +123,13 @@ class MultiplexWebSocketTTS(ABC, TTS):
                     sess._output_queue.put_nowait(None)
                     self._session_lookup.pop(sess.context_id, None)
                 elif self.is_audio_message(receive_item):
-                    bytes_24000 = self.get_pcm_bytes(receive_item)
-                    frame_data_24000 = AudioFrameData(
-                        data=np.frombuffer(bytes_24000, dtype=np.int16).reshape(1, -1),
-                        sample_rate=24000,
+                    pcm_bytes = self.get_pcm_bytes(receive_item)
+                    frame_data = AudioFrameData(
+                        data=np.frombuffer(pcm_bytes, dtype=np.int16).reshape(1, -1),
+                        sample_rate=sample_rate,
                         num_channels=1,
                     )
-                    frame_data_16000 = r_16000hz.push_audio(frame_data_24000)
-                    frame_data_44100 = r_44100hz.push_audio(frame_data_24000)
-                    frame_data_48000 = r_48000hz.push_audio(frame_data_24000)
-                    frame = AudioFrame(
-                        start_timestamp=time.time(),
-                        original_data=frame_data_24000,
-                        data_16000hz=frame_data_16000,
-                        data_24000hz=frame_data_24000,
-                        data_44100hz=frame_data_44100,
-                        data_48000hz=frame_data_48000,
-                    )
+                    frame = sess._resampler.frame(frame_data)
                     sess._output_queue.put_nowait(frame)
                 elif self.is_error_message(receive_item):
                     self.logger.error(
@@ -180,6 +167,10 @@ class MultiplexWebSocketTTS(ABC, TTS):
         t.add_done_callback(self._session_tasks.discard)
         return tts_sess
 
+    def get_sample_rate(self) -> int:
+        """Sample rate of the PCM returned by get_pcm_bytes."""
+        return 24000
+
     @abstractmethod
     def get_url(self) -> str: ...
 
@@ -230,6 +221,8 @@ class TTSSession:
         self.context_id = short_uuid()
         self._text_queue = asyncio.Queue[str | None]()
         self._output_queue = asyncio.Queue[AudioFrame | Exception | None]()
+        # Per session so interleaved sessions keep separate filter state
+        self._resampler = FrameResampler()
         self.logger = logger
         self._closed = False
 
@@ -9,6 +9,7 @@ import contextlib
 from gabber.core import node, pad, mcp
 from gabber.core.types import runtime
 from gabber.core.node import NodeMetadata
+from gabber.lib.mcp import ToolDefinitionCache
 from mcp.types import ContentBlock
 from mcp import ClientSession
 from gabber.core.types import pad_constraints
@@ -53,6 +54,7 @@ class MCP(node.Node):
     async def run(self):
         self.init_lock = asyncio.Lock()
         self.session: ClientSession | None = None
+        self.tool_cache = ToolDefinitionCache()
         while True:
             exit_stack = contextlib.AsyncExitStack()
             async with self.init_lock:
@@ -65,6 +67,12 @@ class MCP(node.Node):
                     await exit_stack.aclose()
                     continue
 
+                # Warm the tool list so the first LLM turn doesn't wait on it
+                try:
+                    await asyncio.wait_for(self.tool_cache.get(self.session), timeout=2)
+                except Exception as e:
+                    self.logger.warning(f"MCP Client failed to list tools: {e}")
+
             try:
                 await self.session_ping_loop(self.session)
             except Exception as e:
@@ -84,8 +92,14 @@ class MCP(node.Node):
         read_stream, write_stream = await exit_stack.enter_async_context(
             mcp.datachannel_host(self.room, "mcp_proxy", mcp_server_name)
         )
+        # Tools listed by a previous connection may have changed
+        self.tool_cache = ToolDefinitionCache()
         session = await exit_stack.enter_async_context(
-            ClientSession(read_stream=read_stream, write_stream=write_stream)
+            ClientSession(
+                read_stream=read_stream,
+                write_stream=write_stream,
+                message_handler=self.tool_cache.on_message,
+            )
         )
         return session
 
@@ -102,19 +116,7 @@ class MCP(node.Node):
         async with self.init_lock:
             if not self.session:
                 raise ValueError("MCP session not initialized")
-            mcp_tools_res = await self.session.list_tools()
-            mcp_tools = mcp_tools_res.tools
-            tool_defs: list[runtime.ToolDefinition] = []
-            for t in mcp_tools:
-                tool_def = runtime.ToolDefinition(
-                    name=t.name,
-                    description=t.description or "",
-                    parameters=t.inputSchema,
-                    destination=runtime.ToolDefinitionDestination_Client(),
-                )
-                tool_defs.append(tool_def)
-
-            return tool_defs
+            return await self.tool_cache.get(self.session)
 
     async def call_tool(self, tool_call: runtime.ToolCall):
         self.logger.info(f"MCP Client calling tool '{tool_call.name}'")
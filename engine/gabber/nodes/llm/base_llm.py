@@ -8,8 +8,21 @@ from typing import cast
 from gabber.core import node, pad, editor
 from gabber.core.types import runtime
 from gabber.nodes.core.tool import mcp
-from gabber.lib.llm import AsyncLLMResponseHandle, LLMRequest, openai_compatible
-from gabber.utils import get_full_content_from_deltas, get_tool_calls_from_choice_deltas
+from gabber.lib.llm import (
+    AsyncLLMResponseHandle,
+    LLMCapabilities,
+    LLMRequest,
+    RequestPolicy,
+    RequestScheduler,
+    Speculation,
+    SpeculationStats,
+    ToolCallAssembler,
+    default_capability_store,
+    normalize_transcript,
+    openai_compatible,
+    resolve_capabilities,
+)
+from gabber.utils import get_full_content_from_deltas
 from gabber.nodes.core.tool import ToolGroup
 from mcp.types import TextContent
 from gabber.lib.llm.token_estimator import TokenEstimator
@@ -35,6 +48,10 @@ class BaseLLM(node.Node, ABC):
     @abstractmethod
     def get_token_estimator(self) -> TokenEstimator: ...
 
+    def uds_path(self) -> str | None:
+        """Unix socket to reach base_url through, for co-located servers."""
+        return None
+
     def get_base_pads(self):
         run_trigger = cast(pad.StatelessSinkPad, self.get_pad("run_trigger"))
         if not run_trigger:
@@ -134,6 +151,48 @@ class BaseLLM(node.Node, ABC):
                 default_type_constraints=[pad_constraints.Trigger()],
             )
 
+        # Skip probing the endpoint for what it supports
+        capability_pads: list[pad.PropertySinkPad] = []
+        for pad_id in ("video_support", "audio_support"):
+            capability_pad = cast(pad.PropertySinkPad, self.get_pad(pad_id))
+            if not capability_pad:
+                capability_pad = pad.PropertySinkPad(
+                    id=pad_id,
+                    group=pad_id,
+                    owner_node=self,
+                    default_type_constraints=[
+                        pad_constraints.Enum(
+                            options=["auto", "supported", "unsupported"]
+                        )
+                    ],
+                    value="auto",
+                )
+            capability_pads.append(capability_pad)
+
+        request_policy = cast(pad.PropertySinkPad, self.get_pad("request_policy"))
+        if not request_policy:
+            # What to do with a run trigger that arrives mid-generation
+            request_policy = pad.PropertySinkPad(
+                id="request_policy",
+                group="request_policy",
+                owner_node=self,
+                default_type_constraints=[
+                    pad_constraints.Enum(options=[p.value for p in RequestPolicy])
+                ],
+                value=RequestPolicy.LATEST_WINS.value,
+            )
+
+        speculative_transcription = cast(
+            pad.StatelessSinkPad, self.get_pad("speculative_transcription")
+        )
+        if not speculative_transcription:
+            speculative_transcription = pad.StatelessSinkPad(
+                id="speculative_transcription",
+                group="speculative_transcription",
+                owner_node=self,
+                default_type_constraints=[pad_constraints.String()],
+            )
+
         context_sink = self.get_property_sink_pad(
             list[runtime.ContextMessage], "context"
         )
@@ -179,7 +238,10 @@ class BaseLLM(node.Node, ABC):
         base_sink_pads: list[pad.SinkPad] = [
             run_trigger,
             cancel_trigger,
+            request_policy,
+            speculative_transcription,
             context_sink,
+            *capability_pads,
         ]
         base_source_pads: list[pad.SourcePad] = [
             started_source,
@@ -248,6 +310,12 @@ class BaseLLM(node.Node, ABC):
             pad.StatelessSourcePad, self.get_pad_required("context_message")
         )
         run_trigger = cast(pad.StatelessSinkPad, self.get_pad_required("run_trigger"))
+        speculative_transcription = cast(
+            pad.StatelessSinkPad, self.get_pad_required("speculative_transcription")
+        )
+        request_policy = cast(
+            pad.PropertySinkPad, self.get_pad_required("request_policy")
+        )
 
         # Get tool call source pads if tool calling is supported
         tool_calls_started_source: pad.StatelessSourcePad | None = None
@@ -263,6 +331,7 @@ class BaseLLM(node.Node, ABC):
         api_key = await self.api_key()
         llm = openai_compatible.OpenAICompatibleLLM(
             base_url=self.base_url(),
+            uds_path=self.uds_path(),
             api_key=api_key,
             headers={},
             model=self.model(),
@@ -270,33 +339,43 @@ class BaseLLM(node.Node, ABC):
             token_estimator=self.get_token_estimator(),
         )
 
-        # Retry loop in case the LLM is still starting up
-        video_supported = False
-        RETRY_LIMIT = 20
-        for i in range(RETRY_LIMIT):
-            if i == RETRY_LIMIT - 1:
-                self.logger.error("Failed to check video support after 20 attempts.")
-                video_supported = False
-                break
-
-            try:
-                video_supported = await self._supports_video(llm)
-                break
-            except Exception:
-                self.logger.error(
-                    "Failed to check video support, trying again in 5s", exc_info=True
-                )
-
-            await asyncio.sleep(5)
-
-        audio_supported = await self._supports_audio(llm)
+        async def get_capabilities() -> LLMCapabilities:
+            capabilities = await resolve_capabilities(
+                llm,
+                base_url=self.base_url(),
+                model=self.model(),
+                store=default_capability_store(),
+                logger=self.logger,
+                video_override=self._capability_override("video_support"),
+                audio_override=self._capability_override("audio_support"),
+            )
+            self.logger.info(
+                f"LLM supports video: {capabilities.video} audio: {capabilities.audio}"
+            )
+            return capabilities
 
-        self.logger.info(
-            f"LLM supports video: {video_supported} audio: {audio_supported}"
-        )
+        # Probed in the background, requests wait for it when they need it
+        capabilities_t = asyncio.create_task(get_capabilities())
+        # Connect now so the first turn doesn't pay for connection setup
+        prewarm_t = asyncio.create_task(llm.prewarm())
 
         running_handle: AsyncLLMResponseHandle | None = None
+        # Requests whose generation a newer request cancelled
+        superseded: set[pad.RequestContext] = set()
         tasks: set[asyncio.Task] = set()
+        speculation: Speculation | None = None
+        speculation_stats = SpeculationStats()
+
+        def discard_speculation():
+            nonlocal speculation
+            if speculation is None:
+                return
+            speculation.handle.cancel()
+            speculation = None
+            speculation_stats.cancelled += 1
+            self.logger.info(
+                f"Discarded speculative generation: {speculation_stats.to_dict()}"
+            )
 
         async def cancel_task():
             nonlocal running_handle
@@ -304,7 +383,93 @@ class BaseLLM(node.Node, ABC):
                 self.logger.info("Cancelling LLM generation request.")
                 if running_handle is not None:
                     running_handle.cancel()
+                discard_speculation()
+                item.ctx.complete()
+
+        async def get_tool_definitions() -> tuple[
+            list[runtime.ToolDefinition],
+            list[runtime.ToolDefinition],
+            dict[mcp.MCP, list[runtime.ToolDefinition]],
+        ]:
+            all_tool_definitions: list[runtime.ToolDefinition] = []
+            tg_tool_definitions: list[runtime.ToolDefinition] = []
+
+            tool_group_node = self.get_tool_group_node()
+            if tool_group_node is not None:
+                tg_tool_definitions = cast(
+                    ToolGroup, tool_group_node
+                ).list_tool_definitions()
+                all_tool_definitions.extend(tg_tool_definitions)
+
+            mcp_tool_definitions: dict[mcp.MCP, list[runtime.ToolDefinition]] = {}
+            mcp_sinks = self.mcp_server_pads()
+            for mcp_sink in mcp_sinks:
+                mcp_node = cast(mcp.MCP, mcp_sink.get_value())
+                if not isinstance(mcp_node, mcp.MCP):
+                    continue
+                if mcp_node not in mcp_tool_definitions:
+                    mcp_tool_definitions[mcp_node] = []
+                try:
+                    tdfs = await mcp_node.to_tool_definitions()
+                    mcp_tool_definitions[mcp_node].extend(tdfs)
+                    all_tool_definitions.extend(tdfs)
+                except Exception as e:
+                    self.logger.error(
+                        f"BaseLLM: Failed to get tool definitions from MCP node {mcp_node.id}: {e}"
+                    )
+            return all_tool_definitions, tg_tool_definitions, mcp_tool_definitions
+
+        async def speculation_task():
+            # Start generating on a stable interim transcript, the run trigger
+            # later commits or discards it
+            nonlocal speculation
+            async for item in speculative_transcription:
                 item.ctx.complete()
+                transcript = cast(str, item.value)
+                normalized = normalize_transcript(transcript)
+                if speculation is not None:
+                    if speculation.normalized == normalized:
+                        continue
+                    discard_speculation()
+                if not normalized or running_handle is not None:
+                    continue
+
+                messages = cast(list[runtime.ContextMessage], context_sink.get_value())
+                all_tool_definitions, _, _ = await get_tool_definitions()
+                request = Speculation.request(
+                    transcript, messages, all_tool_definitions
+                )
+                try:
+                    estimated_prompt_tokens = request.estimate_tokens(
+                        token_estimator=self.get_token_estimator()
+                    )
+                    capabilities = await capabilities_t
+                    handle = await llm.create_completion(
+                        request=request,
+                        video_support=capabilities.video,
+                        audio_support=capabilities.audio,
+                    )
+                except Exception as e:
+                    self.logger.error(
+                        f"Failed to start speculative generation: {e}", exc_info=e
+                    )
+                    continue
+
+                # The turn may have ended or moved on while the request started
+                if (
+                    running_handle is not None
+                    or speculation is not None
+                    or context_sink.get_value() is not messages
+                ):
+                    handle.cancel()
+                    continue
+                speculation = Speculation(
+                    transcript=transcript,
+                    context=messages,
+                    handle=handle,
+                    estimated_prompt_tokens=estimated_prompt_tokens,
+                )
+                speculation_stats.started += 1
 
         async def generation_task(
             handle: AsyncLLMResponseHandle,
@@ -313,12 +478,31 @@ class BaseLLM(node.Node, ABC):
             mcp_tools: dict[mcp.MCP, list[runtime.ToolDefinition]],
             estimated_prompt_tokens: int,
         ):
-            tool_task: asyncio.Task[list[runtime.ContextMessage]] | None = None
+            tool_calls = ToolCallAssembler()
+            tool_tasks: dict[int, asyncio.Task[runtime.ContextMessage | None]] = {}
             all_deltas: list[runtime.ContextMessageContent_ChoiceDelta] = []
             text_stream = runtime.TextStream()
             thinking_stream = runtime.TextStream()
             thinking_stream_source.push_item(thinking_stream, ctx)
             text_stream_source.push_item(text_stream, ctx)
+
+            def dispatch_tool_calls(completed: list[runtime.ToolCall]):
+                if ctx in superseded:
+                    return
+                # Each call runs as soon as its arguments are complete, while
+                # the model may still be streaming the next one
+                for tc in completed:
+                    if not tool_tasks and tool_calls_started_source:
+                        tool_calls_started_source.push_item(runtime.Trigger(), ctx)
+                    tool_tasks[tc.index] = asyncio.create_task(
+                        self.call_tool(
+                            tool_call=tc,
+                            tg_tool_defns=tg_tools,
+                            mcp_tool_defns=mcp_tools,
+                            ctx=ctx,
+                        )
+                    )
+
             try:
                 started_source.push_item(runtime.Trigger(), ctx)
                 thinking = False
@@ -353,22 +537,18 @@ class BaseLLM(node.Node, ABC):
                                 text_stream.push_text(cnt)
 
                     all_deltas.append(item)
+                    dispatch_tool_calls(tool_calls.push(item))
 
                 thinking_stream.eos()
                 text_stream.eos()
 
-                all_tool_calls = get_tool_calls_from_choice_deltas(all_deltas)
-                if all_tool_calls:
-                    if tool_calls_started_source:
-                        tool_calls_started_source.push_item(runtime.Trigger(), ctx)
-                    tool_task = asyncio.create_task(
-                        self.call_tools(
-                            all_tool_calls=all_tool_calls,
-                            tg_tool_defns=tg_tools,
-                            mcp_tool_defns=mcp_tools,
-                            ctx=ctx,
-                        )
-                    )
+                if ctx in superseded:
+                    # The newer request runs on the context as it was, so
+                    # neither the partial message nor tool results go in
+                    return
+
+                dispatch_tool_calls(tool_calls.finish())
+                all_tool_calls = tool_calls.calls
 
                 full_content = get_full_content_from_deltas(all_deltas)
                 context_message_source.push_item(
@@ -385,17 +565,27 @@ class BaseLLM(node.Node, ABC):
                     ctx,
                 )
 
-                if tool_task is not None:
-                    tool_msgs = await tool_task
-                    for msg in tool_msgs:
-                        context_message_source.push_item(msg, ctx)
-                    if tool_calls_finished_source:
-                        tool_calls_finished_source.push_item(runtime.Trigger(), ctx)
+                if tool_tasks:
+                    # Results go into the context in call order, however the
+                    # calls finish
+                    for tc in all_tool_calls:
+                        msg = await tool_tasks[tc.index]
+                        if msg is not None:
+                            context_message_source.push_item(msg, ctx)
             except asyncio.CancelledError:
                 pass
             except Exception as e:
                 self.logger.error(f"Error during LLM generation: {e}", exc_info=e)
             finally:
+                if tool_tasks:
+                    # Calls still running when the generation was superseded,
+                    # failed or cancelled have nowhere to put their results
+                    for t in tool_tasks.values():
+                        t.cancel()
+                    await asyncio.gather(*tool_tasks.values(), return_exceptions=True)
+                    if tool_calls_finished_source:
+                        tool_calls_finished_source.push_item(runtime.Trigger(), ctx)
+                superseded.discard(ctx)
                 finished_source.push_item(runtime.Trigger(), ctx)
                 ctx.complete()
 
@@ -407,48 +597,54 @@ class BaseLLM(node.Node, ABC):
                 self.logger.info("Generation task completed successfully.")
             running_handle = None
 
-        cancel_task_t = asyncio.create_task(cancel_task())
-        async for item in run_trigger:
-            ctx = item.ctx
+        def start_generation(
+            handle: AsyncLLMResponseHandle,
+            ctx: pad.RequestContext,
+            tg_tool_definitions: list[runtime.ToolDefinition],
+            estimated_prompt_tokens: int,
+        ) -> asyncio.Task:
+            t = asyncio.create_task(
+                generation_task(
+                    handle,
+                    ctx,
+                    tg_tool_definitions,
+                    {},
+                    estimated_prompt_tokens=estimated_prompt_tokens,
+                )
+            )
+            tasks.add(t)
+            t.add_done_callback(done_callback)
+            return t
+
+        async def start_request(ctx: pad.RequestContext) -> asyncio.Task | None:
+            nonlocal running_handle, speculation
             messages = context_sink.get_value()
             assert isinstance(messages, list)
             messages = cast(list[runtime.ContextMessage], messages)
-            all_tool_definitions: list[runtime.ToolDefinition] = []
-            tg_tool_definitions: list[runtime.ToolDefinition] = []
-
-            tool_group_node = self.get_tool_group_node()
-            if tool_group_node is not None:
-                tg_tool_definitions = cast(
-                    ToolGroup, tool_group_node
-                ).list_tool_definitions()
-                all_tool_definitions.extend(tg_tool_definitions)
-
-            mcp_tool_definitions: dict[mcp.MCP, list[runtime.ToolDefinition]] = {}
-            mcp_sinks = self.mcp_server_pads()
-            for mcp_sink in mcp_sinks:
-                mcp_node = cast(mcp.MCP, mcp_sink.get_value())
-                if not isinstance(mcp_node, mcp.MCP):
-                    continue
-                if mcp_node not in mcp_tool_definitions:
-                    mcp_tool_definitions[mcp_node] = []
-                try:
-                    tdfs = await mcp_node.to_tool_definitions()
-                    mcp_tool_definitions[mcp_node].extend(tdfs)
-                    all_tool_definitions.extend(tdfs)
-                except Exception as e:
-                    self.logger.error(
-                        f"BaseLLM: Failed to get tool definitions from MCP node {mcp_node.id}: {e}"
-                    )
+            all_tool_definitions, tg_tool_definitions, _ = await get_tool_definitions()
 
             request = LLMRequest(
                 context=messages, tool_definitions=all_tool_definitions
             )
-            if running_handle is not None:
-                self.logger.warning(
-                    "LLM is already running a generation, skipping new request."
-                )
-                ctx.complete()
-                continue
+            capabilities = await capabilities_t
+
+            if speculation is not None:
+                if speculation.matches(messages, audio_support=capabilities.audio):
+                    speculation_stats.commit(speculation)
+                    self.logger.info(
+                        "Committed speculative generation: "
+                        f"{speculation_stats.to_dict()}"
+                    )
+                    running_handle = speculation.handle
+                    t = start_generation(
+                        running_handle,
+                        ctx,
+                        tg_tool_definitions,
+                        speculation.estimated_prompt_tokens,
+                    )
+                    speculation = None
+                    return t
+                discard_speculation()
 
             try:
                 estimated_prompt_tokens = request.estimate_tokens(
@@ -456,24 +652,42 @@ class BaseLLM(node.Node, ABC):
                 )
                 running_handle = await llm.create_completion(
                     request=request,
-                    video_support=video_supported,
-                    audio_support=audio_supported,
+                    video_support=capabilities.video,
+                    audio_support=capabilities.audio,
                 )
-                t = asyncio.create_task(
-                    generation_task(
-                        running_handle,
-                        ctx,
-                        tg_tool_definitions,
-                        {},
-                        estimated_prompt_tokens=estimated_prompt_tokens,
-                    )
+                return start_generation(
+                    running_handle, ctx, tg_tool_definitions, estimated_prompt_tokens
                 )
-                tasks.add(t)
-                t.add_done_callback(done_callback)
             except Exception as e:
                 self.logger.error(f"Failed to start LLM generation: {e}", exc_info=e)
                 finished_source.push_item(runtime.Trigger(), ctx)
+                return None
+
+        def drop_request(ctx: pad.RequestContext):
+            ctx.complete()
+
+        def cancel_request(ctx: pad.RequestContext):
+            superseded.add(ctx)
+            if running_handle is not None:
+                running_handle.cancel()
+
+        scheduler = RequestScheduler[pad.RequestContext](
+            start=start_request,
+            drop=drop_request,
+            cancel=cancel_request,
+            logger=self.logger,
+        )
+        cancel_task_t = asyncio.create_task(cancel_task())
+        speculation_task_t = asyncio.create_task(speculation_task())
+        scheduler_t = asyncio.create_task(scheduler.run())
+        async for item in run_trigger:
+            policy = RequestPolicy(request_policy.get_value())
+            scheduler.submit(item.ctx, policy)
         await cancel_task_t
+        speculation_task_t.cancel()
+        scheduler_t.cancel()
+        capabilities_t.cancel()
+        prewarm_t.cancel()
 
     def get_tool_group_node(self) -> ToolGroup | None:
         if not self.supports_tool_calls():
@@ -496,73 +710,76 @@ class BaseLLM(node.Node, ABC):
         all_tool_calls: list[runtime.ToolCall],
         ctx: pad.RequestContext,
     ) -> list[runtime.ContextMessage]:
-        tg_tool_calls = [
-            t for t in all_tool_calls if t.name in [td.name for td in tg_tool_defns]
-        ]
-
-        results: list[runtime.ContextMessage] = []
-
-        all_tasks: list[asyncio.Task] = []
-
-        async def run_tg_task():
-            tg_res = await self.call_tg_calls(tg_tool_calls=tg_tool_calls, ctx=ctx)
-            for i, res in enumerate(tg_res):
-                if isinstance(res, BaseException):
-                    res = f"Error calling tool '{tg_tool_calls[i].name}': {res}"
-                msg = runtime.ContextMessage(
-                    role=runtime.ContextMessageRoleEnum.TOOL,
-                    content=[runtime.ContextMessageContentItem_Text(content=res)],
-                    tool_call_id=tg_tool_calls[i].call_id,
-                    tool_calls=[],
-                )
-                results.append(msg)
-
-        async def run_mcp_task(node: mcp.MCP, tc: runtime.ToolCall):
-            res = await node.call_tool(tc)
-            if isinstance(res, Exception):
-                msg = runtime.ContextMessage(
-                    role=runtime.ContextMessageRoleEnum.TOOL,
-                    content=[
-                        runtime.ContextMessageContentItem_Text(
-                            content=f"Error calling tool '{tc.name}': {res}"
-                        )
-                    ],
-                    tool_call_id=tc.call_id,
-                    tool_calls=[],
+        results = await asyncio.gather(
+            *[
+                self.call_tool(
+                    tool_call=tc,
+                    tg_tool_defns=tg_tool_defns,
+                    mcp_tool_defns=mcp_tool_defns,
+                    ctx=ctx,
                 )
-            else:
-                contents: list[runtime.ContextMessageContentItem] = []
-                for block in res:
-                    if isinstance(block, TextContent):
-                        content = runtime.ContextMessageContentItem_Text(
-                            content=block.text
-                        )
-                        contents.append(content)
-                msg = runtime.ContextMessage(
-                    role=runtime.ContextMessageRoleEnum.TOOL,
-                    content=contents,
-                    tool_call_id=tc.call_id,
-                    tool_calls=[],
-                )
-            results.append(msg)
+                for tc in all_tool_calls
+            ]
+        )
+        return [msg for msg in results if msg is not None]
 
-        if len(tg_tool_calls) > 0:
-            self.logger.info(
-                f"BaseLLM: Creating TG task for {len(tg_tool_calls)} tool calls"
+    async def call_tool(
+        self,
+        *,
+        tool_call: runtime.ToolCall,
+        tg_tool_defns: list[runtime.ToolDefinition],
+        mcp_tool_defns: dict[mcp.MCP, list[runtime.ToolDefinition]],
+        ctx: pad.RequestContext,
+    ) -> runtime.ContextMessage | None:
+        tc = tool_call
+        if tc.name in [td.name for td in tg_tool_defns]:
+            self.logger.info(f"BaseLLM: Calling TG tool {tc.name}")
+            res = (await self.call_tg_calls(tg_tool_calls=[tc], ctx=ctx))[0]
+            if isinstance(res, BaseException):
+                res = f"Error calling tool '{tc.name}': {res}"
+            return runtime.ContextMessage(
+                role=runtime.ContextMessageRoleEnum.TOOL,
+                content=[runtime.ContextMessageContentItem_Text(content=res)],
+                tool_call_id=tc.call_id,
+                tool_calls=[],
             )
-            tg_task = asyncio.create_task(run_tg_task())
-            all_tasks.append(tg_task)
 
-        for mcp_node in mcp_tool_defns.keys():
-            mcp_defns = mcp_tool_defns[mcp_node]
-            mcp_defn_names = [td.name for td in mcp_defns]
-            mcp_calls = [tc for tc in all_tool_calls if tc.name in mcp_defn_names]
-            for tc in mcp_calls:
-                mcp_t = asyncio.create_task(run_mcp_task(mcp_node, tc))
-                all_tasks.append(mcp_t)
+        mcp_node = next(
+            (
+                mcp_n
+                for mcp_n, defns in mcp_tool_defns.items()
+                if tc.name in [td.name for td in defns]
+            ),
+            None,
+        )
+        if mcp_node is None:
+            return None
+
+        res = await mcp_node.call_tool(tc)
+        if isinstance(res, Exception):
+            return runtime.ContextMessage(
+                role=runtime.ContextMessageRoleEnum.TOOL,
+                content=[
+                    runtime.ContextMessageContentItem_Text(
+                        content=f"Error calling tool '{tc.name}': {res}"
+                    )
+                ],
+                tool_call_id=tc.call_id,
+                tool_calls=[],
+            )
 
-        await asyncio.gather(*all_tasks)
-        return results
+        contents: list[runtime.ContextMessageContentItem] = []
+        for block in res:
+            if isinstance(block, TextContent):
+                contents.append(
+                    runtime.ContextMessageContentItem_Text(content=block.text)
+                )
+        return runtime.ContextMessage(
+            role=runtime.ContextMessageRoleEnum.TOOL,
+            content=contents,
+            tool_call_id=tc.call_id,
+            tool_calls=[],
+        )
 
     async def call_tg_calls(self, tg_tool_calls: list[runtime.ToolCall], ctx):
         tool_group_node = self.get_tool_group_node()
@@ -607,81 +824,10 @@ class BaseLLM(node.Node, ABC):
 
         return notes
 
-    async def _supports_video(self, llm: openai_compatible.OpenAICompatibleLLM) -> bool:
-        self.logger.info("Checking if LLM supports video...")
-        dummy_request = LLMRequest(
-            context=[
-                runtime.ContextMessage(
-                    role=runtime.ContextMessageRoleEnum.SYSTEM,
-                    content=[
-                        runtime.ContextMessageContentItem_Text(content="."),
-                        runtime.ContextMessageContentItem_Video(
-                            clip=runtime.VideoClip(
-                                video=[runtime.VideoFrame.black_frame(16, 16, 0.0)] * 10
-                            )
-                        ),
-                    ],
-                    tool_calls=[],
-                )
-            ],
-            tool_definitions=[],
-        )
-        try:
-            handle = await llm.create_completion(
-                request=dummy_request,
-                video_support=True,
-                audio_support=False,
-                max_completion_tokens=1,
-            )
-            async for _ in handle:
-                pass
-        except openai_compatible.OpenAICompatibleLLMError as e:
-            self.logger.info(
-                f"Video support check failed with error code: {e.code}, {e.msg}"
-            )
-            if e.code == 500 or e.code == 400:
-                return False
-
-            raise e
-        except Exception as e:
-            raise e
-
-        return True
-
-    async def _supports_audio(self, llm: openai_compatible.OpenAICompatibleLLM) -> bool:
-        return False
-        dummy_request = LLMRequest(
-            context=[
-                runtime.ContextMessage(
-                    role=runtime.ContextMessageRoleEnum.SYSTEM,
-                    content=[
-                        runtime.ContextMessageContentItem_Text(content="."),
-                        runtime.ContextMessageContentItem_Audio(
-                            clip=runtime.AudioClip(
-                                audio=[runtime.AudioFrame.silence(0.1)]
-                            )
-                        ),
-                    ],
-                    tool_calls=[],
-                )
-            ],
-            tool_definitions=[],
-        )
-        try:
-            handle = await llm.create_completion(
-                request=dummy_request,
-                video_support=False,
-                audio_support=True,
-                max_completion_tokens=1,
-            )
-            async for _ in handle:
-                pass
-        except openai_compatible.OpenAICompatibleLLMError as e:
-            if e.code == 500 or e.code == 400:
-                return False
-
-            raise e
-        except Exception as e:
-            raise e
-
-        return True
+    def _capability_override(self, pad_id: str) -> bool | None:
+        value = cast(pad.PropertySinkPad, self.get_pad_required(pad_id)).get_value()
+        if value == "supported":
+            return True
+        if value == "unsupported":
+            return False
+        return None
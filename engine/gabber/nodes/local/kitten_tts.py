@@ -10,8 +10,10 @@ from typing import cast
 
 from gabber.core import node, pad
 from gabber.core.types import runtime
-from gabber.lib.audio import Resampler
+from gabber.lib.audio import PlayoutClock, Resampler
+from gabber.lib.tts.cache import CachedAudio, TTSCache, default_cache
 import numpy as np
+from numpy.typing import NDArray
 from gabber.core.types import pad_constraints
 
 VOICES = [
@@ -26,6 +28,15 @@ VOICES = [
 ]
 
 
+# Sentence requests kept in flight ahead of playout
+MAX_CONCURRENT_SENTENCES = 3
+
+# 20ms at 24kHz
+CHUNK_SAMPLES = 480
+
+MODEL = "kitten-tts-nano-0.1"
+
+
 class KittenTTS(node.Node):
     @classmethod
     def get_description(cls) -> str:
@@ -233,6 +244,7 @@ class KittenTTS(node.Node):
                     job = TTSJob(
                         ctx=item.ctx,
                         voice=voice_id.get_value(),
+                        http=http,
                         resampler_16000hz=r_16000hz,
                         resampler_44100hz=r_44100hz,
                         resampler_48000hz=r_48000hz,
@@ -244,6 +256,7 @@ class KittenTTS(node.Node):
                     job = TTSJob(
                         ctx=item.ctx,
                         voice=voice_id.get_value(),
+                        http=http,
                         resampler_16000hz=r_16000hz,
                         resampler_44100hz=r_44100hz,
                         resampler_48000hz=r_48000hz,
@@ -274,11 +287,16 @@ class KittenTTS(node.Node):
                 tts_ended_source.push_item(runtime.Trigger(), new_job.ctx)
                 new_job.ctx.complete()
 
-        await asyncio.gather(
-            text_task(),
-            job_task(),
-            cancel_task(),
-        )
+        # One pooled session for every job so sentence requests reuse
+        # keep-alive connections
+        uds_path = os.environ.get("KITTEN_TTS_UDS")
+        connector = aiohttp.UnixConnector(path=uds_path) if uds_path else None
+        async with aiohttp.ClientSession(connector=connector) as http:
+            await asyncio.gather(
+                text_task(),
+                job_task(),
+                cancel_task(),
+            )
 
 
 class TTSJob:
@@ -287,11 +305,13 @@ class TTSJob:
         *,
         ctx: pad.RequestContext,
         voice: str,
+        http: aiohttp.ClientSession,
         resampler_16000hz: Resampler,
         resampler_44100hz: Resampler,
         resampler_48000hz: Resampler,
     ):
         self.ctx = ctx
+        self._http = http
         self._resampler_16000hz = resampler_16000hz
         self._resampler_44100hz = resampler_44100hz
         self._resampler_48000hz = resampler_48000hz
@@ -362,78 +382,117 @@ class TTSJob:
         host = os.environ.get("KITTEN_TTS_HOST", "localhost")
         url = f"http://{host}:7003/tts"
 
-        send_queue = asyncio.Queue[bytes | None]()
+        # Sentences in request order. Playout drains them one at a time while
+        # later ones are still synthesizing.
+        sentence_queue = asyncio.Queue[SentenceAudio | None]()
+        synth_tasks = set[asyncio.Task]()
+
+        cache = default_cache()
+
+        async def synthesize(index: int, input_text: str, audio: SentenceAudio):
+            key: str | None = None
+            if TTSCache.cacheable(input_text):
+                key = TTSCache.key(
+                    backend="kitten", voice=self._voice, model=MODEL, text=input_text
+                )
+            try:
+                if key is not None:
+                    cached = await cache.get(key)
+                    if cached is not None:
+                        audio.fill(cached.pcm)
+                        return
+
+                async with self._http.post(
+                    url, json={"text": input_text, "voice": self._voice}
+                ) as response:
+                    if response.status != 200:
+                        logging.error(
+                            f"Error in TTS request: {response.status} - {await response.text()}"
+                        )
+                        return
+
+                    if response.content_length is not None:
+                        audio.allocate(response.content_length)
+                    async for data in response.content.iter_any():
+                        audio.write(data)
+                if key is not None:
+                    audio.finish()
+                    await cache.put(
+                        key, CachedAudio(pcm=audio.pcm().copy(), sample_rate=24000)
+                    )
+            except Exception as e:
+                # Playout only sees the sentence end early, so log it here
+                logging.error(
+                    f"Error synthesizing sentence {index}: {e}", exc_info=True
+                )
+            finally:
+                audio.finish()
 
         async def generate():
-            async with aiohttp.ClientSession() as session:
-                while True:
-                    input_text = await self._inference_queue.get()
+            in_flight = asyncio.Semaphore(MAX_CONCURRENT_SENTENCES)
+            index = 0
+            while True:
+                input_text = await self._inference_queue.get()
 
-                    if input_text is None:
-                        break
+                if input_text is None:
+                    break
 
-                    if len(input_text) == 0:
-                        continue
+                if len(input_text) == 0:
+                    continue
+
+                if input_text[-1] not in ".!?":
+                    input_text += ". "
+
+                await in_flight.acquire()
+                audio = SentenceAudio()
+                sentence_queue.put_nowait(audio)
+                t = asyncio.create_task(synthesize(index, input_text, audio))
+                index += 1
+                synth_tasks.add(t)
+                t.add_done_callback(synth_tasks.discard)
+                t.add_done_callback(lambda _: in_flight.release())
 
-                    if input_text[-1] not in ".!?":
-                        input_text += ". "
-
-                    async with session.post(
-                        url, json={"text": input_text, "voice": self._voice}
-                    ) as response:
-                        if response.status != 200:
-                            logging.error(
-                                f"Error in TTS request: {response.status} - {await response.text()}"
-                            )
-                            break
-
-                        total_bytes = b""
-                        async for bytes_24000 in response.content.iter_any():
-                            total_bytes += bytes_24000
-                            # 20ms
-                            while len(total_bytes) >= 240 * 4:
-                                chunk = total_bytes[: 240 * 4]
-                                total_bytes = total_bytes[240 * 4 :]
-                                send_queue.put_nowait(chunk)
-
-                        if len(total_bytes) % 2 != 0:
-                            total_bytes = total_bytes[:-1]
-                        send_queue.put_nowait(total_bytes)
-                        send_queue.put_nowait(None)
+            sentence_queue.put_nowait(None)
 
         async def push_response():
-            clock_start_time: float | None = None
-            played_time = 0.0
+            clock = PlayoutClock()
             while True:
-                chunk = await send_queue.get()
-                if chunk is None:
+                audio = await sentence_queue.get()
+                if audio is None:
                     break
-                data = np.frombuffer(chunk, dtype=np.int16).reshape(1, -1)
-                num_samples = data.shape[1]
-                frame_data_24000 = runtime.AudioFrameData(
-                    data=data,
-                    sample_rate=24000,
-                    num_channels=1,
-                )
-                frame_data_16000 = self._resampler_16000hz.push_audio(frame_data_24000)
-                frame_data_44100 = self._resampler_44100hz.push_audio(frame_data_24000)
-                frame_data_48000 = self._resampler_48000hz.push_audio(frame_data_24000)
-                frame = runtime.AudioFrame(
-                    start_timestamp=time.time(),
-                    original_data=frame_data_24000,
-                    data_16000hz=frame_data_16000,
-                    data_24000hz=frame_data_24000,
-                    data_44100hz=frame_data_44100,
-                    data_48000hz=frame_data_48000,
-                )
-                if clock_start_time is None:
-                    clock_start_time = time.time()
-                played_time += num_samples / 24000.0
-                self._output_queue.put_nowait(frame)
 
-                # Don't go faster than real-time
-                while (played_time + clock_start_time) - time.time() > 0.25:
-                    await asyncio.sleep(0.05)
+                async for data in audio.chunks(CHUNK_SAMPLES):
+                    data = data.reshape(1, -1)
+                    frame_data_24000 = runtime.AudioFrameData(
+                        data=data,
+                        sample_rate=24000,
+                        num_channels=1,
+                    )
+                    frame_data_16000 = self._resampler_16000hz.push_audio(
+                        frame_data_24000
+                    )
+                    frame_data_44100 = self._resampler_44100hz.push_audio(
+                        frame_data_24000
+                    )
+                    frame_data_48000 = self._resampler_48000hz.push_audio(
+                        frame_data_24000
+                    )
+                    frame = runtime.AudioFrame(
+                        start_timestamp=time.time(),
+                        original_data=frame_data_24000,
+                        data_16000hz=frame_data_16000,
+                        data_24000hz=frame_data_24000,
+                        data_44100hz=frame_data_44100,
+                        data_48000hz=frame_data_48000,
+                    )
+                    clock.push(frame_data_24000)
+                    self._output_queue.put_nowait(frame)
+
+                    # Don't go faster than real-time
+                    await clock.wait()
+
+            if clock.underruns:
+                logging.info(f"TTS playout underran: {clock.stats()}")
 
         try:
             await asyncio.gather(
@@ -445,6 +504,8 @@ class TTSJob:
         except Exception as e:
             logging.error(f"Error in TTS job: {e}", exc_info=True)
         finally:
+            for t in list(synth_tasks):
+                t.cancel()
             self._output_queue.put_nowait(None)
 
     def __aiter__(self):
@@ -459,3 +520,67 @@ class TTSJob:
     @property
     def spoken_text(self) -> str:
         return self._running_text
+
+
+class SentenceAudio:
+    """24kHz PCM for one sentence, readable while the response streams in.
+
+    Samples are written into a buffer sized from Content-Length, so chunks
+    handed to playout are views rather than copies.
+    """
+
+    def __init__(self):
+        self._buf = np.empty(0, dtype=np.int16)
+        self._nbytes = 0
+        self._done = False
+        self._changed = asyncio.Event()
+
+    def allocate(self, nbytes: int):
+        if nbytes > self._buf.nbytes:
+            self._grow(nbytes)
+
+    def _grow(self, nbytes: int):
+        # Views already handed out keep the old buffer alive
+        buf = np.empty((nbytes + 1) // 2, dtype=np.int16)
+        buf.view(np.uint8)[: self._nbytes] = self._buf.view(np.uint8)[: self._nbytes]
+        self._buf = buf
+
+    def write(self, data: bytes):
+        end = self._nbytes + len(data)
+        if end > self._buf.nbytes:
+            self._grow(max(end, 2 * self._buf.nbytes))
+        self._buf.view(np.uint8)[self._nbytes : end] = np.frombuffer(
+            data, dtype=np.uint8
+        )
+        self._nbytes = end
+        self._changed.set()
+
+    def fill(self, pcm: NDArray[np.int16]):
+        """Use already synthesized samples, e.g. from the cache."""
+        self._buf = pcm
+        self._nbytes = pcm.nbytes
+        self.finish()
+
+    def pcm(self) -> NDArray[np.int16]:
+        return self._buf[: self._nbytes // 2]
+
+    def finish(self):
+        self._done = True
+        self._changed.set()
+
+    async def chunks(self, chunk_samples: int):
+        pos = 0
+        while True:
+            # Read done first, once it is set no more samples can arrive
+            done = self._done
+            available = self._nbytes // 2
+            if available - pos >= chunk_samples:
+                yield self._buf[pos : pos + chunk_samples]
+                pos += chunk_samples
+                continue
+            if done:
+                if available > pos:
+                    yield self._buf[pos:available]
+                return
+            self._changed.clear()
+            await self._changed.wait()
@@ -35,6 +35,9 @@ class LocalLLM(BaseLLM):
 
         return f"http://{host}:{port_value}/v1"
 
+    def uds_path(self) -> str | None:
+        return os.environ.get("LOCAL_LLM_UDS")
+
     def model(self) -> str:
         return ""
 
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: SUL-1.0
 
 import asyncio
+import os
 import time
 from typing import cast, Tuple
 
@@ -86,7 +87,15 @@ class LocalViseme(node.Node):
 
         url = self.get_url()
 
-        stt_impl = stt.Gabber(logger=self.logger, url=url, viseme_mode=True)
+        # Co-located servers can be reached over a unix socket, optionally
+        # passing audio through shared memory
+        stt_impl = stt.Gabber(
+            logger=self.logger,
+            url=url,
+            viseme_mode=True,
+            uds_path=os.environ.get("GABBER_STT_UDS"),
+            shared_memory=os.environ.get("GABBER_STT_SHARED_MEMORY", "0") == "1",
+        )
 
         stt_run_t = asyncio.create_task(stt_impl.run())
 
@@ -9,8 +9,12 @@ from gabber.core import node, pad
 from gabber.core.types import runtime
 from gabber.core.node import NodeMetadata
 from gabber.lib import stt
+from gabber.lib.llm import normalize_transcript
 from gabber.core.types import pad_constraints
 
+# How long an interim transcript must go unrevised to be emitted as stable
+STABLE_TRANSCRIPTION_S = 0.3
+
 
 class STT(node.Node):
     @classmethod
@@ -100,6 +104,18 @@ class STT(node.Node):
             )
             self.pads.append(final_transcription_source)
 
+        stable_transcription_source = cast(
+            pad.StatelessSourcePad, self.get_pad("stable_transcription")
+        )
+        if stable_transcription_source is None:
+            stable_transcription_source = pad.StatelessSourcePad(
+                id="stable_transcription",
+                group="stable_transcription",
+                owner_node=self,
+                default_type_constraints=[pad_constraints.String()],
+            )
+            self.pads.append(stable_transcription_source)
+
         api_key = cast(pad.PropertySinkPad, self.get_pad("api_key"))
         if api_key is None:
             api_key = pad.PropertySinkPad(
@@ -140,6 +156,9 @@ class STT(node.Node):
         is_speaking_pad = cast(
             pad.PropertySourcePad, self.get_pad_required("is_speaking")
         )
+        stable_transcription_source = cast(
+            pad.StatelessSourcePad, self.get_pad_required("stable_transcription")
+        )
 
         stt_impl: stt.STT
         if service.get_value() == "assembly_ai":
@@ -177,16 +196,44 @@ class STT(node.Node):
 
         md_prom: asyncio.Future[dict[str, str] | None] = asyncio.Future()
 
+        async def stable_transcription_task(text: str, ctx: pad.RequestContext) -> None:
+            # Lets a connected LLM start generating before the end of turn
+            await asyncio.sleep(STABLE_TRANSCRIPTION_S)
+            stable_transcription_source.push_item(text, ctx)
+
         async def stt_event_task() -> None:
             ctx: pad.RequestContext | None = None
+            stable_t: asyncio.Task | None = None
+            # Normalized running text the stable timer was started for
+            stable_text: str | None = None
             md = await md_prom
             async for event in stt_impl:
+                if isinstance(event, stt.STTEvent_Viseme):
+                    continue
+                if isinstance(event, stt.STTEvent_Transcription):
+                    normalized = normalize_transcript(event.running_text)
+                    if normalized == stable_text:
+                        # Repeated or only re-cased/punctuated, keep the timer
+                        continue
+                    stable_text = normalized
+                else:
+                    stable_text = None
+                if stable_t is not None:
+                    stable_t.cancel()
+                    stable_t = None
                 if isinstance(event, stt.STTEvent_SpeechStarted):
                     ctx = pad.RequestContext(parent=None, publisher_metadata=md)
                     is_speaking_pad.push_item(True, ctx)
                     speech_started_source.push_item(runtime.Trigger(), ctx)
                 elif isinstance(event, stt.STTEvent_Transcription):
-                    pass
+                    if (
+                        ctx is not None
+                        and event.running_text.strip()
+                        and stable_transcription_source.get_next_pads()
+                    ):
+                        stable_t = asyncio.create_task(
+                            stable_transcription_task(event.running_text, ctx)
+                        )
                 elif isinstance(event, stt.STTEvent_EndOfTurn):
                     txt = event.clip.transcription
                     if txt is None:
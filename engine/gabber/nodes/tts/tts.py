@@ -3,13 +3,20 @@
 
 import asyncio
 import logging
-import time
-from typing import cast
+from typing import AsyncIterator, cast
 
 from gabber.core import node, pad
 from gabber.core.types import runtime, pad_constraints
+from gabber.lib.audio import PlayoutClock
 from gabber.lib.tts import TTS as BaseTTS
 from gabber.lib.tts import CartesiaTTS, ElevenLabsTTS, GabberTTS, OpenAITTS, MinimaxTTS
+from gabber.lib.tts import TTSSession
+from gabber.lib.tts.cache import CacheRecorder, TTSCache, default_cache
+from gabber.lib.tts.text_chunker import chunk_text
+
+# Queued jobs that may synthesize while the current one plays. Bounded so an
+# interruption doesn't waste provider requests on responses never played.
+LOOKAHEAD_JOBS = 2
 
 
 class TTS(node.Node):
@@ -229,32 +236,40 @@ class TTS(node.Node):
         is_talking = cast(pad.PropertySourcePad, self.get_pad_required("is_talking"))
 
         tts: BaseTTS
-        if service.get_value().value == "gabber":
+        backend = service.get_value().value
+        model = ""
+        if backend == "gabber":
             tts = GabberTTS(api_key=api_key, logger=self.logger)
-        elif service.get_value().value == "elevenlabs":
+        elif backend == "elevenlabs":
             tts = ElevenLabsTTS(
                 api_key=api_key, voice=voice_id.get_value(), logger=self.logger
             )
-        elif service.get_value().value == "cartesia":
-            tts = CartesiaTTS(api_key=api_key, logger=self.logger)
-        elif service.get_value().value == "openai":
-            tts = OpenAITTS(
-                model="gpt-4o-mini-tts", api_key=api_key, logger=self.logger
-            )
-        elif service.get_value().value == "minimax":
+        elif backend == "cartesia":
+            model = "sonic-2"
+            tts = CartesiaTTS(api_key=api_key, model_id=model, logger=self.logger)
+        elif backend == "openai":
+            model = "gpt-4o-mini-tts"
+            tts = OpenAITTS(model=model, api_key=api_key, logger=self.logger)
+        elif backend == "minimax":
+            model = "speech-2.6-hd"
             tts = MinimaxTTS(
                 api_key=api_key,
-                model="speech-2.6-hd",
+                model=model,
                 logger=self.logger,
             )
         else:
             raise ValueError(f"Unknown TTS service: {service.get_value()}")
+        cache = default_cache()
+        # Shared by this node's jobs: the playing job plus the queued ones
+        # allowed to synthesize ahead of it
+        lookahead_slots = asyncio.Semaphore(LOOKAHEAD_JOBS + 1)
         job_queue = asyncio.Queue[TTSJob | None]()
         running_job: TTSJob | None = None
 
         tts_run_task = asyncio.create_task(tts.run())
 
         chars_per_second = 15.0
+        clock = PlayoutClock()
 
         async def cancel_task():
             nonlocal running_job
@@ -291,17 +306,25 @@ class TTS(node.Node):
 
         async def text_task():
             async for item in text_sink:
+                job = TTSJob(
+                    tts,
+                    item.ctx,
+                    voice=voice_id.get_value(),
+                    cache=cache,
+                    backend=backend,
+                    model=model,
+                    slots=lookahead_slots,
+                )
                 if isinstance(item.value, runtime.TextStream):
-                    job = TTSJob(tts, item.ctx, voice=voice_id.get_value())
                     job_queue.put_nowait(job)
-                    async for text in item.value:
+                    # Providers get clause and sentence sized messages rather
+                    # than every LLM delta
+                    async for text in chunk_text(item.value):
                         job.push_text(text)
                     job.eos()
                 elif isinstance(item.value, str):
-                    job = TTSJob(tts, item.ctx, voice=voice_id.get_value())
                     job_queue.put_nowait(job)
-                    job.push_text(item.value)
-                    job.eos()
+                    job.say(item.value)
 
         async def job_task():
             nonlocal running_job, chars_per_second
@@ -311,8 +334,7 @@ class TTS(node.Node):
                     break
 
                 running_job = new_job
-                played_time = 0
-                clock_start_time: float | None = None
+                clock.reset()
                 new_job.ctx.snooze_timeout(
                     120.0
                 )  # Speech playout can take a while so we snooze the timeout. TODO: make this tied to the actual audio playout duration
@@ -323,20 +345,19 @@ class TTS(node.Node):
                 all_audio_frames = []
                 try:
                     async for audio_frame in new_job:
-                        if clock_start_time is None:
-                            clock_start_time = time.time()
                         all_audio_frames.append(audio_frame)
                         audio_source.push_item(audio_frame, new_job.ctx)
-                        played_time += audio_frame.original_data.duration
+                        clock.push(audio_frame.original_data)
 
                         text = new_job._running_text
-                        end_idx = min(int(played_time * chars_per_second), len(text))
+                        end_idx = min(
+                            int(clock.emitted_s * chars_per_second), len(text)
+                        )
                         chars = text[:end_idx]
                         transcription_stream.push_text(chars)
 
                         # Don't go faster than real-time
-                        while (played_time + clock_start_time) - time.time() > 0.25:
-                            await asyncio.sleep(0.05)
+                        await clock.wait()
 
                 except Exception as e:
                     logging.error(f"Error occurred while processing TTS job: {e}")
@@ -353,6 +374,17 @@ class TTS(node.Node):
                     transcription_stream.eos()
                     continue
 
+                stats = clock.stats()
+                if clock.underruns:
+                    self.logger.info(f"TTS playout underran: {stats}")
+                else:
+                    self.logger.debug(f"TTS playout: {stats}")
+                if clock.emitted_s > 1.0 and new_job.spoken_text:
+                    # Speaking rate of this voice, used to time the next
+                    # job's transcription
+                    measured = len(new_job.spoken_text) / clock.emitted_s
+                    chars_per_second = 0.5 * chars_per_second + 0.5 * measured
+
                 final_transcription_source.push_item(new_job.spoken_text, new_job.ctx)
                 audio_clip = runtime.AudioClip(
                     audio=all_audio_frames,
@@ -375,30 +407,155 @@ class TTS(node.Node):
 
 
 class TTSJob:
-    def __init__(self, tts: BaseTTS, ctx: pad.RequestContext, voice: str):
+    """One response to synthesize and play.
+
+    Synthesis starts once a slot is free in the shared look-ahead semaphore,
+    so queued jobs synthesize while earlier ones play. The slot is held until
+    the job's audio has been drained or the job is cancelled.
+    """
+
+    def __init__(
+        self,
+        tts: BaseTTS,
+        ctx: pad.RequestContext,
+        voice: str,
+        *,
+        cache: TTSCache,
+        backend: str,
+        model: str,
+        slots: asyncio.Semaphore,
+    ):
         self.ctx = ctx
         self._tts = tts
-        self._session = self._tts.start_session(voice=voice)
+        self._voice = voice
+        self._cache = cache
+        self._cache_key_parts = (backend, voice, model)
+        self._slots = slots
+        self._has_slot = False
+        self._session: TTSSession | None = None
+        self._frames: AsyncIterator[runtime.AudioFrame] | None = None
+        self._open_task: asyncio.Task[AsyncIterator[runtime.AudioFrame]] | None = None
+        self._recorder: CacheRecorder | None = None
         self._running_text = ""
+        # Text and eos received before synthesis started
+        self._pending_text: list[str] = []
+        self._eos = False
+        # Whole text known up front, so it can be looked up before synthesis
+        self._complete = False
+        self._cancelled = False
+
+    def _ensure_open(self):
+        if self._open_task is None:
+            self._open_task = asyncio.create_task(self._open())
+
+    def _release(self):
+        if self._has_slot:
+            self._has_slot = False
+            self._slots.release()
 
     def cancel(self):
-        self._session.cancel()
+        self._cancelled = True
+        if self._open_task is not None:
+            self._open_task.cancel()
+        if self._session is not None:
+            self._session.cancel()
+        self._release()
+
+    def say(self, text: str):
+        """Speak a complete phrase, replaying it from the cache on a hit."""
+        self._running_text = text
+        self._pending_text.append(text)
+        self._complete = True
+        self._eos = True
+        self._ensure_open()
 
     def push_text(self, text: str):
         self._running_text += text
-        self._session.push_text(text)
+        if self._session is not None:
+            self._session.push_text(text)
+        else:
+            self._pending_text.append(text)
+            self._ensure_open()
 
     def eos(self):
-        self._session.eos()
+        self._eos = True
+        if self._session is not None:
+            self._session.eos()
+        else:
+            self._ensure_open()
+
+    def _cache_key(self) -> str:
+        backend, voice, model = self._cache_key_parts
+        return TTSCache.key(
+            backend=backend, voice=voice, model=model, text=self._running_text
+        )
+
+    async def _open(self) -> AsyncIterator[runtime.AudioFrame]:
+        await self._slots.acquire()
+        self._has_slot = True
+
+        if self._complete and TTSCache.cacheable(self._running_text):
+            cached = await self._cache.get(self._cache_key())
+            if cached is not None:
+                logging.debug(f"TTS cache hit for {self._running_text!r}")
+                return cached.frames()
+
+        session = self._tts.start_session(voice=self._voice)
+        self._session = session
+        for text in self._pending_text:
+            session.push_text(text)
+        self._pending_text = []
+        if self._eos:
+            session.eos()
+        self._recorder = CacheRecorder()
+        return session
 
     def __aiter__(self):
         return self
 
     async def __anext__(self):
-        async for audio_frame in self._session:
-            return audio_frame
-
-        raise StopAsyncIteration
+        if self._cancelled:
+            raise StopAsyncIteration
+
+        if self._frames is None:
+            self._ensure_open()
+            assert self._open_task is not None
+            try:
+                self._frames = await self._open_task
+            except asyncio.CancelledError:
+                # cancel() stopped the job before synthesis started
+                if self._cancelled:
+                    raise StopAsyncIteration
+                raise
+
+        try:
+            frame = await anext(self._frames)
+        except StopAsyncIteration:
+            self._release()
+            # Streamed responses are stored too, so a later request for the
+            # same phrase as a string can hit
+            recorder, self._recorder = self._recorder, None
+            if (
+                recorder is not None
+                and not self._cancelled
+                and TTSCache.cacheable(self._running_text)
+            ):
+                audio = recorder.finish()
+                if audio is not None:
+                    await self._cache.put(self._cache_key(), audio)
+            raise
+        except Exception:
+            self._recorder = None
+            self._release()
+            raise
+
+        if self._recorder is not None:
+            if TTSCache.cacheable(self._running_text):
+                self._recorder.push(frame)
+            else:
+                # Too long to be worth caching, stop holding on to its audio
+                self._recorder = None
+        return frame
 
     @property
     def spoken_text(self) -> str:
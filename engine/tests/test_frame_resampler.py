@@ -0,0 +1,80 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import numpy as np
+
+from gabber.core.types.runtime import AudioFrameData
+from gabber.lib.audio import FrameResampler, Resampler
+from gabber.lib.audio.resampler.frame_resampler import MAX_PENDING_FRAMES
+
+
+def frames_data(count: int, seed: int = 0) -> list[AudioFrameData]:
+    rng = np.random.default_rng(seed)
+    return [
+        AudioFrameData(
+            data=rng.integers(-8000, 8000, (1, 480)).astype(np.int16),
+            sample_rate=24000,
+            num_channels=1,
+        )
+        for _ in range(count)
+    ]
+
+
+def resampled(resampler: Resampler, data: list[AudioFrameData]) -> list[np.ndarray]:
+    return [resampler.push_audio(d).data for d in data]
+
+
+def test_lazy_rates_match_eager_resampling():
+    data = frames_data(50)
+    fr = FrameResampler()
+    frames = [fr.frame(d, 0.0) for d in data]
+    # Reading a later frame first catches up on the earlier ones
+    frames[-1].data_16000hz
+    assert all(
+        np.array_equal(f.data_16000hz.data, expected)
+        for f, expected in zip(frames, resampled(Resampler(16000), data))
+    )
+    # The native rate passes through untouched
+    assert frames[0].data_24000hz is data[0]
+
+
+def test_interleaved_streams_keep_their_own_state():
+    a, b = frames_data(30, seed=1), frames_data(30, seed=2)
+    fr_a, fr_b = FrameResampler(), FrameResampler()
+    out_a, out_b = [], []
+    for da, db in zip(a, b):
+        out_a.append(fr_a.frame(da, 0.0).data_48000hz.data)
+        out_b.append(fr_b.frame(db, 0.0).data_48000hz.data)
+    for out, data in ((out_a, a), (out_b, b)):
+        expected = resampled(Resampler(48000), data)
+        assert all(np.array_equal(x, y) for x, y in zip(out, expected))
+
+
+def test_unread_frames_are_dropped_past_the_limit():
+    extra = 20
+    data = frames_data(MAX_PENDING_FRAMES + extra)
+    fr = FrameResampler()
+    frames = [fr.frame(d, 0.0) for d in data]
+
+    # A dropped frame is resampled on its own
+    assert np.array_equal(
+        frames[0].data_16000hz.data, Resampler(16000).push_audio(data[0]).data
+    )
+    # The frames still pending resume from a reset state
+    expected = resampled(Resampler(16000), data[extra:])
+    assert all(
+        np.array_equal(f.data_16000hz.data, e) for f, e in zip(frames[extra:], expected)
+    )
+
+
+def test_repr_and_eq_do_not_resample():
+    data = frames_data(2)
+    fr = FrameResampler()
+    frame, other = (fr.frame(d, 0.0) for d in data)
+    assert "resampled_rates=[24000]" in repr(frame)
+    assert frame != other
+    assert frame == frame
+    assert frame.__dict__.get("_data_16000hz") is None
+    assert frame.__dict__.get("_data_48000hz") is None
+    frame.data_16000hz
+    assert "resampled_rates=[16000, 24000]" in repr(frame)
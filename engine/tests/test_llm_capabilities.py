@@ -0,0 +1,69 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import asyncio
+import logging
+from typing import cast
+
+from gabber.lib.llm import CapabilityStore, resolve_capabilities
+from gabber.lib.llm.openai_compatible import (
+    OpenAICompatibleLLM,
+    OpenAICompatibleLLMError,
+)
+
+BASE_URL = "http://localhost:7002/v1"
+
+
+class FakeLLM:
+    """Serves one unnamed model, video support depends on which."""
+
+    def __init__(self, served: str | None, video: bool):
+        self.served = served
+        self.video = video
+        self.probes = 0
+
+    async def served_model(self) -> str | None:
+        return self.served
+
+    async def create_completion(self, **kwargs):
+        self.probes += 1
+        if not self.video:
+            raise OpenAICompatibleLLMError(code=400, msg="no video")
+
+        async def handle():
+            yield None
+
+        return handle()
+
+
+def resolve(llm: FakeLLM, store: CapabilityStore):
+    return asyncio.run(
+        resolve_capabilities(
+            cast(OpenAICompatibleLLM, llm),
+            base_url=BASE_URL,
+            model="",
+            store=store,
+            logger=logging.getLogger(__name__),
+        )
+    )
+
+
+def test_unnamed_models_are_keyed_by_served_model():
+    store = CapabilityStore()
+    omni = FakeLLM("qwen-omni", video=True)
+    assert resolve(omni, store).video
+    assert resolve(omni, store).video
+    assert omni.probes == 1
+
+    # Switching the local model must not reuse the previous model's entry
+    text_only = FakeLLM("qwen-text", video=False)
+    assert not resolve(text_only, store).video
+    assert text_only.probes == 1
+
+
+def test_unlisted_model_is_not_cached():
+    store = CapabilityStore()
+    llm = FakeLLM(None, video=True)
+    resolve(llm, store)
+    resolve(llm, store)
+    assert llm.probes == 2
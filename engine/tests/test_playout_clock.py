@@ -0,0 +1,87 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import asyncio
+import random
+import time
+
+import numpy as np
+import pytest
+
+from gabber.core.types.runtime import AudioFrameData
+from gabber.lib.audio import PlayoutClock
+
+
+def frame(samples: int, sample_rate: int = 24000) -> AudioFrameData:
+    return AudioFrameData(
+        data=np.zeros((1, samples), dtype=np.int16),
+        sample_rate=sample_rate,
+        num_channels=1,
+    )
+
+
+async def contend(stop: asyncio.Event, rng: random.Random, max_block_s: float):
+    while not stop.is_set():
+        time.sleep(rng.uniform(0, max_block_s))
+        await asyncio.sleep(rng.uniform(0, 0.01))
+
+
+def test_drift_stays_bounded_under_loop_contention():
+    lead_s = 0.25
+    max_block_s = 0.03
+
+    async def main():
+        stop = asyncio.Event()
+        contention = asyncio.create_task(contend(stop, random.Random(0), max_block_s))
+        clock = PlayoutClock(lead_s=lead_s)
+        start = time.monotonic()
+        for _ in range(100):
+            clock.push(frame(480))
+            await clock.wait()
+        elapsed = time.monotonic() - start
+        stop.set()
+        await contention
+        return clock, elapsed
+
+    clock, elapsed = asyncio.run(main())
+    assert clock.emitted_s == pytest.approx(2.0)
+    # Late wake-ups don't add up, the stream ends within one blocked
+    # stretch of where it should
+    assert abs(elapsed - (clock.emitted_s - lead_s)) < max_block_s + 0.02
+    assert clock.underruns == 0
+
+
+def test_underrun_is_counted_and_reanchors_without_bursting():
+    async def main():
+        clock = PlayoutClock(lead_s=0.05)
+        clock.push(frame(480))
+        await clock.wait()
+        # The producer stalls well past the end of the buffered audio
+        time.sleep(0.1)
+        resumed = time.monotonic()
+        for _ in range(5):
+            clock.push(frame(480))
+            await clock.wait()
+        return clock, time.monotonic() - resumed
+
+    clock, elapsed = asyncio.run(main())
+    assert clock.underruns == 1
+    assert clock.underrun_s == pytest.approx(0.08, abs=0.02)
+    # 100ms of audio pushed after the stall, less the lead. Without
+    # re-anchoring the 80ms gap would be made up by emitting it back to back.
+    assert elapsed >= 0.05 - 0.005
+
+
+def test_emitted_s_is_exact_across_sample_rate_changes():
+    clock = PlayoutClock()
+    clock.push(frame(480, 24000))
+    clock.push(frame(441, 44100))
+    clock.push(frame(441, 44100))
+    assert clock.emitted_s == pytest.approx(0.04, abs=1e-12)
+    clock.push(frame(160, 16000))
+    clock.push(frame(240, 24000))
+    assert clock.emitted_s == pytest.approx(0.06, abs=1e-12)
+    assert clock.frames == 5
+
+    clock.reset()
+    assert clock.emitted_s == 0.0
@@ -0,0 +1,120 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import asyncio
+import logging
+
+from gabber.lib.llm.request_policy import RequestPolicy, RequestScheduler
+
+
+class Generations:
+    """Generations that run until finished or cancelled by the test."""
+
+    def __init__(self):
+        self.started: list[str] = []
+        self.dropped: list[str] = []
+        self.cancelled: list[str] = []
+        self._done: dict[str, asyncio.Event] = {}
+
+    async def start(self, request: str) -> asyncio.Task:
+        self.started.append(request)
+        done = self._done[request] = asyncio.Event()
+        return asyncio.create_task(done.wait())
+
+    def cancel(self, request: str):
+        self.cancelled.append(request)
+        self._done[request].set()
+
+    def finish(self, request: str):
+        self._done[request].set()
+
+    def scheduler(self) -> RequestScheduler[str]:
+        return RequestScheduler[str](
+            start=self.start,
+            drop=self.dropped.append,
+            cancel=self.cancel,
+            logger=logging.getLogger("test"),
+        )
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def run_policy(policy: RequestPolicy):
+    async def main():
+        gens = Generations()
+        scheduler = gens.scheduler()
+        run_t = asyncio.create_task(scheduler.run())
+        scheduler.submit("a", policy)
+        await settle()
+        # Three more arrive while the first is generating
+        for request in ("b", "c", "d"):
+            scheduler.submit(request, policy)
+        await settle()
+        gens.finish("a")
+        for request in ("b", "c", "d"):
+            await settle()
+            if request in gens.started:
+                gens.finish(request)
+        await settle()
+        busy = scheduler.busy
+        run_t.cancel()
+        return gens, scheduler, busy
+
+    return asyncio.run(main())
+
+
+def test_queue_runs_every_request_in_order():
+    gens, scheduler, busy = run_policy(RequestPolicy.QUEUE)
+    assert gens.started == ["a", "b", "c", "d"]
+    assert gens.dropped == [] and gens.cancelled == []
+    assert scheduler.stats.to_dict() == {"queued": 3, "cancelled": 0, "coalesced": 0}
+    assert not busy
+
+
+def test_latest_wins_cancels_and_runs_only_the_newest():
+    gens, scheduler, busy = run_policy(RequestPolicy.LATEST_WINS)
+    assert gens.started == ["a", "d"]
+    assert gens.cancelled == ["a"]
+    assert gens.dropped == ["b", "c"]
+    assert scheduler.stats.to_dict() == {"queued": 0, "cancelled": 1, "coalesced": 2}
+    assert not busy
+
+
+def test_coalesce_finishes_then_runs_only_the_newest():
+    gens, scheduler, busy = run_policy(RequestPolicy.COALESCE)
+    assert gens.started == ["a", "d"]
+    assert gens.cancelled == []
+    assert gens.dropped == ["b", "c"]
+    assert scheduler.stats.to_dict() == {"queued": 3, "cancelled": 0, "coalesced": 2}
+    assert not busy
+
+
+def test_failed_start_does_not_block_later_requests():
+    async def main():
+        started: list[str] = []
+
+        async def start(request: str) -> asyncio.Task | None:
+            started.append(request)
+            if request == "a":
+                return None
+            return asyncio.create_task(asyncio.sleep(0))
+
+        scheduler = RequestScheduler[str](
+            start=start,
+            drop=lambda _: None,
+            cancel=lambda _: None,
+            logger=logging.getLogger("test"),
+        )
+        run_t = asyncio.create_task(scheduler.run())
+        scheduler.submit("a", RequestPolicy.LATEST_WINS)
+        await settle()
+        scheduler.submit("b", RequestPolicy.LATEST_WINS)
+        await settle()
+        run_t.cancel()
+        assert started == ["a", "b"]
+        assert scheduler.stats.cancelled == 0
+
+    asyncio.run(main())
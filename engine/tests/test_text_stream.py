@@ -0,0 +1,50 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import asyncio
+
+from gabber.core.types.runtime import TextStream
+
+
+async def consume(stream: TextStream) -> list[str]:
+    return [text async for text in stream]
+
+
+def test_every_consumer_reads_all_chunks_in_order():
+    async def main():
+        stream = TextStream()
+        tokens = [f"token{i} " for i in range(1000)]
+        early = [asyncio.create_task(consume(stream)) for _ in range(4)]
+        await asyncio.sleep(0)
+        for i, token in enumerate(tokens):
+            stream.push_text(token)
+            if i == len(tokens) // 2:
+                # Joining mid-stream still reads from the start
+                late = asyncio.create_task(consume(stream))
+            if i % 7 == 0:
+                await asyncio.sleep(0)
+        stream.eos()
+        received = await asyncio.gather(*early, late)
+        assert all(r == tokens for r in received)
+        # And after the end
+        assert await consume(stream) == tokens
+
+    asyncio.run(main())
+
+
+def test_cancelled_consumer_does_not_affect_others():
+    async def main():
+        stream = TextStream()
+        cancelled = asyncio.create_task(consume(stream))
+        other = asyncio.create_task(consume(stream))
+        await asyncio.sleep(0)
+        # Both are waiting on the same change future
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        stream.push_text("hello ")
+        stream.push_text("world")
+        stream.eos()
+        assert await asyncio.wait_for(other, timeout=1) == ["hello ", "world"]
+        assert cancelled.cancelled()
+
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import asyncio
+import logging
+from typing import cast
+
+import numpy as np
+
+from gabber.core import pad
+from gabber.core.types.runtime import AudioFrame, AudioFrameData
+from gabber.lib.tts import TTSSession
+from gabber.lib.tts.cache import TTSCache
+from gabber.nodes.tts.tts import TTSJob
+
+FRAMES = 5
+
+
+class FakeTTS:
+    """Streams a few frames per session once its text is complete."""
+
+    def __init__(self):
+        self.sessions: list[TTSSession] = []
+
+    def start_session(self, *, voice: str) -> TTSSession:
+        session = TTSSession(voice=voice, logger=logging.getLogger("test"))
+        self.sessions.append(session)
+        asyncio.create_task(self._synthesize(session))
+        return session
+
+    async def _synthesize(self, session: TTSSession):
+        while await session._text_queue.get() is not None:
+            pass
+        for _ in range(FRAMES):
+            data = AudioFrameData(
+                data=np.zeros((1, 480), dtype=np.int16),
+                sample_rate=24000,
+                num_channels=1,
+            )
+            session._output_queue.put_nowait(
+                AudioFrame(start_timestamp=0.0, original_data=data, data_24000hz=data)
+            )
+            await asyncio.sleep(0)
+        session._output_queue.put_nowait(None)
+
+    async def run(self):
+        await asyncio.Event().wait()
+
+
+def start_jobs(tts: FakeTTS, slots: asyncio.Semaphore, count: int) -> list[TTSJob]:
+    jobs = []
+    for i in range(count):
+        job = TTSJob(
+            tts,
+            cast(pad.RequestContext, None),
+            voice="test",
+            cache=TTSCache(max_bytes=0),
+            backend="fake",
+            model="test",
+            slots=slots,
+        )
+        job.say(f"Response number {i}.")
+        jobs.append(job)
+    return jobs
+
+
+async def free_slots(slots: asyncio.Semaphore, total: int) -> int:
+    free = 0
+    for _ in range(total):
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=0.05)
+        except TimeoutError:
+            break
+        free += 1
+    return free
+
+
+def test_lookahead_bounds_synthesis():
+    async def main():
+        tts = FakeTTS()
+        slots = asyncio.Semaphore(2)
+        jobs = start_jobs(tts, slots, 3)
+        await asyncio.sleep(0.05)
+        # The playing job and one look-ahead job, the third waits for a slot
+        assert len(tts.sessions) == 2
+
+        frames = [frame async for frame in jobs[0]]
+        assert len(frames) == FRAMES
+        await asyncio.sleep(0.05)
+        assert len(tts.sessions) == 3
+
+        for job in jobs[1:]:
+            job.cancel()
+        assert await free_slots(slots, 2) == 2
+
+    asyncio.run(main())
+
+
+def test_cancel_releases_slot():
+    async def main():
+        tts = FakeTTS()
+        slots = asyncio.Semaphore(2)
+        jobs = start_jobs(tts, slots, 3)
+        await asyncio.sleep(0.05)
+
+        # Interrupted mid-playback, the queued job takes its slot
+        assert await anext(jobs[0]) is not None
+        jobs[0].cancel()
+        await asyncio.sleep(0.05)
+        assert len(tts.sessions) == 3
+        assert [frame async for frame in jobs[0]] == []
+
+        for job in jobs[1:]:
+            job.cancel()
+        assert await free_slots(slots, 2) == 2
+
+    asyncio.run(main())
+
+
+def test_cancel_queued_job_never_synthesizes():
+    async def main():
+        tts = FakeTTS()
+        slots = asyncio.Semaphore(1)
+        jobs = start_jobs(tts, slots, 2)
+        await asyncio.sleep(0.05)
+        assert len(tts.sessions) == 1
+
+        jobs[1].cancel()
+        jobs[0].cancel()
+        await asyncio.sleep(0.05)
+        assert len(tts.sessions) == 1
+        assert [frame async for frame in jobs[1]] == []
+        assert await free_slots(slots, 1) == 1
+
+    asyncio.run(main())
@@ -0,0 +1,156 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import asyncio
+import base64
+import json
+import logging
+from typing import Any
+
+import numpy as np
+from aiohttp import web
+
+from gabber.core.types.runtime import AudioFrameData
+from gabber.lib.audio import Resampler
+from gabber.lib.tts.tts import MultiplexWebSocketTTS
+
+SAMPLE_RATE = 24000
+CHUNK_SAMPLES = 480
+CHUNKS = 20
+
+
+async def fake_tts_endpoint(request: web.Request) -> web.WebSocketResponse:
+    """Answers each context with its own tone in 20ms chunks, yielding between
+    chunks so concurrent contexts interleave on the socket."""
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+
+    async def speak(context_id: str, index: int):
+        t = np.arange(CHUNKS * CHUNK_SAMPLES) / SAMPLE_RATE
+        pcm = (8000 * np.sin(2 * np.pi * (200 + 150 * index) * t)).astype(np.int16)
+        for start in range(0, pcm.shape[0], CHUNK_SAMPLES):
+            chunk = pcm[start : start + CHUNK_SAMPLES].tobytes()
+            await ws.send_json(
+                {"context_id": context_id, "audio": base64.b64encode(chunk).decode()}
+            )
+            await asyncio.sleep(0)
+        await ws.send_json({"context_id": context_id, "final": True})
+
+    tasks = []
+    async for msg in ws:
+        payload = json.loads(msg.data)
+        if payload.get("eos"):
+            tasks.append(asyncio.create_task(speak(payload["context_id"], len(tasks))))
+    await asyncio.gather(*tasks)
+    return ws
+
+
+class FakeTTS(MultiplexWebSocketTTS):
+    def __init__(self, *, url: str):
+        super().__init__(logger=logging.getLogger("test"))
+        self._url = url
+        # Chunks in the order they arrived, across all sessions
+        self.arrivals: list[tuple[str, bytes]] = []
+
+    def get_url(self) -> str:
+        return self._url
+
+    def get_headers(self) -> dict[str, str]:
+        return {}
+
+    def start_session_payload(
+        self, *, context_id: str, voice: str
+    ) -> dict[str, Any] | None:
+        return None
+
+    def push_text_payload(
+        self, *, context_id: str, voice: str, text: str
+    ) -> dict[str, Any] | None:
+        return None
+
+    def eos_payloads(self, *, context_id: str, voice: str) -> list[dict[str, Any]]:
+        return [{"context_id": context_id, "eos": True}]
+
+    def get_context_id(self, msg: dict[str, Any]) -> str | None:
+        return msg.get("context_id")
+
+    def get_pcm_bytes(self, msg: dict[str, Any]) -> bytes:
+        pcm = base64.b64decode(msg["audio"])
+        self.arrivals.append((msg["context_id"], pcm))
+        return pcm
+
+    def get_error_message(self, msg: dict[str, Any]) -> str:
+        return ""
+
+    def is_audio_message(self, msg: dict[str, Any]) -> bool:
+        return "audio" in msg
+
+    def is_final_message(self, msg: dict[str, Any]) -> bool:
+        return bool(msg.get("final"))
+
+    def is_error_message(self, msg: dict[str, Any]) -> bool:
+        return False
+
+
+def test_interleaved_sessions_resample_independently():
+    rates = [16000, 44100, 48000]
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/", fake_tts_endpoint)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+
+        tts = FakeTTS(url=f"ws://127.0.0.1:{port}/")
+        run_t = asyncio.create_task(tts.run())
+        try:
+            sessions = [tts.start_session(voice="test") for _ in range(3)]
+            outputs: dict[str, dict[int, list[np.ndarray]]] = {}
+
+            async def consume(session):
+                out = outputs[session.context_id] = {rate: [] for rate in rates}
+                async for frame in session:
+                    for rate in rates:
+                        data = getattr(frame, f"data_{rate}hz")
+                        out[rate].append(data.data.reshape(-1))
+
+            for session in sessions:
+                session.eos()
+            await asyncio.wait_for(
+                asyncio.gather(*(consume(s) for s in sessions)), timeout=10
+            )
+        finally:
+            await tts.close()
+            run_t.cancel()
+            await runner.cleanup()
+        return sessions, outputs, tts.arrivals
+
+    sessions, outputs, arrivals = asyncio.run(main())
+
+    # The chunks really were interleaved on the socket
+    order = [context_id for context_id, _ in arrivals]
+    assert order != sorted(order, key=order.index)
+
+    for session in sessions:
+        chunks = [pcm for ctx, pcm in arrivals if ctx == session.context_id]
+        assert len(chunks) == CHUNKS
+        for rate in rates:
+            # Bit-exact with the session's audio resampled on its own
+            resampler = Resampler(rate)
+            expected = np.concatenate(
+                [
+                    resampler.push_audio(
+                        AudioFrameData(
+                            data=np.frombuffer(pcm, dtype=np.int16).reshape(1, -1),
+                            sample_rate=SAMPLE_RATE,
+                            num_channels=1,
+                        )
+                    ).data.reshape(-1)
+                    for pcm in chunks
+                ]
+            )
+            actual = np.concatenate(outputs[session.context_id][rate])
+            assert np.array_equal(actual, expected)
@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+import logging
+from dataclasses import replace
+
+from core import InferenceProfile
+from lib import eot, lipsync, vad
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quantize-int8", action="store_true")
+    parser.add_argument(
+        "--graph-optimization",
+        choices=["disable", "basic", "extended", "all"],
+        default="all",
+    )
+    args = parser.parse_args()
+
+    profile = InferenceProfile(
+        device="cpu",
+        graph_optimization_level=args.graph_optimization,
+        quantize_int8=args.quantize_int8,
+        auto_tune_threads=True,
+    )
+
+    impls = {
+        "vad": vad.silero.SileroVADInference(profile=profile),
+        "eot": eot.pipecat.PipeCatEOTInference(profile=profile),
+        "lipsync": lipsync.OpenLipSyncInference(profile=profile),
+    }
+    for name, impl in impls.items():
+        await impl.initialize()
+        selected = replace(impl._profile, auto_tune_threads=False)
+        logging.info(f"{name}: {selected}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
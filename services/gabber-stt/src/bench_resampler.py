@@ -0,0 +1,67 @@
+import argparse
+import json
+import time
+
+import av
+import numpy as np
+from core.polyphase import COMMON_RATES, PolyphaseResampler
+
+CHUNK_SECS = 0.02
+
+
+def test_signal(rate: int, duration_s: float) -> np.typing.NDArray[np.int16]:
+    t = np.arange(int(rate * duration_s)) / rate
+    # Tones well inside the narrowest passband (8kHz nyquist) plus a sweep
+    sig = 0.3 * np.sin(2 * np.pi * 440 * t) + 0.2 * np.sin(2 * np.pi * 3100 * t)
+    sig += 0.2 * np.sin(2 * np.pi * (100 + 1500 * t / duration_s) * t)
+    return (sig * 32767 * 0.8).astype(np.int16)
+
+
+def throughput(
+    input_rate: int, output_rate: int, duration_s: float, chunk_secs: float
+) -> dict:
+    audio = test_signal(input_rate, duration_s)
+    chunk = int(input_rate * chunk_secs)
+
+    resampler = PolyphaseResampler(input_rate=input_rate, output_rate=output_rate)
+    out = np.empty(resampler.output_size(chunk), dtype=np.int16)
+    start = time.perf_counter()
+    for i in range(0, audio.shape[0], chunk):
+        resampler.push_audio(audio[i : i + chunk], out=out)
+    polyphase_s = time.perf_counter() - start
+
+    av_resampler = av.AudioResampler(format="s16", layout="mono", rate=output_rate)
+    start = time.perf_counter()
+    for i in range(0, audio.shape[0], chunk):
+        f = av.AudioFrame.from_ndarray(
+            audio[i : i + chunk].reshape(1, -1), format="s16", layout="mono"
+        )
+        f.sample_rate = input_rate
+        np.concatenate([fr.to_ndarray().reshape(-1) for fr in av_resampler.resample(f)])
+    av_s = time.perf_counter() - start
+
+    return {
+        "input_rate": input_rate,
+        "output_rate": output_rate,
+        "polyphase_x_realtime": round(duration_s / polyphase_s, 1),
+        "av_x_realtime": round(duration_s / av_s, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Polyphase resampler throughput against PyAV"
+    )
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--chunk", type=float, default=CHUNK_SECS)
+    args = parser.parse_args()
+
+    for input_rate in COMMON_RATES:
+        for output_rate in COMMON_RATES:
+            if input_rate != output_rate:
+                res = throughput(input_rate, output_rate, args.duration, args.chunk)
+                print(json.dumps(res))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+from server.audio_ring import AudioRing
+
+CHUNK_SECS = 0.02
+SAMPLE_RATE = 16000
+
+
+class EchoServer:
+    """Acks each audio message after decoding it the way a session would, so
+    the round trip covers transport and payload handling but no inference."""
+
+    def __init__(self):
+        self.app = web.Application()
+        self.app.router.add_get("/", self.endpoint)
+
+    async def endpoint(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        ring: AudioRing | None = None
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                break
+            payload = json.loads(msg.data)["payload"]
+            if payload["type"] == "start_session":
+                if payload.get("shm_name"):
+                    ring = AudioRing.attach(
+                        payload["shm_name"], payload["shm_capacity"]
+                    )
+                continue
+            if payload["type"] == "audio":
+                n = len(base64.b64decode(payload["b64_data"])) // 2
+            else:
+                assert ring is not None
+                n = len(ring.read(payload["end_sample"])) // 2
+            await ws.send_str(json.dumps({"samples": n}))
+        if ring is not None:
+            ring.close()
+        return ws
+
+
+def serve(port: int, uds: str):
+    # Separate process, like a real gabber-stt server
+    async def run():
+        runner = web.AppRunner(EchoServer().app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        await web.UnixSite(runner, uds).start()
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+async def run_client(
+    session: aiohttp.ClientSession, url: str, chunks: int, ring: AudioRing | None
+) -> list[float]:
+    chunk = np.zeros(int(SAMPLE_RATE * CHUNK_SECS), dtype=np.int16)
+    rtts: list[float] = []
+    async with session.ws_connect(url) as ws:
+        start_payload: dict = {"type": "start_session", "sample_rate": SAMPLE_RATE}
+        if ring is not None:
+            start_payload.update(shm_name=ring.name, shm_capacity=ring.capacity)
+        await ws.send_json({"session_id": "bench", "payload": start_payload})
+        for _ in range(chunks):
+            start = time.perf_counter()
+            if ring is not None:
+                payload = {"type": "audio_ring", "end_sample": ring.write(chunk)}
+            else:
+                b64 = base64.b64encode(chunk.tobytes()).decode("utf-8")
+                payload = {"type": "audio", "b64_data": b64}
+            await ws.send_str(json.dumps({"session_id": "bench", "payload": payload}))
+            await ws.receive()
+            rtts.append(time.perf_counter() - start)
+    return rtts
+
+
+async def bench(name: str, url: str, uds: str | None, args) -> dict:
+    connector = aiohttp.UnixConnector(path=uds) if uds else None
+    async with aiohttp.ClientSession(connector=connector) as session:
+        rings = [
+            AudioRing.create(SAMPLE_RATE * 10) if name == "uds+shm" else None
+            for _ in range(args.clients)
+        ]
+        try:
+            results = await asyncio.gather(
+                *(run_client(session, url, args.chunks, ring) for ring in rings)
+            )
+        finally:
+            for ring in rings:
+                if ring is not None:
+                    ring.close()
+
+    rtts = np.array([r for res in results for r in res[args.warmup :]]) * 1000
+    return {
+        "transport": name,
+        "clients": args.clients,
+        "rtt_p50_ms": round(float(np.percentile(rtts, 50)), 3),
+        "rtt_p95_ms": round(float(np.percentile(rtts, 95)), 3),
+        "rtt_p99_ms": round(float(np.percentile(rtts, 99)), 3),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Per-chunk round trip over TCP, UDS and UDS with shared memory"
+    )
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--clients", type=int, default=1)
+    parser.add_argument("--port", type=int, default=7104)
+    args = parser.parse_args()
+
+    uds = os.path.join(tempfile.mkdtemp(), "bench.sock")
+    server = multiprocessing.Process(target=serve, args=(args.port, uds), daemon=True)
+    server.start()
+    while not os.path.exists(uds):
+        await asyncio.sleep(0.05)
+
+    try:
+        for name, sock in (("tcp", None), ("uds", uds), ("uds+shm", uds)):
+            url = f"ws://127.0.0.1:{args.port}/"
+            print(json.dumps(await bench(name, url, sock, args)))
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
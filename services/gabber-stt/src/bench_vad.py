@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+import logging
+import time
+
+import numpy as np
+from lib import vad
+
+CHUNK_SECS = 0.1
+
+
+class VADBenchSession:
+    def __init__(self, engine: vad.VADInferenceEngine):
+        self._engine = engine
+        self._state = None
+        self._audio = np.zeros(0, dtype=np.int16)
+        self.latencies: list[float] = []
+
+    async def run(self, duration_s: float):
+        impl = self._engine.inference_impl
+        chunk_samples = int(CHUNK_SECS * impl.sample_rate)
+        rng = np.random.default_rng()
+        cursor = impl.full_audio_size
+        self._audio = rng.integers(
+            -2000, 2000, size=impl.full_audio_size, dtype=np.int16
+        )
+        end = time.monotonic() + duration_s
+        while time.monotonic() < end:
+            await asyncio.sleep(CHUNK_SECS)
+            self._audio = np.concatenate(
+                (
+                    self._audio,
+                    rng.integers(-2000, 2000, size=chunk_samples, dtype=np.int16),
+                )
+            )
+            segments = []
+            while cursor + impl.new_audio_size <= self._audio.shape[0]:
+                cursor += impl.new_audio_size
+                segments.append(self._audio[cursor - impl.full_audio_size : cursor])
+
+            if len(segments) == 0:
+                continue
+
+            start = time.monotonic()
+            res = await self._engine.sequence_inference(segments, self._state)
+            self.latencies.append(time.monotonic() - start)
+            self._state = res[-1].state
+            self._audio = self._audio[cursor - impl.full_audio_size :]
+            cursor = impl.full_audio_size
+
+
+async def sample_queue_depth(engine: vad.VADInferenceEngine, depths: list[int]):
+    while True:
+        depths.append(engine.batcher.queue_depth)
+        await asyncio.sleep(0.005)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    vad_engine = vad.VADInferenceEngine(inference_impl=vad.silero.SileroVADInference())
+    await vad_engine.initialize()
+
+    sessions = [VADBenchSession(vad_engine) for _ in range(args.sessions)]
+    depths: list[int] = []
+    depth_t = asyncio.create_task(sample_queue_depth(vad_engine, depths))
+    await asyncio.gather(*(s.run(args.duration) for s in sessions))
+    depth_t.cancel()
+
+    latencies = np.array([lat for s in sessions for lat in s.latencies]) * 1000
+    logging.info(
+        f"sessions={args.sessions} requests={latencies.shape[0]} "
+        f"latency_ms p50={np.percentile(latencies, 50):.2f} "
+        f"p95={np.percentile(latencies, 95):.2f} "
+        f"p99={np.percentile(latencies, 99):.2f} "
+        f"queue_depth mean={np.mean(depths):.1f} max={np.max(depths)}"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -5,8 +5,16 @@ from .audio_inference import (
     AudioInferenceBatcherPromise,
     AudioInferenceInternalResult,
     AudioInferenceRequest,
+    InferenceMode,
 )
 from .audio_window import AudioWindow
+from .metrics import REGISTRY, Counter, Gauge, Histogram, MetricsRegistry
+from .inference_profile import (
+    InferenceProfile,
+    auto_tune_threads,
+    create_onnx_session,
+    prepare_profile,
+)
 from .resampler import Resampler
 
 __all__ = [
@@ -16,6 +24,16 @@ __all__ = [
     "AudioInferenceBatcherPromise",
     "AudioInferenceInternalResult",
     "AudioInferenceRequest",
+    "InferenceMode",
     "AudioWindow",
+    "REGISTRY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "InferenceProfile",
+    "auto_tune_threads",
+    "create_onnx_session",
+    "prepare_profile",
     "Resampler",
 ]
@@ -1,15 +1,58 @@
 import asyncio
 import logging
+import math
 import queue
 import threading
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
+from enum import Enum
 from typing import Any, Protocol, Generic, TypeVar
 
 import numpy as np
 
+from .metrics import REGISTRY
+
 RESULT = TypeVar("RESULT")
 
 
+class InferenceMode(Enum):
+    # Everything the model can produce, e.g. word timings for STT
+    FULL = "full"
+    # Cheapest usable result, e.g. raw text for interim STT hypotheses
+    TEXT_ONLY = "text_only"
+
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+UTILIZATION_WINDOW_S = 5.0
+QUEUE_WAIT_SMOOTHING = 0.3
+
+batch_size_histogram = REGISTRY.histogram(
+    "gabber_stt_batch_size",
+    "Number of requests per batched inference call",
+    buckets=BATCH_SIZE_BUCKETS,
+)
+queue_wait_histogram = REGISTRY.histogram(
+    "gabber_stt_queue_wait_seconds",
+    "Time requests spend queued before their batch starts",
+)
+inference_histogram = REGISTRY.histogram(
+    "gabber_stt_inference_seconds",
+    "Wall time of one batched inference call",
+)
+queue_depth_gauge = REGISTRY.gauge(
+    "gabber_stt_queue_depth",
+    "Requests waiting in the batcher queue",
+)
+utilization_gauge = REGISTRY.gauge(
+    "gabber_stt_batcher_utilization",
+    "Smoothed fraction of wall time the batcher spends running inference",
+)
+inference_errors_counter = REGISTRY.counter(
+    "gabber_stt_inference_errors_total",
+    "Batched inference calls that raised",
+)
+
+
 class AudioInferenceEngine(Generic[RESULT]):
     def __init__(
         self,
@@ -17,28 +60,51 @@ class AudioInferenceEngine(Generic[RESULT]):
         inference_impl: "AudioInference",
         batch_size: int = 32,
         batch_timeout: float = 0.01,
+        name: str | None = None,
     ):
         self.inference_impl = inference_impl
         self.batcher = AudioInferenceBatcher(
             inference_impl=inference_impl,
             batch_size=batch_size,
             batch_timeout=batch_timeout,
+            name=name,
         )
 
     @property
     def sample_rate(self) -> int:
         return self.inference_impl.sample_rate
 
-    async def simple_inference(self, audio: np.typing.NDArray[np.int16]) -> RESULT:
+    async def simple_inference(
+        self,
+        audio: np.typing.NDArray[np.int16],
+        mode: InferenceMode = InferenceMode.FULL,
+    ) -> RESULT:
         samples = audio.shape[0]
         if audio.shape[0] != self.inference_impl.full_audio_size:
             audio = np.pad(
                 audio,
                 (0, self.inference_impl.full_audio_size - audio.shape[0]),
             )
-        res = await self.batcher.inference(audio, None, samples)
+        res = await self.batcher.inference(audio, None, samples, mode=mode)
         return res.result
 
+    async def sequence_inference(
+        self,
+        audio: list[np.typing.NDArray[np.int16]],
+        prev_state: Any | None,
+    ) -> "list[AudioInferenceInternalResult[RESULT]]":
+        """Run consecutive hops of one stream as a single batcher request.
+
+        Hop N is fed the state produced by hop N-1, starting from prev_state.
+        """
+        full_audio_size = self.inference_impl.full_audio_size
+        hops = np.zeros((len(audio), full_audio_size), dtype=np.int16)
+        num_samples: list[int] = []
+        for i, a in enumerate(audio):
+            hops[i, : a.shape[0]] = a[:full_audio_size]
+            num_samples.append(min(a.shape[0], full_audio_size))
+        return await self.batcher.sequence_inference(hops, prev_state, num_samples)
+
     async def initialize(self) -> None:
         await self.inference_impl.initialize()
         self.batcher.start()
@@ -46,10 +112,13 @@ class AudioInferenceEngine(Generic[RESULT]):
 
 @dataclass
 class AudioInferenceBatcherPromise(Generic[RESULT]):
+    # One row per hop, hops are run in order with the state carried between them
     audio: np.typing.NDArray[np.int16]
     prev_state: Any | None
-    num_samples: int
-    fut: "asyncio.Future[AudioInferenceInternalResult[RESULT]]"
+    num_samples: list[int]
+    fut: "asyncio.Future[list[AudioInferenceInternalResult[RESULT]]]"
+    mode: InferenceMode = InferenceMode.FULL
+    enqueued_at: float = field(default_factory=time.monotonic)
 
 
 class AudioInferenceBatcher(Generic[RESULT]):
@@ -59,7 +128,9 @@ class AudioInferenceBatcher(Generic[RESULT]):
         inference_impl: "AudioInference[RESULT]",
         batch_size: int = 32,
         batch_timeout: float = 0.01,
+        name: str | None = None,
     ):
+        self.name = name or type(inference_impl).__name__
         self._batch_timeout = batch_timeout
         self._batch_size = batch_size
         self._inference_impl = inference_impl
@@ -67,48 +138,124 @@ class AudioInferenceBatcher(Generic[RESULT]):
         self._batch = queue.Queue[AudioInferenceBatcherPromise](maxsize=1024)
         self._run_thread = threading.Thread(target=self._run)
         self._loop = asyncio.get_event_loop()
+        self._utilization = 0.0
+        self._utilization_mark = time.monotonic()
+        self._queue_wait_s = 0.0
+
+    @property
+    def utilization(self) -> float:
+        return self._utilization
+
+    @property
+    def queue_wait_s(self) -> float:
+        """Smoothed time requests wait in the queue before their batch runs."""
+        return self._queue_wait_s
+
+    def _observe_queue_wait(self, wait_s: float):
+        self._queue_wait_s += QUEUE_WAIT_SMOOTHING * (wait_s - self._queue_wait_s)
+
+    def _update_utilization(self, busy_s: float):
+        # Exponentially weighted over UTILIZATION_WINDOW_S regardless of how
+        # often batches run
+        now = time.monotonic()
+        elapsed = now - self._utilization_mark
+        self._utilization_mark = now
+        if elapsed <= 0:
+            return
+        alpha = 1 - math.exp(-elapsed / UTILIZATION_WINDOW_S)
+        sample = min(1.0, busy_s / elapsed)
+        self._utilization += alpha * (sample - self._utilization)
+        utilization_gauge.set(self._utilization, model=self.name)
 
     @property
     def sample_rate(self) -> int:
         return self._inference_impl.sample_rate
 
+    @property
+    def queue_depth(self) -> int:
+        return self._batch.qsize()
+
     def _run(self):
         while True:
-            try:
-                batch_arr = np.empty(
-                    (self._batch_size, self._inference_impl.full_audio_size),
-                    dtype=np.int16,
-                )
-            except Exception:
-                logging.error("Error in STT inference batcher", exc_info=True)
-                continue
-            prev_states: list[Any] = []
-            num_samples: list[int] = []
-            futs: list[asyncio.Future[AudioInferenceInternalResult[RESULT]]] = []
-            while len(futs) < self._batch_size:
+            proms: list[AudioInferenceBatcherPromise[RESULT]] = []
+            while len(proms) < self._batch_size:
                 try:
-                    prom = self._batch.get(timeout=self._batch_timeout)
-                    num_samples.append(prom.num_samples)
-                    batch_arr[len(futs)] = prom.audio
-                    prev_states.append(prom.prev_state)
-                    futs.append(prom.fut)
+                    proms.append(self._batch.get(timeout=self._batch_timeout))
                 except queue.Empty:
                     break
-                except Exception:
-                    logging.error("Error in STT inference batcher", exc_info=True)
 
-            if len(futs) == 0:
+            queue_depth_gauge.set(self._batch.qsize(), model=self.name)
+            if len(proms) == 0:
+                self._update_utilization(0.0)
+                self._observe_queue_wait(0.0)
                 continue
 
+            batch_start = time.monotonic()
+            max_wait = 0.0
+            for prom in proms:
+                wait = batch_start - prom.enqueued_at
+                max_wait = max(max_wait, wait)
+                queue_wait_histogram.observe(wait, model=self.name)
+            self._observe_queue_wait(max_wait)
+            batch_size_histogram.observe(len(proms), model=self.name)
+
+            try:
+                results = self._run_batch(proms)
+            except Exception as e:
+                inference_errors_counter.inc(model=self.name)
+                logging.error("Error in STT inference batcher", exc_info=True)
+                for prom in proms:
+                    self._loop.call_soon_threadsafe(self._reject, prom.fut, e)
+                continue
+            finally:
+                self._update_utilization(time.monotonic() - batch_start)
+
+            for prom, res in zip(proms, results):
+                self._loop.call_soon_threadsafe(self._resolve, prom.fut, res)
+
+    def _run_batch(
+        self, proms: "list[AudioInferenceBatcherPromise[RESULT]]"
+    ) -> "list[list[AudioInferenceInternalResult[RESULT]]]":
+        # Multi-hop promises are run as successive steps. Each step batches the
+        # next pending hop of every promise so recurrent state stays in order.
+        batch_arr = np.empty(
+            (len(proms), self._inference_impl.full_audio_size),
+            dtype=np.int16,
+        )
+        states = [prom.prev_state for prom in proms]
+        results: list[list[AudioInferenceInternalResult[RESULT]]] = [[] for _ in proms]
+        steps = max(prom.audio.shape[0] for prom in proms)
+        for step in range(steps):
+            active = [i for i, prom in enumerate(proms) if prom.audio.shape[0] > step]
+            for row, i in enumerate(active):
+                batch_arr[row] = proms[i].audio[step]
+
             req = AudioInferenceRequest(
-                audio_batch=batch_arr[: len(futs)],
-                prev_states=prev_states,
-                num_samples=num_samples,
+                audio_batch=batch_arr[: len(active)],
+                prev_states=[states[i] for i in active],
+                num_samples=[proms[i].num_samples[step] for i in active],
+                modes=[proms[i].mode for i in active],
+            )
+            inference_start = time.monotonic()
+            step_results = self._inference_impl.inference(req)
+            inference_histogram.observe(
+                time.monotonic() - inference_start, model=self.name
             )
-            results = self._inference_impl.inference(req)
+            for row, i in enumerate(active):
+                results[i].append(step_results[row])
+                states[i] = step_results[row].state
+
+        return results
 
-            for i, fut in enumerate(futs):
-                self._loop.call_soon_threadsafe(fut.set_result, results[i])
+    @staticmethod
+    def _resolve(fut: asyncio.Future, res: Any):
+        if not fut.done():
+            fut.set_result(res)
+
+    @staticmethod
+    def _reject(fut: asyncio.Future, e: Exception):
+        if not fut.done():
+            fut.set_exception(e)
 
     def start(self):
         self._run_thread.start()
@@ -118,15 +265,29 @@ class AudioInferenceBatcher(Generic[RESULT]):
         audio: np.typing.NDArray[np.int16],
         prev_state: Any | None,
         num_samples: int,
+        mode: InferenceMode = InferenceMode.FULL,
     ) -> "AudioInferenceInternalResult[RESULT]":
+        res = await self.sequence_inference(
+            np.expand_dims(audio, axis=0), prev_state, [num_samples], mode=mode
+        )
+        return res[0]
+
+    async def sequence_inference(
+        self,
+        audio: np.typing.NDArray[np.int16],
+        prev_state: Any | None,
+        num_samples: list[int],
+        mode: InferenceMode = InferenceMode.FULL,
+    ) -> "list[AudioInferenceInternalResult[RESULT]]":
         try:
-            fut = asyncio.Future[AudioInferenceInternalResult[RESULT]]()
+            fut = asyncio.Future[list[AudioInferenceInternalResult[RESULT]]]()
             self._batch.put_nowait(
                 AudioInferenceBatcherPromise(
                     audio=audio,
                     prev_state=prev_state,
                     fut=fut,
                     num_samples=num_samples,
+                    mode=mode,
                 )
             )
             res = await fut
@@ -159,6 +320,13 @@ class AudioInferenceRequest:
     audio_batch: np.typing.NDArray[np.int16]
     prev_states: list[Any]
     num_samples: list[int]
+    # Per row, implementations that have nothing cheaper may ignore it
+    modes: list[InferenceMode] = field(default_factory=list)
+
+    def mode(self, idx: int) -> InferenceMode:
+        if idx < len(self.modes):
+            return self.modes[idx]
+        return InferenceMode.FULL
 
 
 @dataclass
@@ -0,0 +1,165 @@
+import logging
+import os
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Literal
+
+import onnxruntime
+
+logger = logging.getLogger(__name__)
+
+GraphOptimizationLevel = Literal["disable", "basic", "extended", "all"]
+
+_GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+@dataclass
+class InferenceProfile:
+    device: Literal["cpu", "cuda"] = "cpu"
+    # 0 leaves the choice to the runtime
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
+    graph_optimization_level: GraphOptimizationLevel = "all"
+    quantize_int8: bool = False
+    auto_tune_threads: bool = False
+
+    @classmethod
+    def from_env(cls, name: str, default: "InferenceProfile") -> "InferenceProfile":
+        """Override fields of default from GABBER_STT_<NAME>_* variables."""
+        prefix = f"GABBER_STT_{name.upper()}_"
+
+        def env(key: str) -> str | None:
+            return os.environ.get(prefix + key)
+
+        profile = default
+        if (device := env("DEVICE")) is not None:
+            profile = replace(profile, device=device)  # type: ignore
+        if (intra := env("INTRA_OP_THREADS")) is not None:
+            profile = replace(profile, intra_op_threads=int(intra))
+        if (inter := env("INTER_OP_THREADS")) is not None:
+            profile = replace(profile, inter_op_threads=int(inter))
+        if (level := env("GRAPH_OPTIMIZATION")) is not None:
+            profile = replace(profile, graph_optimization_level=level)  # type: ignore
+        if (quantize := env("QUANTIZE_INT8")) is not None:
+            profile = replace(profile, quantize_int8=quantize.lower() in ("1", "true"))
+        if (tune := env("AUTO_TUNE_THREADS")) is not None:
+            profile = replace(profile, auto_tune_threads=tune.lower() in ("1", "true"))
+        return profile
+
+    @property
+    def providers(self) -> list[str]:
+        if self.device == "cuda":
+            return ["CUDAExecutionProvider", "CPUExecutionProvider"]
+        return ["CPUExecutionProvider"]
+
+    def session_options(self) -> onnxruntime.SessionOptions:
+        opts = onnxruntime.SessionOptions()
+        opts.add_session_config_entry("session.intra_op.allow_spinning", "0")
+        opts.add_session_config_entry("session.inter_op.allow_spinning", "0")
+        opts.graph_optimization_level = _GRAPH_OPTIMIZATION_LEVELS[
+            self.graph_optimization_level
+        ]
+        opts.intra_op_num_threads = self.intra_op_threads
+        opts.inter_op_num_threads = self.inter_op_threads
+        if self.inter_op_threads > 1:
+            opts.execution_mode = onnxruntime.ExecutionMode.ORT_PARALLEL
+        else:
+            opts.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        return opts
+
+
+def quantized_model_path(model_path: str) -> str:
+    """Dynamically quantize weights to int8, cached next to the original model."""
+    root, ext = os.path.splitext(model_path)
+    out_path = f"{root}.int8{ext}"
+    if os.path.exists(out_path) and os.path.getmtime(out_path) >= os.path.getmtime(
+        model_path
+    ):
+        return out_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    # Written under a per-process name and renamed into place, so a concurrent
+    # reader never loads a partially written model.
+    tmp_path = f"{root}.int8.{os.getpid()}.tmp{ext}"
+    logger.info(f"Quantizing {model_path} to {out_path}")
+    try:
+        quantize_dynamic(model_path, tmp_path, weight_type=QuantType.QInt8)
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return out_path
+
+
+def create_onnx_session(
+    model_path: str, profile: InferenceProfile
+) -> onnxruntime.InferenceSession:
+    if profile.quantize_int8 and profile.device == "cpu":
+        model_path = quantized_model_path(model_path)
+
+    return onnxruntime.InferenceSession(
+        model_path,
+        providers=profile.providers,
+        sess_options=profile.session_options(),
+    )
+
+
+def auto_tune_threads(
+    model_path: str,
+    profile: InferenceProfile,
+    sample_feed: Callable[[], dict[str, Any]],
+    *,
+    candidates: list[int] | None = None,
+    iterations: int = 10,
+) -> InferenceProfile:
+    """Pick the intra-op thread count with the best measured throughput."""
+    if profile.device != "cpu":
+        return profile
+
+    cpu_count = os.cpu_count() or 1
+    if candidates is None:
+        candidates = sorted({c for c in (1, 2, 4, 8, 16) if c <= cpu_count})
+
+    feed = sample_feed()
+    best_profile = profile
+    best_rate = 0.0
+    for threads in candidates:
+        candidate = replace(profile, intra_op_threads=threads)
+        session = create_onnx_session(model_path, candidate)
+        session.run(None, feed)  # warm up
+        start = time.perf_counter()
+        for _ in range(iterations):
+            session.run(None, feed)
+        rate = iterations / (time.perf_counter() - start)
+        logger.info(f"{model_path}: {threads} threads, {rate:.1f} runs/s")
+        if rate > best_rate:
+            best_rate = rate
+            best_profile = candidate
+
+    logger.info(
+        f"{model_path}: selected {best_profile.intra_op_threads} intra-op threads"
+    )
+    return best_profile
+
+
+def prepare_profile(
+    model_path: str,
+    profile: InferenceProfile,
+    sample_feed: Callable[[], dict[str, Any]],
+) -> InferenceProfile:
+    """Quantize and tune up front, returning a profile that loads as-is.
+
+    The supervisor runs this once before spawning workers so they neither
+    redo the quantization nor tune against each other's load.
+    """
+    if profile.quantize_int8 and profile.device == "cpu":
+        quantized_model_path(model_path)
+    if profile.auto_tune_threads:
+        profile = auto_tune_threads(model_path, profile, sample_feed)
+    return replace(profile, auto_tune_threads=False)
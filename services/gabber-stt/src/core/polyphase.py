@@ -0,0 +1,299 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+# Kept in sync with engine/gabber/lib/audio/resampler/polyphase.py
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from numpy.typing import NDArray
+
+TAPS_PER_PHASE = 32
+KAISER_BETA = 8.6
+ROLLOFF = 0.92
+
+# Coefficients are rounded to multiples of this. Every product of an int16
+# sample and a coefficient, and every sum of TAPS_PER_PHASE of them, is then
+# exact in float64, so results don't depend on how BLAS orders the sums and
+# chunked output is identical to resampling in one go.
+COEFFICIENT_STEP = 2.0**-30
+
+# Outputs computed per vectorized step, bounds the scratch buffers
+BLOCK_SIZE = 2048
+
+# Filters for these rate pairs are built at import so the first chunk of a
+# stream does not pay for filter design
+COMMON_RATES = (16000, 24000, 44100, 48000)
+
+# Integer ratios repeat every output or two, a cycle spans at least this many
+# input samples so each step is still a reasonably sized matmul
+MIN_CYCLE_INPUTS = 32
+
+# Long cycles are split into sub-cycles reading about this many input samples
+# each, so most of a sub-cycle's matrix is taps rather than zeros
+SUBCYCLE_INPUTS = 32
+
+# Rate pairs whose cycle matrices would hold more values than this are left
+# to PyAV
+MAX_MATRIX_SIZE = 1 << 18
+
+
+@lru_cache(maxsize=None)
+def _cycle(input_rate: int, output_rate: int) -> tuple[int, int, int, int]:
+    """up, down, cycle repeats and sub-cycles for a rate pair."""
+    g = math.gcd(input_rate, output_rate)
+    up = output_rate // g
+    down = input_rate // g
+    repeat = -(-MIN_CYCLE_INPUTS // down)
+    # Sub-cycles split the cycle's outputs evenly
+    target = max(1, repeat * down // SUBCYCLE_INPUTS)
+    divisors = [d for d in range(1, 2 * target + 1) if repeat * up % d == 0]
+    subcycles = min(divisors, key=lambda d: (abs(d - target), d))
+    return up, down, repeat, subcycles
+
+
+def supports_rates(input_rate: int, output_rate: int) -> bool:
+    up, down, repeat, subcycles = _cycle(input_rate, output_rate)
+    # Each output's column spans about a sub-cycle's inputs plus one window
+    span = repeat * down // subcycles + TAPS_PER_PHASE + subcycles
+    return repeat * up * span <= MAX_MATRIX_SIZE
+
+
+@dataclass(frozen=True)
+class PolyphaseFilter:
+    up: int
+    down: int
+    # Group delay in samples at the upsampled rate
+    delay: int
+    # Outputs are computed cycle_outputs at a time, in equal sub-cycles.
+    # Sub-cycle k of cycle c reads span input samples starting at
+    # c * cycle_inputs + k * subcycle_step + first_input.
+    cycle_outputs: int
+    cycle_inputs: int
+    subcycle_step: int
+    first_input: int
+    span: int
+    # matrices[k, s, j] weights sample s of sub-cycle k's span for its output
+    # j, so a block of cycles is one batched matmul
+    matrices: NDArray[np.float64]
+
+    @property
+    def extent(self) -> int:
+        """Input samples read by one cycle, from its first input."""
+        return (self.matrices.shape[0] - 1) * self.subcycle_step + self.span
+
+
+@lru_cache(maxsize=None)
+def polyphase_filter(input_rate: int, output_rate: int) -> PolyphaseFilter:
+    up, down, repeat, subcycles = _cycle(input_rate, output_rate)
+    num_taps = TAPS_PER_PHASE * up
+    delay = num_taps // 2
+
+    # Windowed-sinc lowpass at the upsampled rate, centred on an integer tap
+    # so integer ratios keep their phase
+    cutoff = 0.5 / max(up, down) * ROLLOFF
+    n = np.arange(num_taps, dtype=np.float64) - delay
+    window = np.kaiser(num_taps + 1, KAISER_BETA)[:num_taps]
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * window
+    h *= up / h.sum()
+    h = np.round(h / COEFFICIENT_STEP) * COEFFICIENT_STEP
+
+    # phase[p, j] = h[p + j * up] weights input i - j, reversed so phase p
+    # dots directly with a window of input samples in time order
+    phases = h.reshape(TAPS_PER_PHASE, up).T
+    coefficients = phases[:, ::-1]
+
+    # Output j of a cycle uses phase t % up over the window ending at t // up.
+    # delay is a multiple of up, so sub-cycle k's windows start no earlier
+    # than k * subcycle_step past the cycle's first.
+    cycle_outputs = repeat * up
+    subcycle_outputs = cycle_outputs // subcycles
+    subcycle_step = subcycle_outputs * down // up
+    t = np.arange(cycle_outputs, dtype=np.int64) * down + delay
+    first_input = int(t[0] // up) - TAPS_PER_PHASE + 1
+    starts = t // up - TAPS_PER_PHASE + 1 - first_input
+    starts = starts.reshape(subcycles, subcycle_outputs)
+    starts -= np.arange(subcycles)[:, None] * subcycle_step
+    span = int(starts.max()) + TAPS_PER_PHASE
+
+    matrices = np.zeros((subcycles, subcycle_outputs, span), dtype=np.float64)
+    rows = starts[:, :, None] + np.arange(TAPS_PER_PHASE)
+    matrices[
+        np.arange(subcycles)[:, None, None],
+        np.arange(subcycle_outputs)[None, :, None],
+        rows,
+    ] = coefficients[t % up].reshape(subcycles, subcycle_outputs, -1)
+
+    return PolyphaseFilter(
+        up=up,
+        down=down,
+        delay=delay,
+        cycle_outputs=cycle_outputs,
+        cycle_inputs=repeat * down,
+        subcycle_step=subcycle_step,
+        first_input=first_input,
+        span=span,
+        matrices=np.ascontiguousarray(matrices.transpose(0, 2, 1)),
+    )
+
+
+for _in_rate in COMMON_RATES:
+    for _out_rate in COMMON_RATES:
+        if _in_rate != _out_rate:
+            polyphase_filter(_in_rate, _out_rate)
+
+
+class PolyphaseResampler:
+    """Stateful rational-ratio resampler for mono int16 audio.
+
+    Output is aligned with the input (the filter's group delay is compensated),
+    so eos() must be called to flush the last few milliseconds of a stream.
+    """
+
+    def __init__(self, *, input_rate: int, output_rate: int):
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self._filter = f = polyphase_filter(input_rate, output_rate)
+        subcycles, span, subcycle_outputs = f.matrices.shape
+        max_cycles = -(-BLOCK_SIZE // f.cycle_outputs) + 1
+        self._spans = np.empty((subcycles, max_cycles, span), dtype=np.float64)
+        self._scratch = np.empty(
+            (max_cycles, subcycles, subcycle_outputs), dtype=np.float64
+        )
+        self.reset()
+
+    def reset(self):
+        f = self._filter
+        # Zeros stand in for the samples before the stream started. The buffer
+        # starts at cycle 0's first input and only ever drops whole cycles.
+        self._set_buffer(np.zeros(f.extent * 64, dtype=np.float64))
+        self._buf_len = -f.first_input
+        self._buf_start = f.first_input
+        self._buf_cycle = 0
+        self._consumed = 0
+        self._produced = 0
+
+    def _set_buffer(self, buf: NDArray[np.float64]):
+        f = self._filter
+        self._buf = buf
+        # [k, r] is the span read by sub-cycle k of cycle _buf_cycle + r,
+        # built once per buffer since as_strided is comparatively slow
+        self._cycles = as_strided(
+            buf,
+            shape=(
+                f.matrices.shape[0],
+                (buf.shape[0] - f.extent) // f.cycle_inputs + 1,
+                f.span,
+            ),
+            strides=(
+                f.subcycle_step * buf.itemsize,
+                f.cycle_inputs * buf.itemsize,
+                buf.itemsize,
+            ),
+            writeable=False,
+        )
+
+    def output_size(self, num_input_samples: int) -> int:
+        """Buffer length that always fits push_audio or eos output for this input.
+
+        Independent of stream position so one buffer can be reused per chunk.
+        """
+        f = self._filter
+        return -(-num_input_samples * f.up // f.down) + -(-f.delay // f.down) + 1
+
+    def _available(self, total_in: int) -> int:
+        # Output k needs input floor((k * down + delay) / up) to exist
+        last = total_in * self._filter.up - 1 - self._filter.delay
+        if last < 0:
+            return 0
+        return last // self._filter.down + 1
+
+    def _append(self, audio: NDArray[np.int16]):
+        f = self._filter
+        n = audio.shape[0]
+        # The last cycle of a block may read up to a cycle past the input,
+        # those outputs are discarded but the reads must stay in the buffer
+        if self._buf_len + n + f.extent > self._buf.shape[0]:
+            # Drop whole cycles no future output can reach
+            first_cycle = self._produced // f.cycle_outputs
+            drop = (first_cycle - self._buf_cycle) * f.cycle_inputs
+            keep = self._buf_len - drop
+            if keep + n + f.extent > self._buf.shape[0]:
+                buf = np.zeros(2 * (keep + n + f.extent), dtype=np.float64)
+                buf[:keep] = self._buf[drop : self._buf_len]
+                self._set_buffer(buf)
+            else:
+                self._buf[:keep] = self._buf[drop : self._buf_len]
+            self._buf_start += drop
+            self._buf_cycle = first_cycle
+            self._buf_len = keep
+        self._buf[self._buf_len : self._buf_len + n] = audio
+        self._buf_len += n
+        self._consumed += n
+
+    def _compute(self, start: int, end: int) -> NDArray[np.float64]:
+        f = self._filter
+        first = start // f.cycle_outputs
+        last = -(-end // f.cycle_outputs)
+        count = last - first
+        # The overlapping strided spans can't go to BLAS directly, a
+        # contiguous copy is much cheaper than the generic matmul loop
+        spans = self._spans[:, :count]
+        rows = slice(first - self._buf_cycle, last - self._buf_cycle)
+        np.copyto(spans, self._cycles[:, rows])
+        outputs = self._scratch[:count]
+        np.matmul(spans, f.matrices, out=outputs.transpose(1, 0, 2))
+        skip = start - first * f.cycle_outputs
+        return outputs.reshape(-1)[skip : skip + end - start]
+
+    def _process(
+        self,
+        audio: NDArray[np.int16],
+        out: NDArray[np.int16] | None,
+        limit: int | None = None,
+    ) -> NDArray[np.int16]:
+        self._append(audio)
+        end = self._available(self._consumed)
+        if limit is not None:
+            end = min(end, limit)
+        count = max(0, end - self._produced)
+
+        if out is None:
+            out = np.empty(count, dtype=np.int16)
+        elif out.shape[0] < count:
+            raise ValueError(f"Output buffer too small: {out.shape[0]} < {count}")
+
+        written = 0
+        while written < count:
+            n = min(count - written, BLOCK_SIZE)
+            start = self._produced + written
+            y = self._compute(start, start + n)
+            np.clip(y, -32768, 32767, out=y)
+            np.rint(y, out=out[written : written + n], casting="unsafe")
+            written += n
+
+        self._produced += count
+        return out[:count]
+
+    def push_audio(
+        self,
+        audio: NDArray[np.int16],
+        out: NDArray[np.int16] | None = None,
+    ) -> NDArray[np.int16]:
+        """Resample a chunk, writing into out when given.
+
+        Returns the filled view of out (or a new array).
+        """
+        return self._process(audio.reshape(-1), out)
+
+    def eos(self, out: NDArray[np.int16] | None = None) -> NDArray[np.int16]:
+        """Flush the samples held back by the filter delay and reset."""
+        f = self._filter
+        total = -(-self._consumed * f.up // f.down)
+        padding = np.zeros(TAPS_PER_PHASE + f.delay // f.up + 1, dtype=np.int16)
+        res = self._process(padding, out, limit=total)
+        self.reset()
+        return res
@@ -4,20 +4,40 @@
 import av
 import numpy as np
 
+from .polyphase import PolyphaseResampler, supports_rates
+
 
 class Resampler:
     def __init__(self, *, input_rate: int, output_rate: int):
         self._input_rate = input_rate
         self._output_rate = output_rate
-        self._resampler = av.AudioResampler(
-            format="s16",
-            layout="mono",
-            rate=output_rate,
-        )
+        self._polyphase: PolyphaseResampler | None = None
+        self._resampler: av.AudioResampler | None = None
+        if supports_rates(input_rate, output_rate):
+            self._polyphase = PolyphaseResampler(
+                input_rate=input_rate, output_rate=output_rate
+            )
+        else:
+            self._resampler = av.AudioResampler(
+                format="s16",
+                layout="mono",
+                rate=output_rate,
+            )
+
+    def output_size(self, num_samples: int) -> int:
+        if self._polyphase is not None:
+            return self._polyphase.output_size(num_samples)
+        return num_samples * self._output_rate // self._input_rate + 1
 
     def push_audio(
-        self, audio: np.typing.NDArray[np.int16]
+        self,
+        audio: np.typing.NDArray[np.int16],
+        out: np.typing.NDArray[np.int16] | None = None,
     ) -> np.typing.NDArray[np.int16]:
+        if self._polyphase is not None:
+            return self._polyphase.push_audio(audio, out=out)
+
+        assert self._resampler is not None
         f = av.AudioFrame.from_ndarray(
             audio.reshape(1, -1),
             format="s16",
@@ -25,14 +45,28 @@ class Resampler:
         )
         f.sample_rate = self._input_rate
         frames = self._resampler.resample(f)
-        concatted_frames = np.concatenate(
-            [np.frombuffer(frame.to_ndarray(), dtype=np.int16) for frame in frames]
-        )
-        return concatted_frames
+        return self._concat(frames, out)
+
+    def eos(
+        self, out: np.typing.NDArray[np.int16] | None = None
+    ) -> np.typing.NDArray[np.int16]:
+        if self._polyphase is not None:
+            return self._polyphase.eos(out=out)
 
-    def eos(self) -> np.typing.NDArray[np.int16]:
+        assert self._resampler is not None
         frames = self._resampler.resample(None)
+        return self._concat(frames, out)
+
+    def _concat(
+        self,
+        frames: list[av.AudioFrame],
+        out: np.typing.NDArray[np.int16] | None,
+    ) -> np.typing.NDArray[np.int16]:
         concatted_frames = np.concatenate(
             [np.frombuffer(frame.to_ndarray(), dtype=np.int16) for frame in frames]
+            or [np.zeros(0, dtype=np.int16)]
         )
-        return concatted_frames
+        if out is None:
+            return concatted_frames
+        out[: concatted_frames.shape[0]] = concatted_frames
+        return out[: concatted_frames.shape[0]]
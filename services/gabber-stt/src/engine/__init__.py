@@ -7,8 +7,10 @@ from .engine import (
 from .stt_state import (
     STTEvent_FinalTranscription,
     STTEvent_InterimTranscription,
+    STTEvent_QoS,
     STTEvent_SpeakingStarted,
 )
+from .qos import QoSLevel, QoSSettings
 
 from .lipsync_state import LipSyncEvent_Viseme
 
@@ -18,6 +20,9 @@ __all__ = [
     "STTEvent_SpeakingStarted",
     "STTEvent_InterimTranscription",
     "STTEvent_FinalTranscription",
+    "STTEvent_QoS",
+    "QoSLevel",
+    "QoSSettings",
     "LipSyncEvent_Viseme",
     "EngineEvent",
 ]
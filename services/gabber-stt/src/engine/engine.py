@@ -1,10 +1,14 @@
 import asyncio
 import logging
-from dataclasses import dataclass
-from typing import Callable, TypeVar
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, TypeVar
 
 import numpy as np
-from core import AudioWindow
+from core import REGISTRY, AudioWindow
 from lib import eot, lipsync, stt, vad
 
 from .lipsync_state import (
@@ -13,17 +17,35 @@ from .lipsync_state import (
     LipSyncState_Listening,
     ListeningState,
 )
+from .qos import QoSController, QoSSettings
 from .stt_state import (
     BaseSTTState,
     NotTalkingState,
     STTEvent_FinalTranscription,
     STTEvent_InterimTranscription,
+    STTEvent_QoS,
     STTEvent_SpeakingStarted,
     STTState_NotTalking,
+    STTTrace,
 )
 
 logger = logging.getLogger(__name__)
 
+active_sessions_gauge = REGISTRY.gauge(
+    "gabber_stt_active_sessions", "Sessions with a running engine"
+)
+session_rtf_histogram = REGISTRY.histogram(
+    "gabber_stt_session_rtf",
+    "Engine processing time divided by the audio time it covered, per tick",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0),
+)
+state_transitions_counter = REGISTRY.counter(
+    "gabber_stt_state_transitions_total", "STT state transitions by target state"
+)
+events_counter = REGISTRY.counter(
+    "gabber_stt_events_total", "Engine events emitted by type"
+)
+
 T = TypeVar("T")
 
 
@@ -37,6 +59,14 @@ class EngineSettings:
     lipsync_delay_s: float = 0.25
     lipsync_enabled: bool = False
     stt_enabled: bool = True
+    # When set, each session's STT state transitions are written here as JSON
+    trace_dir: str | None = None
+    adaptive_interims: bool = True
+    # Emit the last interim as the final when it already covers all voiced
+    # audio, instead of re-transcribing the utterance
+    reuse_final_hypothesis: bool = True
+    final_reuse_margin_s: float = 0.1
+    qos: QoSSettings = field(default_factory=QoSSettings)
 
 
 class Engine:
@@ -67,6 +97,8 @@ class Engine:
         )
         self._tasks = []
         self.settings = settings
+        # Recurrent VAD state for this session, carried across ticks
+        self.vad_state: Any | None = None
         self.stt_state: BaseSTTState = STTState_NotTalking(
             engine=self, state=NotTalkingState(vad_cursor=0)
         )
@@ -74,6 +106,11 @@ class Engine:
             engine=self, state=ListeningState()
         )
         self._on_event: Callable[[EngineEvent], None] = lambda _: None
+        self.qos = QoSController(settings=settings.qos)
+        self.stt_trace: STTTrace | None = STTTrace() if settings.trace_dir else None
+        self.processing_time_s = 0.0
+        # Input cursor covered by the last completed tick
+        self.processed_cursor = 0
 
     def set_event_handler(self, h: "Callable[[EngineEvent], None]"):
         self._on_event = h
@@ -82,30 +119,112 @@ class Engine:
         original_np_data = np.frombuffer(audio, dtype=np.int16)
         self.audio_window.push_audio(audio=original_np_data)
 
+    @property
+    def input_cursor(self) -> int:
+        return self.audio_window._end_cursors.get(self._input_sample_rate, 0)
+
+    @property
+    def input_sample_rate(self) -> int:
+        return self._input_sample_rate
+
+    @property
+    def lag_s(self) -> float:
+        """Seconds of pushed audio the engine has not processed yet."""
+        return (self.input_cursor - self.processed_cursor) / self._input_sample_rate
+
     async def run(self):
+        active_sessions_gauge.inc()
+        try:
+            await self._run()
+        finally:
+            active_sessions_gauge.dec()
+
+    async def _run(self):
+        last_cursor = self.input_cursor
+        pending_tick_s = 0.0
         while True:
             fns = []
 
             if self.settings.stt_enabled:
+                self._update_qos()
                 fns.append(self.stt_state.tick)
 
             if self.settings.lipsync_enabled:
                 fns.append(self.lipsync_state.tick)
 
+            tick_start = time.monotonic()
+            tick_cursor = self.input_cursor
             await asyncio.gather(*(fn() for fn in fns))
+            self.processed_cursor = tick_cursor
+            tick_s = time.monotonic() - tick_start
+            self.processing_time_s += tick_s
+            pending_tick_s += tick_s
+
+            cursor = self.input_cursor
+            if cursor > last_cursor:
+                audio_s = (cursor - last_cursor) / self._input_sample_rate
+                session_rtf_histogram.observe(pending_tick_s / audio_s)
+                last_cursor = cursor
+                pending_tick_s = 0.0
+
             await asyncio.sleep(0.01)
 
+    def _update_qos(self):
+        if not self.settings.adaptive_interims:
+            return
+
+        if self.qos.update(self.stt.batcher.queue_wait_s):
+            logger.info(f"Interim QoS level changed to {self.qos.level.name}")
+            interval = self.qos.interim_interval(self.stt.inference_impl.new_audio_size)
+            self.emit_event(
+                STTEvent_QoS(
+                    level=self.qos.level,
+                    interim_interval_s=(
+                        interval / self.stt.sample_rate
+                        if interval is not None
+                        else None
+                    ),
+                )
+            )
+
     def transition_to(self, new_state: "BaseSTTState[T]"):
         logger.info(f"Transitioning from {self.stt_state.name} to {new_state.name}")
+        state_transitions_counter.inc(state=new_state.name)
+        if self.stt_trace is not None:
+            self.stt_trace.record(
+                from_state=self.stt_state,
+                to_state=new_state,
+                audio_time_s=self.input_cursor / self._input_sample_rate,
+            )
         self.stt_state = new_state
 
     def emit_event(self, evt: "EngineEvent"):
+        events_counter.inc(type=type(evt).__name__)
         self._on_event(evt)
 
+    def dump_trace(self, session_id: str):
+        if self.stt_trace is None or self.settings.trace_dir is None:
+            return
+
+        # The id comes from the client, so it must not pick the path. The
+        # suffix keeps sessions that reuse an id from overwriting each other.
+        safe_id = re.sub(r"[^A-Za-z0-9_-]", "_", session_id)[:64]
+        name = f"{safe_id}-{uuid.uuid4().hex[:8]}.json"
+        os.makedirs(self.settings.trace_dir, exist_ok=True)
+        audio_s = self.input_cursor / self._input_sample_rate
+        self.stt_trace.dump(
+            os.path.join(self.settings.trace_dir, name),
+            session_id=session_id,
+            audio_time_s=audio_s,
+            processing_time_s=self.processing_time_s,
+            rtf=self.processing_time_s / audio_s if audio_s > 0 else None,
+        )
+
 
 EngineEvent = (
     STTEvent_FinalTranscription
     | STTEvent_InterimTranscription
+    | STTEvent_QoS
     | STTEvent_SpeakingStarted
     | LipSyncEvent_Viseme
 )
@@ -115,7 +115,7 @@ class LipSyncState_Listening(BaseLipSyncState[ListeningState]):
                 or r.max_viseme_prob.viseme != self.state.last_emitted_viseme
             ):
                 start = min(self.state.last_emitted_viseme_end, start_sample)
-                self.engine._on_event(
+                self.engine.emit_event(
                     LipSyncEvent_Viseme(
                         viseme=r.max_viseme_prob.viseme,
                         probability=r.max_viseme_prob.probability,
@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from enum import Enum
+
+
+class QoSLevel(Enum):
+    FULL = 0
+    REDUCED = 1
+    MINIMAL = 2
+    FINALS_ONLY = 3
+
+
+# Multiplier applied to the model's native interim cadence, None skips interims
+INTERIM_INTERVAL_MULTIPLIERS: dict[QoSLevel, int | None] = {
+    QoSLevel.FULL: 1,
+    QoSLevel.REDUCED: 2,
+    QoSLevel.MINIMAL: 4,
+    QoSLevel.FINALS_ONLY: None,
+}
+
+
+@dataclass
+class QoSSettings:
+    # STT queue wait at which each degraded level is entered
+    reduced_queue_wait_s: float = 0.05
+    minimal_queue_wait_s: float = 0.15
+    finals_only_queue_wait_s: float = 0.4
+    # A level is left once queue wait drops below this fraction of its threshold
+    hysteresis: float = 0.6
+
+
+class QoSController:
+    """Picks how often interim transcriptions are computed from STT queue wait.
+
+    Finals and end-of-turn checks are never throttled, so under load sessions
+    give up interim freshness before final latency.
+    """
+
+    def __init__(self, *, settings: QoSSettings):
+        self._settings = settings
+        self.level = QoSLevel.FULL
+
+    def _threshold(self, level: QoSLevel) -> float:
+        return {
+            QoSLevel.FULL: 0.0,
+            QoSLevel.REDUCED: self._settings.reduced_queue_wait_s,
+            QoSLevel.MINIMAL: self._settings.minimal_queue_wait_s,
+            QoSLevel.FINALS_ONLY: self._settings.finals_only_queue_wait_s,
+        }[level]
+
+    def update(self, queue_wait_s: float) -> bool:
+        """Returns True when the level changed."""
+        level = self.level
+        while level != QoSLevel.FINALS_ONLY and queue_wait_s >= self._threshold(
+            QoSLevel(level.value + 1)
+        ):
+            level = QoSLevel(level.value + 1)
+
+        while (
+            level != QoSLevel.FULL
+            and queue_wait_s < self._threshold(level) * self._settings.hysteresis
+        ):
+            level = QoSLevel(level.value - 1)
+
+        changed = level != self.level
+        self.level = level
+        return changed
+
+    def interim_interval(self, native_interval: int) -> int | None:
+        multiplier = INTERIM_INTERVAL_MULTIPLIERS[self.level]
+        if multiplier is None:
+            return None
+        return native_interval * multiplier
@@ -1,10 +1,15 @@
+import json
 import logging
+import time
 import wave
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from typing import Generic, TypeVar, TYPE_CHECKING
 
 
 import numpy as np
+from core import REGISTRY, InferenceMode
+
+from .qos import QoSLevel
 
 if TYPE_CHECKING:
     from .engine import Engine
@@ -13,6 +18,11 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+finals_counter = REGISTRY.counter(
+    "gabber_stt_finals_total",
+    "Final transcriptions by source: reused interim hypothesis or re-transcribed",
+)
+
 
 class BaseSTTState(Generic[T]):
     def __init__(self, *, engine: "Engine", state: T):
@@ -44,7 +54,10 @@ class BaseSTTState(Generic[T]):
         )
 
     async def vad_results(self, start_curs: int, end_curs: int) -> "list[VADResult]":
-        results: list[VADResult] = []
+        # All pending hops are submitted as one batcher request, with the
+        # session's recurrent VAD state threaded through them in order.
+        hops: list[tuple[int, int]] = []
+        segments: list[np.typing.NDArray[np.int16]] = []
         for i in range(
             start_curs,
             end_curs,
@@ -56,20 +69,26 @@ class BaseSTTState(Generic[T]):
             segment_start = segment_end - self.engine.vad.inference_impl.full_audio_size
             if segment_start < 0:
                 continue
-            segment = self.engine.audio_window.get_segment(
-                sample_rate=self.engine.vad.sample_rate,
-                start_curs=segment_start,
-                ends_curs=segment_end,
-            )
-            vad_value = await self.engine.vad.simple_inference(segment)
-            results.append(
-                VADResult(
-                    start=i,
-                    end=segment_end,
-                    value=vad_value,
+            segments.append(
+                self.engine.audio_window.get_segment(
+                    sample_rate=self.engine.vad.sample_rate,
+                    start_curs=segment_start,
+                    ends_curs=segment_end,
                 )
             )
-        return results
+            hops.append((i, segment_end))
+
+        if len(segments) == 0:
+            return []
+
+        vad_values = await self.engine.vad.sequence_inference(
+            segments, self.engine.vad_state
+        )
+        self.engine.vad_state = vad_values[-1].state
+        return [
+            VADResult(start=start, end=end, value=vad_value.result)
+            for (start, end), vad_value in zip(hops, vad_values)
+        ]
 
     @property
     def latest_vad_cursor(self):
@@ -150,7 +169,9 @@ class STTState_TalkingWarmUp(BaseSTTState[TalkingWarmUpState]):
             start_curs=self.vad_to_stt_curs(vad_curs=self.state.start_talking),
             ends_curs=self.vad_to_stt_curs(vad_curs=self.state.latest_voice),
         )
-        stt_result = await self.engine.stt.simple_inference(stt_seg)
+        stt_result = await self.engine.stt.simple_inference(
+            stt_seg, mode=InferenceMode.TEXT_ONLY
+        )
         if stt_result.transcription.strip() != "":
             self.engine.transition_to(
                 STTState_Talking(
@@ -217,6 +238,8 @@ class STTTalkingState:
     vad_cursor: int
     latest_voice: int
     current_transcription: str = ""
+    # STT cursor at the end of the audio current_transcription was computed on
+    transcription_end_cursor: int = -1
 
 
 class STTState_Talking(BaseSTTState[STTTalkingState]):
@@ -232,9 +255,12 @@ class STTState_Talking(BaseSTTState[STTTalkingState]):
             self.state.vad_cursor - self.state.latest_voice
         ) / self.engine.vad.sample_rate
 
+        interim_interval = self.engine.qos.interim_interval(
+            self.engine.stt.inference_impl.new_audio_size
+        )
         if (
-            self.latest_stt_cursor - self.state.stt_cursor
-            > self.engine.stt.inference_impl.new_audio_size
+            interim_interval is not None
+            and self.latest_stt_cursor - self.state.stt_cursor > interim_interval
         ):
             segment = self.engine.audio_window.get_segment(
                 sample_rate=self.engine.stt.sample_rate,
@@ -247,8 +273,11 @@ class STTState_Talking(BaseSTTState[STTTalkingState]):
                 )
             self.state.stt_cursor = self.latest_stt_cursor
 
-            stt_result = await self.engine.stt.simple_inference(segment)
+            stt_result = await self.engine.stt.simple_inference(
+                segment, mode=InferenceMode.TEXT_ONLY
+            )
             self.state.current_transcription = stt_result.transcription
+            self.state.transcription_end_cursor = self.state.stt_cursor
             self.engine.emit_event(
                 STTEvent_InterimTranscription(
                     trans_id=self.state.trans_id,
@@ -288,17 +317,7 @@ class STTState_Talking(BaseSTTState[STTTalkingState]):
                 self.engine.transition_to(
                     STTState_Finalizing(
                         engine=self.engine,
-                        state=FinalizingState(
-                            current_transcription=self.state.current_transcription,
-                            trans_id=self.state.trans_id,
-                            start_talking=self.state.start_talking,
-                            end_talking=self.state.latest_voice
-                            + int(
-                                self.engine.settings.vad_cooldown_time_s
-                                * self.engine.vad.sample_rate
-                                * 0.5
-                            ),
-                        ),
+                        state=self._finalizing_state(),
                     )
                 )
                 return
@@ -307,20 +326,25 @@ class STTState_Talking(BaseSTTState[STTTalkingState]):
             self.engine.transition_to(
                 STTState_Finalizing(
                     engine=self.engine,
-                    state=FinalizingState(
-                        current_transcription=self.state.current_transcription,
-                        trans_id=self.state.trans_id,
-                        start_talking=self.state.start_talking,
-                        end_talking=self.state.latest_voice
-                        + int(
-                            self.engine.settings.vad_cooldown_time_s
-                            * self.engine.vad.sample_rate
-                            * 0.5
-                        ),
-                    ),
+                    state=self._finalizing_state(),
                 )
             )
 
+    def _finalizing_state(self) -> "FinalizingState":
+        return FinalizingState(
+            current_transcription=self.state.current_transcription,
+            transcription_end_cursor=self.state.transcription_end_cursor,
+            trans_id=self.state.trans_id,
+            start_talking=self.state.start_talking,
+            latest_voice=self.state.latest_voice,
+            end_talking=self.state.latest_voice
+            + int(
+                self.engine.settings.vad_cooldown_time_s
+                * self.engine.vad.sample_rate
+                * 0.5
+            ),
+        )
+
 
 @dataclass
 class FinalizingState:
@@ -328,16 +352,42 @@ class FinalizingState:
     current_transcription: str
     start_talking: int
     end_talking: int
+    latest_voice: int = 0
+    transcription_end_cursor: int = -1
 
 
 class STTState_Finalizing(BaseSTTState[FinalizingState]):
-    async def tick(self):
-        stt_seg = self.engine.audio_window.get_segment(
-            sample_rate=self.engine.stt.sample_rate,
-            start_curs=self.vad_to_stt_curs(self.state.start_talking),
-            ends_curs=self.vad_to_stt_curs(self.state.end_talking),
+    def _hypothesis_is_current(self) -> bool:
+        """Whether current_transcription already covers every voiced sample.
+
+        Audio after the last voiced VAD hop is the silence padding before
+        end_talking, so re-transcribing it would reproduce the same text.
+        """
+        if not self.engine.settings.reuse_final_hypothesis:
+            return False
+
+        if self.state.transcription_end_cursor < 0:
+            return False
+
+        margin = int(
+            self.engine.settings.final_reuse_margin_s * self.engine.stt.sample_rate
         )
-        final_stt = await self.engine.stt.simple_inference(stt_seg)
+        voice_end = self.vad_to_stt_curs(self.state.latest_voice)
+        return self.state.transcription_end_cursor >= voice_end + margin
+
+    async def tick(self):
+        if self._hypothesis_is_current():
+            finals_counter.inc(source="hypothesis")
+            transcription = self.state.current_transcription
+        else:
+            finals_counter.inc(source="transcribed")
+            stt_seg = self.engine.audio_window.get_segment(
+                sample_rate=self.engine.stt.sample_rate,
+                start_curs=self.vad_to_stt_curs(self.state.start_talking),
+                ends_curs=self.vad_to_stt_curs(self.state.end_talking),
+            )
+            final_stt = await self.engine.stt.simple_inference(stt_seg)
+            transcription = final_stt.transcription
         # with wave.open(f"utterance_{self.state.trans_id}.wav", "wb") as wf:
         #     wf.setnchannels(1)
         #     wf.setsampwidth(2)
@@ -353,7 +403,7 @@ class STTState_Finalizing(BaseSTTState[FinalizingState]):
         self.engine.emit_event(
             STTEvent_FinalTranscription(
                 trans_id=self.state.trans_id,
-                transcription=final_stt.transcription,
+                transcription=transcription,
                 start_sample=self.vad_to_input_curs(self.state.start_talking),
                 end_sample=self.vad_to_input_curs(self.state.end_talking),
             )
@@ -369,6 +419,52 @@ class STTState_Finalizing(BaseSTTState[FinalizingState]):
         )
 
 
+@dataclass
+class STTTraceEntry:
+    timestamp: float
+    from_state: str
+    to_state: str
+    audio_time_s: float
+    state: dict
+
+
+@dataclass
+class STTTrace:
+    """Timestamped record of a session's STT state transitions."""
+
+    started_at: float = field(default_factory=time.time)
+    entries: list[STTTraceEntry] = field(default_factory=list)
+
+    def record(
+        self,
+        *,
+        from_state: "BaseSTTState",
+        to_state: "BaseSTTState",
+        audio_time_s: float,
+    ):
+        self.entries.append(
+            STTTraceEntry(
+                timestamp=time.time(),
+                from_state=from_state.name,
+                to_state=to_state.name,
+                audio_time_s=audio_time_s,
+                state=asdict(to_state.state),  # type: ignore
+            )
+        )
+
+    def dump(self, path: str, **extra):
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "started_at": self.started_at,
+                    "entries": [asdict(e) for e in self.entries],
+                    **extra,
+                },
+                f,
+                indent=2,
+            )
+
+
 @dataclass
 class STTEvent_InterimTranscription:
     trans_id: int
@@ -377,6 +473,13 @@ class STTEvent_InterimTranscription:
     transcription: str
 
 
+@dataclass
+class STTEvent_QoS:
+    level: QoSLevel
+    # None when interims are suspended
+    interim_interval_s: float | None
+
+
 @dataclass
 class STTEvent_SpeakingStarted:
     trans_id: int
@@ -4,7 +4,13 @@ import threading
 
 import numpy as np
 import onnxruntime
-from core.audio_inference import AudioInferenceInternalResult, AudioInferenceRequest
+from core import (
+    AudioInferenceInternalResult,
+    AudioInferenceRequest,
+    InferenceProfile,
+    create_onnx_session,
+    prepare_profile,
+)
 from transformers import WhisperFeatureExtractor
 
 from .eot import EOTInference
@@ -14,24 +20,47 @@ logger = logging.getLogger(__name__)
 DEFAULT_MODEL_PATH = "./weights/smart-turn-v3.0.onnx"
 CHUNK_SECONDS = 8
 
+DEFAULT_PROFILE = InferenceProfile(device="cuda", intra_op_threads=8)
+
 
 class PipeCatEOTInference(EOTInference):
-    def __init__(self, *, model_path: str = DEFAULT_MODEL_PATH):
+    def __init__(
+        self,
+        *,
+        model_path: str = DEFAULT_MODEL_PATH,
+        profile: InferenceProfile = DEFAULT_PROFILE,
+    ):
         super().__init__()
         self._model_path = model_path
+        self._profile = profile
+        self._onnx_session: onnxruntime.InferenceSession | None = None
         self._feature_extractor = WhisperFeatureExtractor(chunk_length=CHUNK_SECONDS)
 
-    def _initialize_onnx(self):
-        opts = onnxruntime.SessionOptions()
-        opts.add_session_config_entry("session.intra_op.allow_spinning", "0")
-        opts.intra_op_num_threads = 8
-        opts.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
-
-        self._onnx_session = onnxruntime.InferenceSession(
-            self._model_path,
-            providers=["CUDAExecutionProvider"],
-            sess_options=opts,
+    def _features(self, batch: np.typing.NDArray[np.float32]):
+        inputs = self._feature_extractor(
+            batch,
+            sampling_rate=16000,
+            return_tensors="np",
+            padding="max_length",
+            max_length=CHUNK_SECONDS * 16000,
+            truncation=True,
+            do_normalize=True,
+        )
+        return inputs.input_features.astype(np.float32)
+
+    def _sample_feed(self) -> dict:
+        batch = np.zeros((1, self.full_audio_size), dtype=np.float32)
+        return {"input_features": self._features(batch)}
+
+    def prepare_profile(self) -> InferenceProfile:
+        self._profile = prepare_profile(
+            self._model_path, self._profile, self._sample_feed
         )
+        return self._profile
+
+    def _initialize_onnx(self):
+        self.prepare_profile()
+        self._onnx_session = create_onnx_session(self._model_path, self._profile)
 
     async def initialize(self) -> None:
         init_thread = threading.Thread(target=self._initialize_onnx)
@@ -51,18 +80,7 @@ class PipeCatEOTInference(EOTInference):
             )
 
         batch = input.audio_batch.astype(np.float32) / 32768.0
-
-        inputs = self._feature_extractor(
-            batch,
-            sampling_rate=16000,
-            return_tensors="np",
-            padding="max_length",
-            max_length=CHUNK_SECONDS * 16000,
-            truncation=True,
-            do_normalize=True,
-        )
-
-        input_features = inputs.input_features.astype(np.float32)
+        input_features = self._features(batch)
 
         try:
             outputs = self._onnx_session.run(None, {"input_features": input_features})
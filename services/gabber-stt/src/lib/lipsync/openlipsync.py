@@ -11,7 +11,13 @@ import torch
 import torchaudio
 import onnxruntime
 from .lipsync import LipSyncInference, Viseme, VisemeProability, LipSyncResult
-from core import AudioInferenceRequest, AudioInferenceInternalResult
+from core import (
+    AudioInferenceRequest,
+    AudioInferenceInternalResult,
+    InferenceProfile,
+    create_onnx_session,
+    prepare_profile,
+)
 
 SUPPORTED_SAMPLE_RATE = 16000
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -46,27 +52,35 @@ mel_spectrogram_transform = torchaudio.transforms.MelSpectrogram(
 db_transform = torchaudio.transforms.AmplitudeToDB("power", top_db=80)
 
 
+DEFAULT_PROFILE = InferenceProfile(device="cpu", intra_op_threads=4)
+
+
 class OpenLipSyncInference(LipSyncInference):
-    def __init__(self, *, model_path: str = DEFAULT_WEIGHTS_PATH):
+    def __init__(
+        self,
+        *,
+        model_path: str = DEFAULT_WEIGHTS_PATH,
+        profile: InferenceProfile = DEFAULT_PROFILE,
+    ):
         logger.info(f"Initializing LipSync engine with model: {model_path}")
         self._model_path = model_path
+        self._profile = profile
         self._onnx_session: onnxruntime.InferenceSession | None = None
 
-    def _initialize_onnx(self):
-        opts = onnxruntime.SessionOptions()
-        opts.add_session_config_entry("session.intra_op.allow_spinning", "0")
-        opts.add_session_config_entry("session.inter_op.allow_spinning", "0")
-        opts.graph_optimization_level = (
-            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
-        )
-        opts.intra_op_num_threads = 4
-        opts.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+    def _sample_feed(self) -> dict:
+        audio = torch.zeros((1, INFERENCE_WINDOW_SIZE), dtype=torch.float32)
+        mels_db = db_transform(mel_spectrogram_transform(audio)).transpose(1, 2)
+        return {"audio_features": mels_db.numpy()}
 
-        self._onnx_session = onnxruntime.InferenceSession(
-            self._model_path,
-            providers=["CPUExecutionProvider"],
-            sess_options=opts,
+    def prepare_profile(self) -> InferenceProfile:
+        self._profile = prepare_profile(
+            self._model_path, self._profile, self._sample_feed
         )
+        return self._profile
+
+    def _initialize_onnx(self):
+        self.prepare_profile()
+        self._onnx_session = create_onnx_session(self._model_path, self._profile)
 
     async def initialize(self) -> None:
         init_thread = threading.Thread(target=self._initialize_onnx)
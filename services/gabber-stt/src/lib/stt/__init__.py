@@ -1,7 +1,12 @@
-from . import parakeet
 from . import mock
 from .stt import STTInferenceEngine, STTInferenceResult, STTInferenceResultWord
 
+try:
+    from . import parakeet
+except ImportError:
+    # torch / nemo are only needed for the real model, the mock works without them
+    parakeet = None
+
 __all__ = [
     "parakeet",
     "mock",
@@ -1,4 +1,4 @@
-from core import AudioInferenceInternalResult, AudioInferenceRequest
+from core import AudioInferenceInternalResult, AudioInferenceRequest, InferenceMode
 
 from ..stt import STTInference, STTInferenceResult, STTInferenceResultWord
 
@@ -36,7 +36,7 @@ class MockSTTInference(STTInference):
 
         batch_size = input.audio_batch.shape[0]
         results: list[AudioInferenceInternalResult[STTInferenceResult]] = []
-        for _ in range(batch_size):
+        for i in range(batch_size):
             words = [
                 STTInferenceResultWord(
                     word="hello",
@@ -49,6 +49,8 @@ class MockSTTInference(STTInference):
                     end_cursor=20,
                 ),
             ]
+            if input.mode(i) == InferenceMode.TEXT_ONLY:
+                words = []
             transcription = "hello world"
             result = STTInferenceResult(
                 transcription=transcription,
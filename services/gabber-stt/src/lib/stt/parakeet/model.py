@@ -49,8 +49,9 @@ class TranscriptionConfig:
     use_cer: bool = False
 
 
-def load_model():
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+def load_model(*, device_type: str = "cuda"):
+    use_cuda = device_type == "cuda" and torch.cuda.is_available()
+    device = torch.device("cuda" if use_cuda else "cpu")
     cfg = OmegaConf.structured(
         TranscriptionConfig(pretrained_name="nvidia/parakeet-tdt-0.6b-v3")
     )
@@ -69,7 +70,9 @@ def load_model():
 
     model.freeze()
     model = model.to(device)
-    model.to(torch.float16)
+    if use_cuda:
+        # half precision is only a win on GPU, CPU kernels are much slower in fp16
+        model.to(torch.float16)
 
     with open_dict(cfg.decoding):
         if (
@@ -4,12 +4,18 @@ import logging
 import threading
 import wave
 from dataclasses import dataclass
-from time import time
+from time import perf_counter, time
 from typing import Any, cast
 
 import numpy as np
 import torch
-from core import AudioInferenceInternalResult, AudioInferenceRequest
+from core import (
+    REGISTRY,
+    AudioInferenceInternalResult,
+    AudioInferenceRequest,
+    InferenceMode,
+    InferenceProfile,
+)
 from nemo.collections.asr.parts.submodules.transducer_decoding.label_looping_base import (
     BatchedLabelLoopingState,
     LabelLoopingStateItem,
@@ -25,11 +31,37 @@ from ..stt import STTInference, STTInferenceResult, STTInferenceResultWord
 from .model import CanaryModelInstance, load_model
 
 
+decode_histogram = REGISTRY.histogram(
+    "gabber_stt_parakeet_decode_seconds",
+    "Per-hypothesis time to turn decoder output into text, by inference mode",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05),
+)
+
+
 def make_divisible_by(num, factor: int) -> int:
     """Make num divisible by factor"""
     return int((num // factor) * factor)
 
 
+class TokenTextCache:
+    """Memoizes tokenizer.ids_to_text for single tokens.
+
+    Timestamps need every token's piece text, and the vocabulary is small
+    enough to keep them all.
+    """
+
+    def __init__(self, tokenizer):
+        self._tokenizer = tokenizer
+        self._tokens: dict[int, str] = {}
+
+    def token_text(self, id: int) -> str:
+        txt = self._tokens.get(id)
+        if txt is None:
+            txt = self._tokenizer.ids_to_text([id])
+            self._tokens[id] = txt
+        return txt
+
+
 # High level strategy comes from:
 # https://github.com/NVIDIA-NeMo/NeMo/blob/main/examples/asr/asr_chunked_inference/rnnt/speech_to_text_streaming_infer_rnnt.py
 class ParakeetSTTInference(STTInference):
@@ -38,10 +70,13 @@ class ParakeetSTTInference(STTInference):
         *,
         window_secs: float = 10.0,
         chunk_secs: float = 0.280,
+        profile: InferenceProfile = InferenceProfile(device="cuda"),
     ):
         self._window_sec = window_secs
         self._chunk_secs = chunk_secs
+        self._profile = profile
         self._model: CanaryModelInstance | None = None
+        self._text_cache: TokenTextCache | None = None
 
     @property
     def sample_rate(self) -> int:
@@ -64,7 +99,12 @@ class ParakeetSTTInference(STTInference):
         )
 
     def _initialize_model(self):
-        self._model = load_model()
+        if self._profile.intra_op_threads > 0:
+            torch.set_num_threads(self._profile.intra_op_threads)
+        if self._profile.inter_op_threads > 0:
+            torch.set_num_interop_threads(self._profile.inter_op_threads)
+        self._model = load_model(device_type=self._profile.device)
+        self._text_cache = TokenTextCache(self._model.encoder.tokenizer)
 
     async def initialize(self) -> None:
         init_thread = threading.Thread(target=self._initialize_model)
@@ -77,6 +117,7 @@ class ParakeetSTTInference(STTInference):
         self, input: AudioInferenceRequest
     ) -> list[AudioInferenceInternalResult[STTInferenceResult]]:
         assert self._model is not None
+        assert self._text_cache is not None
 
         if input.audio_batch.shape[1] != self.full_audio_size:
             raise ValueError(f"Invalid audio size: {input.audio_batch.shape[1]}")
@@ -86,6 +127,7 @@ class ParakeetSTTInference(STTInference):
             full_audio_size=self.full_audio_size,
             input=input,
             model=self._model,
+            text_cache=self._text_cache,
         )
 
         encode_res = batch.encode()
@@ -140,6 +182,7 @@ class ParakeetInferenceBatch:
         full_audio_size: int,
         input: AudioInferenceRequest,
         model: CanaryModelInstance,
+        text_cache: TokenTextCache,
     ):
         self._chunk_frames = int(chunk_size // model.encoder_frame_2_audio_samples)
         self._left_context_features = (
@@ -148,6 +191,7 @@ class ParakeetInferenceBatch:
         )
         self.model = model
         self.input = input
+        self._text_cache = text_cache
 
     def encode(self):
         prev_states: list[ParakeetSTTInferenceState | None] = []
@@ -242,55 +286,74 @@ class ParakeetInferenceBatch:
         result: list[DecodeResult] = []
         for i, h in enumerate(split_hypotheses):
             assert isinstance(h, Hypothesis)
-            txt = self.model.encoder.tokenizer.ids_to_text(h.y_sequence.tolist())
-            token_repetitions = [
-                len(self.model.encoder.tokenizer.ids_to_text([id]))
-                for id in h.y_sequence.tolist()
-            ]
-            h.text = (h.y_sequence, h.alignments, token_repetitions)  # type: ignore
-            h = self.model.encoder.decoding.compute_rnnt_timestamps(h)  # type: ignore
-            ts_res = process_timestamp_outputs(
-                h,
-                subsampling_factor=self.model.encoder.encoder.subsampling_factor,
-                window_stride=self.model.encoder.cfg["preprocessor"]["window_stride"],
-            )
-            words = [
-                DecodeWord(
-                    text=w["word"],
-                    start_offset=w["start_offset"],
-                    end_offset=w["end_offset"],
-                )
-                for w in ts_res[0].timestamp["word"]
-            ]
-            segments = [
-                DecodeSegment(
-                    start_offset=s["start_offset"],
-                    end_offset=s["end_offset"],
-                    segment=s["segment"],
-                )
-                for s in ts_res[0].timestamp["segment"]
-            ]
-            characters = [
-                DecodeCharacter(
-                    text=c["char"],
-                    start_offset=c["start_offset"],
-                    end_offset=c["end_offset"],
-                )
-                for c in ts_res[0].timestamp["char"]
-            ]
-            result.append(
-                DecodeResult(
-                    transcription=h.text,
-                    words=words,
-                    characters=characters,
-                    segments=segments,
-                    decode_state=split_states[i],
-                    hyp=h,
-                )
-            )
+            decode_start = perf_counter()
+            mode = self.input.mode(i)
+            if mode == InferenceMode.TEXT_ONLY:
+                # Interims only need the text, skip timestamp alignment
+                decoded = self._decode_text(h)
+            else:
+                decoded = self._decode_with_timestamps(h)
+            decode_histogram.observe(perf_counter() - decode_start, mode=mode.value)
+            decoded.decode_state = split_states[i]
+            result.append(decoded)
 
         return result
 
+    def _decode_text(self, h: Hypothesis) -> "DecodeResult":
+        txt = self.model.encoder.tokenizer.ids_to_text(h.y_sequence.tolist())
+        h.text = txt
+        return DecodeResult(
+            transcription=txt,
+            words=[],
+            characters=[],
+            segments=[],
+            decode_state=None,
+            hyp=h,
+        )
+
+    def _decode_with_timestamps(self, h: Hypothesis) -> "DecodeResult":
+        ids = h.y_sequence.tolist()
+        token_repetitions = [len(self._text_cache.token_text(id)) for id in ids]
+        h.text = (h.y_sequence, h.alignments, token_repetitions)  # type: ignore
+        h = self.model.encoder.decoding.compute_rnnt_timestamps(h)  # type: ignore
+        ts_res = process_timestamp_outputs(
+            h,
+            subsampling_factor=self.model.encoder.encoder.subsampling_factor,
+            window_stride=self.model.encoder.cfg["preprocessor"]["window_stride"],
+        )
+        words = [
+            DecodeWord(
+                text=w["word"],
+                start_offset=w["start_offset"],
+                end_offset=w["end_offset"],
+            )
+            for w in ts_res[0].timestamp["word"]
+        ]
+        segments = [
+            DecodeSegment(
+                start_offset=s["start_offset"],
+                end_offset=s["end_offset"],
+                segment=s["segment"],
+            )
+            for s in ts_res[0].timestamp["segment"]
+        ]
+        characters = [
+            DecodeCharacter(
+                text=c["char"],
+                start_offset=c["start_offset"],
+                end_offset=c["end_offset"],
+            )
+            for c in ts_res[0].timestamp["char"]
+        ]
+        return DecodeResult(
+            transcription=h.text,
+            words=words,
+            characters=characters,
+            segments=segments,
+            decode_state=None,
+            hyp=h,
+        )
+
 
 @dataclass
 class InternalEncodeResult:
@@ -326,7 +389,7 @@ class DecodeResult:
     words: list[DecodeWord]
     characters: list[DecodeCharacter]
     segments: list[DecodeSegment]
-    decode_state: LabelLoopingStateItem
+    decode_state: LabelLoopingStateItem | None
     hyp: Hypothesis
 
 
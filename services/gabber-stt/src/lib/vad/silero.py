@@ -9,7 +9,13 @@ import threading
 import numpy as np
 import onnxruntime
 from .vad import VADInference
-from core import AudioInferenceRequest, AudioInferenceInternalResult
+from core import (
+    AudioInferenceRequest,
+    AudioInferenceInternalResult,
+    InferenceProfile,
+    create_onnx_session,
+    prepare_profile,
+)
 
 SUPPORTED_SAMPLE_RATE = 16000
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -17,6 +23,7 @@ DEFAULT_WEIGHTS_PATH = os.path.join("weights", "silero_vad.onnx")
 
 CONTEXT_SIZE = 64
 VAD_CHUNK_SIZE = 512
+STATE_SIZE = 128
 
 
 onnxruntime.set_default_logger_severity(3)
@@ -25,25 +32,37 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+DEFAULT_PROFILE = InferenceProfile(device="cpu", intra_op_threads=4)
+
+
 class SileroVADInference(VADInference):
-    def __init__(self, *, model_path: str = DEFAULT_WEIGHTS_PATH):
+    def __init__(
+        self,
+        *,
+        model_path: str = DEFAULT_WEIGHTS_PATH,
+        profile: InferenceProfile = DEFAULT_PROFILE,
+    ):
         logger.info(f"Initializing VAD engine with model: {model_path}")
         self._model_path = model_path
+        self._profile = profile
         self._onnx_session: onnxruntime.InferenceSession | None = None
 
-    def _initialize_onnx(self):
-        opts = onnxruntime.SessionOptions()
-        opts.add_session_config_entry("session.intra_op.allow_spinning", "0")
-        opts.add_session_config_entry("session.inter_op.allow_spinning", "0")
-        opts.intra_op_num_threads = 4
-        opts.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
-        self._reset_states()
-
-        self._onnx_session = onnxruntime.InferenceSession(
-            self._model_path,
-            providers=["CPUExecutionProvider"],
-            sess_options=opts,
+    def _sample_feed(self) -> dict:
+        return {
+            "input": np.zeros((1, VAD_CHUNK_SIZE), dtype=np.float32),
+            "state": np.zeros((2, 1, STATE_SIZE), dtype=np.float32),
+            "sr": np.array(SUPPORTED_SAMPLE_RATE, dtype=np.int64),
+        }
+
+    def prepare_profile(self) -> InferenceProfile:
+        self._profile = prepare_profile(
+            self._model_path, self._profile, self._sample_feed
         )
+        return self._profile
+
+    def _initialize_onnx(self):
+        self.prepare_profile()
+        self._onnx_session = create_onnx_session(self._model_path, self._profile)
 
     async def initialize(self) -> None:
         init_thread = threading.Thread(target=self._initialize_onnx)
@@ -78,9 +97,13 @@ class SileroVADInference(VADInference):
                 f"Invalid audio chunk size: {audio_chunks.shape[1]}, expected {VAD_CHUNK_SIZE}"
             )
 
+        # Recurrent state is carried per stream in prev_states, never shared
+        # between the rows of a batch.
         batch_size = audio_chunks.shape[0]
-        if self._state.shape[1] != batch_size:
-            self._reset_states(batch_size=batch_size)
+        state = np.zeros((2, batch_size, STATE_SIZE), dtype=np.float32)
+        for i, prev_state in enumerate(input.prev_states[:batch_size]):
+            if prev_state is not None:
+                state[:, i, :] = prev_state
 
         audio_batch = audio_chunks.astype(np.float32) / 32768.0
 
@@ -88,18 +111,18 @@ class SileroVADInference(VADInference):
 
         ort_inputs = {
             "input": audio_batch,
-            "state": self._state,
+            "state": state,
             "sr": sr_input,
         }
 
         ort_outputs = self._onnx_session.run(None, ort_inputs)
-        out, _ = ort_outputs
+        out, new_state = ort_outputs
         out_np = np.array(out)
+        new_state_np = np.array(new_state, dtype=np.float32)
         vad_scores = out_np[:, 0].astype(np.float32)
         return [
-            AudioInferenceInternalResult(result=score, state=None)
-            for score in vad_scores
+            AudioInferenceInternalResult(
+                result=float(score), state=new_state_np[:, i, :].copy()
+            )
+            for i, score in enumerate(vad_scores)
         ]
-
-    def _reset_states(self, *, batch_size: int = 1):
-        self._state = np.zeros((2, batch_size, 128), dtype=np.float32)
@@ -0,0 +1,239 @@
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+import wave
+
+import aiohttp
+import numpy as np
+
+CHUNK_SECS = 0.02
+MAIN_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+class LoadTestClient:
+    def __init__(self, *, url: str, audio: bytes, sample_rate: int):
+        self._url = url
+        self._audio = audio
+        self._sample_rate = sample_rate
+        self.lags: list[float] = []
+        self.finals = 0
+        self.rejected = False
+        self.degraded_count = 0
+
+    async def run(self, duration_s: float):
+        session_id = str(uuid.uuid4())
+        async with aiohttp.ClientSession() as http:
+            async with http.ws_connect(self._url) as ws:
+                await ws.send_json(
+                    {
+                        "session_id": session_id,
+                        "payload": {
+                            "type": "start_session",
+                            "sample_rate": self._sample_rate,
+                        },
+                    }
+                )
+                start = time.monotonic()
+                recv_t = asyncio.create_task(self._recv(ws, start))
+                try:
+                    await self._send(ws, session_id, start, duration_s)
+                except ConnectionResetError:
+                    if not self.rejected:
+                        raise
+                finally:
+                    recv_t.cancel()
+
+    async def _send(
+        self,
+        ws: aiohttp.ClientWebSocketResponse,
+        session_id: str,
+        start: float,
+        duration_s: float,
+    ):
+        chunk_bytes = int(self._sample_rate * CHUNK_SECS) * 2
+        offset = 0
+        sent = 0
+        while time.monotonic() - start < duration_s and not self.rejected:
+            chunk = self._audio[offset : offset + chunk_bytes]
+            offset += chunk_bytes
+            if offset >= len(self._audio):
+                offset = 0
+            await ws.send_json(
+                {
+                    "session_id": session_id,
+                    "payload": {
+                        "type": "audio",
+                        "b64_data": base64.b64encode(chunk).decode("utf-8"),
+                    },
+                }
+            )
+            sent += 1
+            # Pace against the absolute schedule so send jitter does not accumulate
+            await asyncio.sleep(max(0, start + sent * CHUNK_SECS - time.monotonic()))
+
+    async def _recv(self, ws: aiohttp.ClientWebSocketResponse, start: float):
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                continue
+            payload = json.loads(msg.data)["payload"]
+            if payload["type"] in ("interim_transcription", "final_transcription"):
+                audio_time = payload["end_sample"] / self._sample_rate
+                self.lags.append(time.monotonic() - start - audio_time)
+            if payload["type"] == "final_transcription":
+                self.finals += 1
+            elif payload["type"] == "degraded" and payload["degraded"]:
+                self.degraded_count += 1
+            elif payload["type"] == "overloaded":
+                self.rejected = True
+                await ws.close()
+                return
+
+
+async def run_level(
+    *, url: str, audio: bytes, sample_rate: int, sessions: int, duration_s: float
+) -> dict:
+    clients = [
+        LoadTestClient(url=url, audio=audio, sample_rate=sample_rate)
+        for _ in range(sessions)
+    ]
+    results = await asyncio.gather(
+        *(c.run(duration_s) for c in clients), return_exceptions=True
+    )
+    errors = sum(1 for r in results if isinstance(r, Exception))
+    lags = np.array([lag for c in clients for lag in c.lags])
+    if lags.shape[0] == 0:
+        lags = np.array([float("nan")])
+    return {
+        "sessions": sessions,
+        "errors": errors,
+        "finals": sum(c.finals for c in clients),
+        "lag_p50_s": float(np.percentile(lags, 50)),
+        "lag_p95_s": float(np.percentile(lags, 95)),
+    }
+
+
+async def max_sustained(args, url: str, audio: bytes, sample_rate: int) -> int:
+    """Ramp through the levels and return the last one within the lag target."""
+    sustained = 0
+    for level in [int(v) for v in args.levels.split(",")]:
+        res = await run_level(
+            url=url,
+            audio=audio,
+            sample_rate=sample_rate,
+            sessions=level,
+            duration_s=args.duration,
+        )
+        print(json.dumps(res))
+        if res["errors"] > 0 or not res["lag_p95_s"] <= args.max_lag:
+            break
+        sustained = level
+    return sustained
+
+
+async def wait_ready(metrics_urls: list[str], timeout_s: float):
+    """Wait until every worker serves its metrics, which it does only once its
+    models are loaded. Until then the shared port would send every session to
+    the first worker that came up."""
+    deadline = time.monotonic() + timeout_s
+    async with aiohttp.ClientSession() as http:
+        for url in metrics_urls:
+            while True:
+                try:
+                    async with http.get(url) as res:
+                        if res.status == 200:
+                            break
+                except aiohttp.ClientError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Server not ready: {url}")
+                await asyncio.sleep(1.0)
+
+
+async def sweep_workers(args, audio: bytes, sample_rate: int):
+    """Start the server with each worker count in turn and find the sessions
+    it sustains, so scaling across workers is measured rather than assumed."""
+    results: list[dict] = []
+    for workers in [int(v) for v in args.workers.split(",")]:
+        cmd = [sys.executable, MAIN_PY, "--port", str(args.port)]
+        metrics_urls = [f"http://127.0.0.1:{args.port}/metrics"]
+        if workers > 1:
+            cmd += ["--workers", str(workers), "--metrics-port", str(args.metrics_port)]
+            metrics_urls = [
+                f"http://127.0.0.1:{args.metrics_port + i}/metrics"
+                for i in range(workers)
+            ]
+        server = await asyncio.create_subprocess_exec(*cmd)
+        try:
+            await wait_ready(metrics_urls, args.startup_timeout)
+            sustained = await max_sustained(
+                args, f"ws://127.0.0.1:{args.port}", audio, sample_rate
+            )
+        finally:
+            server.terminate()
+            await server.wait()
+
+        base = results[0]["max_sustained_sessions"] if results else sustained
+        base_workers = results[0]["workers"] if results else workers
+        res = {
+            "workers": workers,
+            "max_sustained_sessions": sustained,
+            "sessions_per_worker": sustained / workers,
+            "sessions_per_core": sustained / args.cores,
+            # Sustained sessions relative to linear scaling from the first count
+            "scaling_efficiency": (
+                sustained / (base * workers / base_workers) if base > 0 else None
+            ),
+        }
+        results.append(res)
+        print(json.dumps(res))
+
+    print(json.dumps({"cores": args.cores, "sweep": results}))
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("wav", help="16-bit mono speech file, looped per session")
+    parser.add_argument("--url", default="ws://127.0.0.1:7004")
+    parser.add_argument("--levels", default="1,2,4,8,16,32,64,128")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--max-lag", type=float, default=1.0)
+    parser.add_argument("--cores", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--workers",
+        help="Comma separated worker counts. Starts the server for each count"
+        " instead of testing the one at --url",
+    )
+    parser.add_argument("--port", type=int, default=7014)
+    parser.add_argument("--metrics-port", type=int, default=7114)
+    parser.add_argument("--startup-timeout", type=float, default=600.0)
+    args = parser.parse_args()
+
+    with wave.open(args.wav, "rb") as wf:
+        sample_rate = wf.getframerate()
+        audio = wf.readframes(wf.getnframes())
+
+    if args.workers:
+        await sweep_workers(args, audio, sample_rate)
+        return
+
+    sustained = await max_sustained(args, args.url, audio, sample_rate)
+    print(
+        json.dumps(
+            {
+                "max_sustained_sessions": sustained,
+                "cores": args.cores,
+                "sessions_per_core": sustained / args.cores,
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
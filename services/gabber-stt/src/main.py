@@ -1,22 +1,80 @@
+import argparse
 import asyncio
 import logging
+import os
+import socket
+from multiprocessing.connection import Connection
 
+from core import InferenceProfile
 from engine import Engine, EngineSettings
 from lib import eot, stt, vad, lipsync
-from server import WebSocketServer, messages
+from server import (
+    AdmissionController,
+    AdmissionSettings,
+    Supervisor,
+    WebSocketServer,
+    WorkerReporter,
+    messages,
+)
 
+REPORT_INTERVAL_S = 1.0
 
-async def main():
-    eot_engine = eot.EndOfTurnEngine(inference_impl=eot.pipecat.PipeCatEOTInference())
-    vad_engine = vad.VADInferenceEngine(inference_impl=vad.silero.SileroVADInference())
+
+def load_profiles() -> dict[str, InferenceProfile]:
+    # Per-model profiles can be overridden with GABBER_STT_<MODEL>_* env vars,
+    # e.g. GABBER_STT_EOT_DEVICE=cpu GABBER_STT_EOT_AUTO_TUNE_THREADS=1
+    return {
+        "eot": InferenceProfile.from_env("eot", eot.pipecat.DEFAULT_PROFILE),
+        "vad": InferenceProfile.from_env("vad", vad.silero.DEFAULT_PROFILE),
+        "stt": InferenceProfile.from_env("stt", InferenceProfile(device="cuda")),
+        "lipsync": InferenceProfile.from_env(
+            "lipsync", lipsync.openlipsync.DEFAULT_PROFILE
+        ),
+    }
+
+
+def prepare_profiles(
+    profiles: dict[str, InferenceProfile],
+) -> dict[str, InferenceProfile]:
+    """Quantize and tune the ONNX models once, before any worker starts."""
+    return {
+        **profiles,
+        "eot": eot.pipecat.PipeCatEOTInference(
+            profile=profiles["eot"]
+        ).prepare_profile(),
+        "vad": vad.silero.SileroVADInference(profile=profiles["vad"]).prepare_profile(),
+        "lipsync": lipsync.OpenLipSyncInference(
+            profile=profiles["lipsync"]
+        ).prepare_profile(),
+    }
+
+
+async def main(
+    *,
+    port: int = 7004,
+    uds: str | socket.socket | None = None,
+    reporter: WorkerReporter | None = None,
+    metrics_port: int | None = None,
+    profiles: dict[str, InferenceProfile] | None = None,
+):
+    if profiles is None:
+        profiles = load_profiles()
+
+    eot_engine = eot.EndOfTurnEngine(
+        inference_impl=eot.pipecat.PipeCatEOTInference(profile=profiles["eot"])
+    )
+    vad_engine = vad.VADInferenceEngine(
+        inference_impl=vad.silero.SileroVADInference(profile=profiles["vad"])
+    )
     stt_engine = stt.STTInferenceEngine(
         inference_impl=stt.parakeet.ParakeetSTTInference(
             window_secs=120.0,  # There is a bug I can't find with the RNN continuation logic so for now we will just use a long window which is fine in practice for realtime conversational use cases.
+            profile=profiles["stt"],
         )
         # inference_impl=stt.mock.MockSTTInference(window_secs=20.0),
     )
     lipsync_engine = lipsync.LipSyncInferenceEngine(
-        inference_impl=lipsync.OpenLipSyncInference()
+        inference_impl=lipsync.OpenLipSyncInference(profile=profiles["lipsync"])
     )
 
     await stt_engine.initialize()
@@ -28,6 +86,7 @@ async def main():
         settings = EngineSettings()
         settings.lipsync_enabled = request.lipsync_enabled
         settings.stt_enabled = request.stt_enabled
+        settings.trace_dir = os.environ.get("GABBER_STT_TRACE_DIR")
         return Engine(
             input_sample_rate=request.sample_rate,
             eot=eot_engine,
@@ -37,10 +96,124 @@ async def main():
             settings=settings,
         )
 
-    server = WebSocketServer(engine_factory=engine_factory)
-    await server.run()
+    engines = [stt_engine, vad_engine, eot_engine, lipsync_engine]
+    admission = AdmissionController(
+        settings=AdmissionSettings(
+            max_sessions=int(os.environ.get("GABBER_STT_MAX_SESSIONS", "0")),
+            max_utilization=float(os.environ.get("GABBER_STT_MAX_UTILIZATION", "0.9")),
+        ),
+        utilization=lambda: max(e.batcher.utilization for e in engines),
+    )
+    server = WebSocketServer(
+        engine_factory=engine_factory,
+        admission=admission,
+        serve_metrics=reporter is None,
+    )
+    if reporter is None:
+        await server.run(port=port, uds=uds)
+        return
+
+    async def report_task():
+        while True:
+            reporter.report(
+                sessions=server.session_count,
+                queue_depth=sum(e.batcher.queue_depth for e in engines),
+            )
+            await asyncio.sleep(REPORT_INTERVAL_S)
+
+    report_t = asyncio.create_task(report_task())
+    try:
+        await server.run(port=port, reuse_port=True, uds=uds, metrics_port=metrics_port)
+    finally:
+        report_t.cancel()
+
+
+def worker_main(
+    worker_id: int,
+    conn: Connection,
+    port: int,
+    uds: socket.socket | None,
+    metrics_port: int,
+    profiles: dict[str, InferenceProfile],
+):
+    logging.basicConfig(level=logging.INFO)
+    reporter = WorkerReporter(worker_id=worker_id, conn=conn)
+    asyncio.run(
+        main(
+            port=port,
+            uds=uds,
+            reporter=reporter,
+            metrics_port=metrics_port + worker_id,
+            profiles=profiles,
+        )
+    )
+
+
+class _WorkerTarget:
+    def __init__(
+        self,
+        port: int,
+        uds: socket.socket | None,
+        metrics_port: int,
+        profiles: dict[str, InferenceProfile],
+    ):
+        self._port = port
+        # Pickled into each worker as a duplicate of the parent's listener
+        self._uds = uds
+        self._metrics_port = metrics_port
+        self._profiles = profiles
+
+    def __call__(self, worker_id: int, conn: Connection):
+        worker_main(
+            worker_id,
+            conn,
+            self._port,
+            self._uds,
+            self._metrics_port,
+            self._profiles,
+        )
+
+
+def listen_unix(path: str) -> socket.socket:
+    """Bind a unix socket in the supervisor so every worker accepts on it."""
+    if os.path.exists(path):
+        os.unlink(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    sock.listen(128)
+    return sock
 
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    asyncio.run(main())
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=7004)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("GABBER_STT_WORKERS", "1")),
+        help="Number of worker processes sharing the port via SO_REUSEPORT",
+    )
+    parser.add_argument(
+        "--uds",
+        default=os.environ.get("GABBER_STT_UDS"),
+        help="Also serve on this unix socket path, enables shared-memory audio",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=int(os.environ.get("GABBER_STT_METRICS_PORT", "7104")),
+        help="With --workers, worker i serves /metrics on this port + i",
+    )
+    args = parser.parse_args()
+    if args.workers <= 1:
+        asyncio.run(main(port=args.port, uds=args.uds))
+    else:
+        # Workers share the quantized models and tuned thread counts instead
+        # of racing on the cache files and tuning against each other's load.
+        profiles = prepare_profiles(load_profiles())
+        uds_sock = listen_unix(args.uds) if args.uds else None
+        Supervisor(
+            num_workers=args.workers,
+            target=_WorkerTarget(args.port, uds_sock, args.metrics_port, profiles),
+        ).run()
@@ -0,0 +1,359 @@
+"""Replay a corpus of WAV files through the engine and report latency/accuracy.
+
+Each `<name>.wav` (16-bit mono) in the corpus directory is one user turn and
+may have a `<name>.txt` reference transcript next to it. Results are printed
+as JSON so they can be diffed between commits.
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import logging
+import os
+import re
+import time
+import wave
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+from engine import (
+    Engine,
+    EngineEvent,
+    EngineSettings,
+    STTEvent_FinalTranscription,
+    STTEvent_InterimTranscription,
+    STTEvent_SpeakingStarted,
+)
+from lib import eot, lipsync, stt, vad
+
+CHUNK_SECS = 0.02
+TRAILING_SILENCE_SECS = 3.0
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_words(text: str) -> list[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_errors(reference: list[str], hypothesis: list[str]) -> int:
+    prev = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, start=1):
+        cur = [i] + [0] * len(hypothesis)
+        for j, hyp_word in enumerate(hypothesis, start=1):
+            cur[j] = min(
+                prev[j] + 1,
+                cur[j - 1] + 1,
+                prev[j - 1] + (ref_word != hyp_word),
+            )
+        prev = cur
+    return prev[-1]
+
+
+@dataclass
+class UtteranceResult:
+    name: str
+    audio_s: float
+    reference: str | None
+    hypothesis: str = ""
+    word_errors: int = 0
+    reference_words: int = 0
+    finals: int = 0
+    interims: int = 0
+    first_interim_latency_s: float | None = None
+    final_latency_s: float | None = None
+
+
+@dataclass
+class _ReplayStream:
+    sample_rate: int
+    push_times: list[float] = field(default_factory=list)
+    push_cursors: list[int] = field(default_factory=list)
+    speaking_started: dict[int, int] = field(default_factory=dict)
+    first_interims: dict[int, float] = field(default_factory=dict)
+    interims: int = 0
+    finals: list[tuple[float, STTEvent_FinalTranscription]] = field(
+        default_factory=list
+    )
+
+    def pushed_at(self, sample: int) -> float | None:
+        idx = bisect.bisect_left(self.push_cursors, sample)
+        if idx >= len(self.push_times):
+            return None
+        return self.push_times[idx]
+
+    def on_event(self, evt: EngineEvent):
+        now = time.monotonic()
+        if isinstance(evt, STTEvent_SpeakingStarted):
+            self.speaking_started.setdefault(evt.trans_id, evt.start_sample)
+        elif isinstance(evt, STTEvent_InterimTranscription):
+            self.speaking_started.setdefault(evt.trans_id, evt.start_sample)
+            self.first_interims.setdefault(evt.trans_id, now)
+            self.interims += 1
+        elif isinstance(evt, STTEvent_FinalTranscription):
+            self.finals.append((now, evt))
+
+
+class Replayer:
+    def __init__(
+        self,
+        *,
+        eot_engine: eot.EndOfTurnEngine,
+        vad_engine: vad.VADInferenceEngine,
+        stt_engine: stt.STTInferenceEngine,
+        lipsync_engine: lipsync.LipSyncInferenceEngine,
+        speed: float,
+        adaptive_interims: bool = True,
+        reuse_final_hypothesis: bool = True,
+    ):
+        self._adaptive_interims = adaptive_interims
+        self._reuse_final_hypothesis = reuse_final_hypothesis
+        self._eot = eot_engine
+        self._vad = vad_engine
+        self._stt = stt_engine
+        self._lipsync = lipsync_engine
+        self._speed = speed
+
+    async def replay(
+        self, *, name: str, audio: bytes, sample_rate: int, reference: str | None
+    ) -> UtteranceResult:
+        engine = Engine(
+            input_sample_rate=sample_rate,
+            eot=self._eot,
+            vad=self._vad,
+            stt=self._stt,
+            lipsync=self._lipsync,
+            settings=EngineSettings(
+                adaptive_interims=self._adaptive_interims,
+                reuse_final_hypothesis=self._reuse_final_hypothesis,
+            ),
+        )
+        stream = _ReplayStream(sample_rate=sample_rate)
+        engine.set_event_handler(stream.on_event)
+        engine_t = asyncio.create_task(engine.run())
+
+        samples = np.frombuffer(audio, dtype=np.int16)
+        silence = np.zeros(int(TRAILING_SILENCE_SECS * sample_rate), dtype=np.int16)
+        samples = np.concatenate((samples, silence))
+        chunk = int(CHUNK_SECS * sample_rate)
+        start = time.monotonic()
+        try:
+            for i, offset in enumerate(range(0, samples.shape[0], chunk)):
+                engine.push_audio(samples[offset : offset + chunk].tobytes())
+                stream.push_times.append(time.monotonic())
+                stream.push_cursors.append(min(offset + chunk, samples.shape[0]))
+                deadline = start + (i + 1) * CHUNK_SECS / self._speed
+                await asyncio.sleep(max(0, deadline - time.monotonic()))
+
+            # Give the engine time to finalize anything still in flight
+            wait_until = time.monotonic() + TRAILING_SILENCE_SECS
+            while time.monotonic() < wait_until:
+                if engine.stt_state.name == "NotTalking":
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            engine_t.cancel()
+            try:
+                await engine_t
+            except asyncio.CancelledError:
+                pass
+
+        return self._score(name, samples.shape[0] - silence.shape[0], stream, reference)
+
+    def _score(
+        self,
+        name: str,
+        num_samples: int,
+        stream: _ReplayStream,
+        reference: str | None,
+    ) -> UtteranceResult:
+        res = UtteranceResult(
+            name=name,
+            audio_s=num_samples / stream.sample_rate,
+            reference=reference,
+            finals=len(stream.finals),
+            interims=stream.interims,
+        )
+        res.hypothesis = " ".join(evt.transcription for _, evt in stream.finals)
+        if reference is not None:
+            ref_words = normalize_words(reference)
+            res.reference_words = len(ref_words)
+            res.word_errors = word_errors(ref_words, normalize_words(res.hypothesis))
+
+        for trans_id, received in stream.first_interims.items():
+            pushed = stream.pushed_at(stream.speaking_started[trans_id])
+            if pushed is not None:
+                res.first_interim_latency_s = received - pushed
+                break
+
+        if len(stream.finals) > 0:
+            received, final = stream.finals[-1]
+            pushed = stream.pushed_at(final.end_sample)
+            if pushed is not None:
+                res.final_latency_s = received - pushed
+
+        return res
+
+
+def load_corpus(corpus_dir: str) -> list[tuple[str, bytes, int, str | None]]:
+    corpus: list[tuple[str, bytes, int, str | None]] = []
+    for fname in sorted(os.listdir(corpus_dir)):
+        if not fname.endswith(".wav"):
+            continue
+        name = fname[: -len(".wav")]
+        with wave.open(os.path.join(corpus_dir, fname), "rb") as wf:
+            if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                raise ValueError(f"{fname}: expected 16-bit mono audio")
+            sample_rate = wf.getframerate()
+            audio = wf.readframes(wf.getnframes())
+
+        reference: str | None = None
+        ref_path = os.path.join(corpus_dir, f"{name}.txt")
+        if os.path.exists(ref_path):
+            with open(ref_path) as f:
+                reference = f.read().strip()
+        corpus.append((name, audio, sample_rate, reference))
+    return corpus
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    if len(values) == 0:
+        return None
+    return float(np.percentile(values, q))
+
+
+def summarize(
+    results: list[UtteranceResult], *, cpu_s: float, wall_s: float, concurrency: int
+) -> dict:
+    ref_words = sum(r.reference_words for r in results if r.reference is not None)
+    errors = sum(r.word_errors for r in results if r.reference is not None)
+    finals = sum(r.finals for r in results)
+    extra_finals = sum(max(0, r.finals - 1) for r in results)
+    first_interim = [
+        r.first_interim_latency_s
+        for r in results
+        if r.first_interim_latency_s is not None
+    ]
+    final = [r.final_latency_s for r in results if r.final_latency_s is not None]
+    audio_s = sum(r.audio_s for r in results)
+    return {
+        "files": len(results),
+        "audio_s": audio_s,
+        "wer": errors / ref_words if ref_words > 0 else None,
+        "first_interim_latency_p50_s": percentile(first_interim, 50),
+        "first_interim_latency_p95_s": percentile(first_interim, 95),
+        "final_latency_p50_s": percentile(final, 50),
+        "final_latency_p95_s": percentile(final, 95),
+        # Every file is one turn, so any final beyond the first is a premature EOT
+        "eot_false_positive_rate": extra_finals / finals if finals > 0 else None,
+        "missed_finals": sum(1 for r in results if r.finals == 0),
+        "interims_per_audio_s": (
+            sum(r.interims for r in results) / audio_s if audio_s > 0 else None
+        ),
+        "final_latency_stddev_s": float(np.std(final)) if final else None,
+        "cpu_s_per_audio_s": cpu_s / audio_s if audio_s > 0 else None,
+        "cpu_cores_per_stream": cpu_s / wall_s / concurrency if wall_s > 0 else None,
+    }
+
+
+async def create_stt_engine(stt_impl: str) -> stt.STTInferenceEngine:
+    if stt_impl in ("auto", "parakeet") and stt.parakeet is not None:
+        engine = stt.STTInferenceEngine(
+            inference_impl=stt.parakeet.ParakeetSTTInference(window_secs=120.0)
+        )
+        try:
+            await engine.initialize()
+            return engine
+        except Exception:
+            if stt_impl == "parakeet":
+                raise
+            logger.warning("Parakeet unavailable, falling back to mock STT")
+    elif stt_impl == "parakeet":
+        raise RuntimeError("Parakeet dependencies are not installed")
+
+    engine = stt.STTInferenceEngine(
+        inference_impl=stt.mock.MockSTTInference(window_secs=20.0)
+    )
+    await engine.initialize()
+    return engine
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("corpus", help="Directory of <name>.wav and <name>.txt")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="Replay speed, 1.0 is real-time"
+    )
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--stt", choices=["auto", "parakeet", "mock"], default="auto")
+    parser.add_argument(
+        "--no-adaptive-interims",
+        action="store_true",
+        help="Keep the native interim cadence regardless of load",
+    )
+    parser.add_argument(
+        "--no-final-reuse",
+        action="store_true",
+        help="Always re-transcribe the utterance on finalization",
+    )
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    eot_engine = eot.EndOfTurnEngine(inference_impl=eot.pipecat.PipeCatEOTInference())
+    vad_engine = vad.VADInferenceEngine(inference_impl=vad.silero.SileroVADInference())
+    lipsync_engine = lipsync.LipSyncInferenceEngine(
+        inference_impl=lipsync.OpenLipSyncInference()
+    )
+    stt_engine = await create_stt_engine(args.stt)
+    await eot_engine.initialize()
+    await vad_engine.initialize()
+
+    replayer = Replayer(
+        eot_engine=eot_engine,
+        vad_engine=vad_engine,
+        stt_engine=stt_engine,
+        lipsync_engine=lipsync_engine,
+        speed=args.speed,
+        adaptive_interims=not args.no_adaptive_interims,
+        reuse_final_hypothesis=not args.no_final_reuse,
+    )
+    corpus = load_corpus(args.corpus)
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def replay_one(item: tuple[str, bytes, int, str | None]):
+        name, audio, sample_rate, reference = item
+        async with sem:
+            return await replayer.replay(
+                name=name, audio=audio, sample_rate=sample_rate, reference=reference
+            )
+
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    results = await asyncio.gather(*(replay_one(item) for item in corpus))
+    report = {
+        "stt": type(stt_engine.inference_impl).__name__,
+        "speed": args.speed,
+        "concurrency": args.concurrency,
+        "adaptive_interims": not args.no_adaptive_interims,
+        "final_reuse": not args.no_final_reuse,
+        "summary": summarize(
+            results,
+            cpu_s=time.process_time() - cpu_start,
+            wall_s=time.monotonic() - wall_start,
+            concurrency=args.concurrency,
+        ),
+        "files": [asdict(r) for r in results],
+    }
+
+    out = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(out)
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main())
@@ -1,3 +1,12 @@
 from .websocket_server import WebSocketServer
+from .admission import AdmissionController, AdmissionSettings
+from .supervisor import Supervisor, WorkerReporter, WorkerStatus
 
-__all__ = ["WebSocketServer"]
+__all__ = [
+    "WebSocketServer",
+    "AdmissionController",
+    "AdmissionSettings",
+    "Supervisor",
+    "WorkerReporter",
+    "WorkerStatus",
+]
@@ -0,0 +1,85 @@
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+from core import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+admitted_counter = REGISTRY.counter(
+    "gabber_stt_sessions_admitted_total", "Sessions accepted by admission control"
+)
+rejected_counter = REGISTRY.counter(
+    "gabber_stt_sessions_rejected_total", "Sessions rejected by admission control"
+)
+degraded_counter = REGISTRY.counter(
+    "gabber_stt_sessions_degraded_total", "Times a session fell behind real-time"
+)
+dropped_counter = REGISTRY.counter(
+    "gabber_stt_sessions_dropped_total", "Sessions ended for exceeding max lag"
+)
+
+
+@dataclass
+class AdmissionSettings:
+    # 0 disables the cap
+    max_sessions: int = 0
+    # Reject new sessions once the busiest batcher is at least this utilized
+    max_utilization: float = 0.9
+    # Audio lag at which a session is told it is degraded
+    degraded_lag_s: float = 1.0
+    # Lag below which a degraded session is considered recovered
+    recovered_lag_s: float = 0.5
+    # Lag at which a session is ended as overloaded
+    max_lag_s: float = 5.0
+
+
+class AdmissionController:
+    """Decides whether the server has capacity for another session.
+
+    Capacity is bounded by a configurable session cap and by the measured
+    utilization of the inference batchers, which is where overload shows up
+    first since every session shares them.
+    """
+
+    def __init__(
+        self,
+        *,
+        settings: AdmissionSettings,
+        utilization: Callable[[], float] = lambda: 0.0,
+    ):
+        self.settings = settings
+        self._utilization = utilization
+        self._sessions = 0
+
+    @property
+    def sessions(self) -> int:
+        return self._sessions
+
+    @property
+    def utilization(self) -> float:
+        return self._utilization()
+
+    def try_admit(self) -> str | None:
+        """Reserve a slot for a new session, returning the rejection reason if
+        there is no capacity."""
+        reason: str | None = None
+        if (
+            self.settings.max_sessions > 0
+            and self._sessions >= self.settings.max_sessions
+        ):
+            reason = f"session limit reached ({self.settings.max_sessions})"
+        elif self.utilization >= self.settings.max_utilization:
+            reason = f"inference utilization at {self.utilization:.0%}"
+
+        if reason is not None:
+            rejected_counter.inc()
+            logger.warning(f"Rejecting session: {reason}")
+            return reason
+
+        self._sessions += 1
+        admitted_counter.inc()
+        return None
+
+    def release(self):
+        self._sessions = max(0, self._sessions - 1)
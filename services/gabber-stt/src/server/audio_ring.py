@@ -0,0 +1,96 @@
+# Kept in sync with engine/gabber/lib/stt/gabber/audio_ring.py
+
+import uuid
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+# Header holds the reader's cursor so the writer knows how much space is free
+HEADER_BYTES = 64
+SAMPLE_BYTES = 2
+
+
+class AudioRingFull(Exception):
+    pass
+
+
+class AudioRing:
+    """Single-producer single-consumer int16 ring in shared memory.
+
+    Cursors count samples since the start of the stream. The writer sends
+    its end cursor over the control channel after each write, so the ring
+    itself only has to carry the reader's position back.
+    """
+
+    def __init__(self, shm: SharedMemory, capacity: int, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        self.capacity = capacity
+        self._read_cursor = np.ndarray((1,), dtype=np.uint64, buffer=shm.buf)
+        self._samples = np.ndarray(
+            (capacity,), dtype=np.int16, buffer=shm.buf, offset=HEADER_BYTES
+        )
+        self._write_cursor = int(self._read_cursor[0])
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @classmethod
+    def create(cls, capacity: int) -> "AudioRing":
+        shm = SharedMemory(
+            name=f"gabber_stt_{uuid.uuid4().hex[:16]}",
+            create=True,
+            size=HEADER_BYTES + capacity * SAMPLE_BYTES,
+        )
+        ring = cls(shm, capacity, owner=True)
+        ring._read_cursor[0] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> "AudioRing":
+        shm = SharedMemory(name=name, create=False)
+        # The creator owns the segment. Without this the resource tracker
+        # unlinks it when the attaching process exits.
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        if shm.size < HEADER_BYTES + capacity * SAMPLE_BYTES:
+            shm.close()
+            raise ValueError(f"Shared memory {name} is smaller than its capacity")
+        return cls(shm, capacity, owner=False)
+
+    def write(self, samples: np.typing.NDArray[np.int16]) -> int:
+        """Append samples and return the new end cursor."""
+        n = samples.shape[0]
+        if self._write_cursor + n - int(self._read_cursor[0]) > self.capacity:
+            raise AudioRingFull()
+
+        start = self._write_cursor % self.capacity
+        first = min(n, self.capacity - start)
+        self._samples[start : start + first] = samples[:first]
+        self._samples[: n - first] = samples[first:]
+        self._write_cursor += n
+        return self._write_cursor
+
+    def read(self, end_cursor: int) -> bytes:
+        """Consume samples up to end_cursor."""
+        cursor = int(self._read_cursor[0])
+        n = end_cursor - cursor
+        if n < 0 or n > self.capacity:
+            raise ValueError(f"Invalid ring cursor {end_cursor} (read at {cursor})")
+
+        start = cursor % self.capacity
+        first = min(n, self.capacity - start)
+        data = self._samples[start : start + first].tobytes()
+        if first < n:
+            data += self._samples[: n - first].tobytes()
+        self._read_cursor[0] = end_cursor
+        return data
+
+    def close(self):
+        # Views must be dropped before the buffer can be released
+        del self._read_cursor
+        del self._samples
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
@@ -4,6 +4,7 @@ from engine import (
     EngineEvent,
     STTEvent_FinalTranscription,
     STTEvent_InterimTranscription,
+    STTEvent_QoS,
     STTEvent_SpeakingStarted,
     LipSyncEvent_Viseme,
 )
@@ -14,6 +15,10 @@ class RequestPayload_StartSession(BaseModel):
     sample_rate: int
     stt_enabled: bool = True
     lipsync_enabled: bool = False
+    # Shared-memory audio ring created by the client, see audio_ring.py. Only
+    # accepted on unix socket connections.
+    shm_name: str | None = None
+    shm_capacity: int = 0
 
 
 class RequestPayload_AudioData(BaseModel):
@@ -21,12 +26,22 @@ class RequestPayload_AudioData(BaseModel):
     b64_data: str
 
 
+class RequestPayload_AudioRing(BaseModel):
+    """Audio was written to the session's shared-memory ring up to end_sample."""
+
+    type: Literal["audio_ring"] = "audio_ring"
+    end_sample: int
+
+
 class RequestPayload_EndSession(BaseModel):
     type: Literal["end_session"] = "end_session"
 
 
 RequestPayload = Annotated[
-    RequestPayload_StartSession | RequestPayload_AudioData | RequestPayload_EndSession,
+    RequestPayload_StartSession
+    | RequestPayload_AudioData
+    | RequestPayload_AudioRing
+    | RequestPayload_EndSession,
     Field(discriminator="type"),
 ]
 
@@ -41,6 +56,34 @@ class ResponsePayload_Error(BaseModel):
     message: str
 
 
+class ResponsePayload_Overloaded(BaseModel):
+    """The server rejected or dropped the session because it is out of capacity."""
+
+    type: Literal["overloaded"] = "overloaded"
+    reason: str
+
+
+class ResponsePayload_Degraded(BaseModel):
+    """The session is falling behind real-time. Sent again with degraded=False
+    once it catches up."""
+
+    type: Literal["degraded"] = "degraded"
+    degraded: bool
+    lag_s: float
+
+
+class ResponsePayload_QoS(BaseModel):
+    """Sent when the session's interim transcription rate changes under load.
+
+    level is one of FULL, REDUCED, MINIMAL or FINALS_ONLY. interim_interval_s
+    is null when interims are suspended. Finals are always sent.
+    """
+
+    type: Literal["qos"] = "qos"
+    level: str
+    interim_interval_s: float | None
+
+
 class ResponsePayload_InterimTranscription(BaseModel):
     type: Literal["interim_transcription"] = "interim_transcription"
     trans_id: int
@@ -73,6 +116,9 @@ class ResponsePayload_LipSyncViseme(BaseModel):
 
 ResponsePayload = Annotated[
     ResponsePayload_Error
+    | ResponsePayload_Overloaded
+    | ResponsePayload_Degraded
+    | ResponsePayload_QoS
     | ResponsePayload_InterimTranscription
     | ResponsePayload_SpeakingStarted
     | ResponsePayload_FinalTranscription
@@ -108,6 +154,11 @@ def engine_event_to_response_payload(
             trans_id=evt.trans_id,
             start_sample=evt.start_sample,
         )
+    elif isinstance(evt, STTEvent_QoS):
+        return ResponsePayload_QoS(
+            level=evt.level.name,
+            interim_interval_s=evt.interim_interval_s,
+        )
     elif isinstance(evt, LipSyncEvent_Viseme):
         return ResponsePayload_LipSyncViseme(
             viseme=evt.viseme.name,
@@ -6,13 +6,23 @@ from .messages import (
     Request,
     RequestPayload,
     RequestPayload_AudioData,
+    RequestPayload_AudioRing,
     RequestPayload_StartSession,
     RequestPayload_EndSession,
     Response,
     ResponsePayload,
+    ResponsePayload_Degraded,
     ResponsePayload_Error,
+    ResponsePayload_Overloaded,
     engine_event_to_response_payload,
 )
+from .admission import (
+    AdmissionController,
+    AdmissionSettings,
+    degraded_counter,
+    dropped_counter,
+)
+from .audio_ring import AudioRing
 from engine import Engine, EngineEvent
 from typing import Callable
 
@@ -21,10 +31,16 @@ logger = logging.getLogger(__name__)
 
 class SessionManager:
     def __init__(
-        self, *, engine_factory: Callable[[RequestPayload_StartSession], Engine]
+        self,
+        *,
+        engine_factory: Callable[[RequestPayload_StartSession], Engine],
+        admission: AdmissionController | None = None,
+        allow_shared_memory: bool = False,
     ):
         self._request_queue = []
         self._engine_factory = engine_factory
+        self._allow_shared_memory = allow_shared_memory
+        self._admission = admission or AdmissionController(settings=AdmissionSettings())
 
         self._session_lookup: dict[str, Session] = {}
         self._session_run_tasks: dict[str, asyncio.Task] = {}
@@ -39,6 +55,32 @@ class SessionManager:
                 logger.error(f"Session {sess_id} already exists")
                 return
 
+            ring: AudioRing | None = None
+            if request.payload.shm_name is not None:
+                try:
+                    ring = self._attach_ring(request.payload)
+                except Exception as e:
+                    logger.error(f"Failed to attach audio ring: {e}")
+                    self._output_queue.put_nowait(
+                        Response(
+                            session_id=sess_id,
+                            payload=ResponsePayload_Error(message=str(e)),
+                        )
+                    )
+                    return
+
+            reject_reason = self._admission.try_admit()
+            if reject_reason is not None:
+                if ring is not None:
+                    ring.close()
+                self._output_queue.put_nowait(
+                    Response(
+                        session_id=sess_id,
+                        payload=ResponsePayload_Overloaded(reason=reject_reason),
+                    )
+                )
+                return
+
             output_queue: asyncio.Queue[ResponsePayload | Exception | None] = (
                 asyncio.Queue()
             )
@@ -47,6 +89,8 @@ class SessionManager:
                 id=sess_id,
                 engine=eng,
                 output_queue=output_queue,
+                admission_settings=self._admission.settings,
+                ring=ring,
             )
             session_t = asyncio.create_task(session.run())
             session_send_t = asyncio.create_task(
@@ -56,6 +100,10 @@ class SessionManager:
             self._session_run_tasks[sess_id] = session_t
             self._session_send_tasks[sess_id] = session_send_t
 
+            session_t.add_done_callback(
+                lambda _: self._session_lookup.pop(sess_id, None)
+            )
+            session_t.add_done_callback(lambda _: self._admission.release())
             session_t.add_done_callback(
                 lambda _: self._session_run_tasks.pop(sess_id, None)
             )
@@ -75,6 +123,29 @@ class SessionManager:
 
         session.push_payload(request.payload)
 
+    @property
+    def session_count(self) -> int:
+        return len(self._session_lookup)
+
+    async def close(self):
+        """End every session, for when the connection is gone.
+
+        Clients don't always send end_session before disconnecting. Their
+        sessions would otherwise keep running and hold admission slots.
+        """
+        run_tasks = list(self._session_run_tasks.values())
+        for t in run_tasks:
+            t.cancel()
+        if run_tasks:
+            await asyncio.wait(run_tasks)
+        self._output_queue.put_nowait(None)
+
+    def _attach_ring(self, payload: RequestPayload_StartSession) -> AudioRing:
+        if not self._allow_shared_memory:
+            raise ValueError("Shared memory audio requires a unix socket connection")
+        assert payload.shm_name is not None
+        return AudioRing.attach(payload.shm_name, payload.shm_capacity)
+
     async def _session_send_task(
         self,
         *,
@@ -118,23 +189,75 @@ class Session:
         id: str,
         engine: Engine,
         output_queue: asyncio.Queue[ResponsePayload | Exception | None],
+        admission_settings: AdmissionSettings = AdmissionSettings(),
+        ring: AudioRing | None = None,
     ):
         engine.set_event_handler(self.engine_event)
+        self._id = id
         self._engine = engine
+        self._ring = ring
+        # End cursor of the last audio_ring message, for lag accounting
+        self._ring_end = 0
+        self._admission_settings = admission_settings
+        self._queued_samples = 0
+        self._degraded = False
         self._req_q: asyncio.Queue[RequestPayload | None] = asyncio.Queue(maxsize=1024)
         self.logger = logging.LoggerAdapter(logger, {"session_id": id})
         self._output_queue = output_queue
         self._closed = False
 
+    @property
+    def lag_s(self) -> float:
+        """Audio received from the client but not yet processed, in seconds."""
+        queued_s = self._queued_samples / self._engine.input_sample_rate
+        return queued_s + self._engine.lag_s
+
     def push_payload(self, request: RequestPayload):
         if self._closed:
             self.logger.warning("Session closed, ignoring message")
+            return
 
         try:
             self._req_q.put_nowait(request)
         except asyncio.QueueFull:
             self.logger.error("Session queue full")
             self._output_queue.put_nowait(Exception("Session Queue full"))
+            return
+
+        if isinstance(request, RequestPayload_AudioData):
+            # base64 encodes 3 bytes in 4 chars, 2 bytes per sample
+            self._queued_samples += len(request.b64_data) * 3 // 8
+            self._check_lag()
+        elif isinstance(request, RequestPayload_AudioRing):
+            self._queued_samples += max(0, request.end_sample - self._ring_end)
+            self._ring_end = max(self._ring_end, request.end_sample)
+            self._check_lag()
+
+    def _check_lag(self):
+        lag_s = self.lag_s
+        settings = self._admission_settings
+        if lag_s >= settings.max_lag_s:
+            self.logger.warning(f"Session {lag_s:.2f}s behind, dropping")
+            dropped_counter.inc()
+            self._closed = True
+            self._output_queue.put_nowait(
+                ResponsePayload_Overloaded(
+                    reason=f"session fell {lag_s:.1f}s behind real-time"
+                )
+            )
+            self._output_queue.put_nowait(None)
+        elif not self._degraded and lag_s >= settings.degraded_lag_s:
+            self.logger.warning(f"Session {lag_s:.2f}s behind real-time")
+            degraded_counter.inc()
+            self._degraded = True
+            self._output_queue.put_nowait(
+                ResponsePayload_Degraded(degraded=True, lag_s=lag_s)
+            )
+        elif self._degraded and lag_s <= settings.recovered_lag_s:
+            self._degraded = False
+            self._output_queue.put_nowait(
+                ResponsePayload_Degraded(degraded=False, lag_s=lag_s)
+            )
 
     def eos(self):
         self._closed = True
@@ -146,6 +269,27 @@ class Session:
 
     async def run(self):
         engine_t = asyncio.create_task(self._engine.run())
+        try:
+            await self._process_requests(engine_t)
+        finally:
+            # Also runs when the session is cancelled, as it is when it falls
+            # too far behind or its client disconnects. The engine loop never
+            # returns on its own.
+            engine_t.cancel()
+            await asyncio.wait([engine_t])
+            if not engine_t.cancelled() and engine_t.exception() is not None:
+                e = engine_t.exception()
+                self.logger.error(f"Engine error: {e}", exc_info=e)
+                self._output_queue.put_nowait(e)
+            try:
+                self._engine.dump_trace(self._id)
+            except Exception as e:
+                self.logger.error(f"Failed to dump trace: {e}", exc_info=True)
+            if self._ring is not None:
+                self._ring.close()
+            self._output_queue.put_nowait(None)
+
+    async def _process_requests(self, engine_t: asyncio.Task):
         while True:
             req = await self._req_q.get()
             if req is None:
@@ -156,15 +300,19 @@ class Session:
 
             if isinstance(req, RequestPayload_AudioData):
                 audio_bytes = base64.b64decode(req.b64_data)
+                self._queued_samples = max(
+                    0, self._queued_samples - len(req.b64_data) * 3 // 8
+                )
+                self._engine.push_audio(audio_bytes)
+            elif isinstance(req, RequestPayload_AudioRing):
+                if self._ring is None:
+                    self.logger.error("audio_ring message without a shared ring")
+                    continue
+                audio_bytes = self._ring.read(req.end_sample)
+                self._queued_samples = max(
+                    0, self._queued_samples - len(audio_bytes) // 2
+                )
                 self._engine.push_audio(audio_bytes)
             elif isinstance(req, RequestPayload_EndSession):
                 self.logger.info("Received end session request")
                 break
-
-        try:
-            await engine_t
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            self.logger.error(f"Engine error: {e}", exc_info=True)
-            self._output_queue.put_nowait(e)
@@ -0,0 +1,155 @@
+import logging
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkerStatus:
+    worker_id: int
+    pid: int
+    sessions: int
+    queue_depth: int
+    timestamp: float
+
+
+class WorkerReporter:
+    def __init__(self, *, worker_id: int, conn: Connection):
+        self.worker_id = worker_id
+        self._conn = conn
+
+    def report(self, *, sessions: int, queue_depth: int):
+        try:
+            self._conn.send(
+                WorkerStatus(
+                    worker_id=self.worker_id,
+                    pid=os.getpid(),
+                    sessions=sessions,
+                    queue_depth=queue_depth,
+                    timestamp=time.time(),
+                )
+            )
+        except (BrokenPipeError, OSError):
+            logger.warning("Supervisor connection lost")
+
+
+@dataclass
+class _Worker:
+    process: BaseProcess
+    conn: Connection
+    started_at: float
+    status: WorkerStatus | None = None
+
+
+class Supervisor:
+    """Runs N worker processes that share a listening port via SO_REUSEPORT.
+
+    Each worker loads its own models and serves whole websocket connections,
+    so every session stays pinned to the worker that accepted it. Workers
+    report health and load over a pipe and are restarted if they exit or
+    stop reporting.
+    """
+
+    def __init__(
+        self,
+        *,
+        num_workers: int,
+        target: Callable[[int, Connection], None],
+        startup_timeout_s: float = 300.0,
+        health_timeout_s: float = 15.0,
+        log_interval_s: float = 10.0,
+    ):
+        self._num_workers = num_workers
+        self._target = target
+        self._startup_timeout_s = startup_timeout_s
+        self._health_timeout_s = health_timeout_s
+        self._log_interval_s = log_interval_s
+        # spawn so CUDA and onnxruntime state are never inherited through fork
+        self._ctx = multiprocessing.get_context("spawn")
+        self._workers: dict[int, _Worker] = {}
+
+    def _start_worker(self, worker_id: int):
+        parent_conn, child_conn = self._ctx.Pipe(duplex=False)
+        process = self._ctx.Process(
+            target=self._target,
+            args=(worker_id, child_conn),
+            name=f"gabber-stt-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._workers[worker_id] = _Worker(
+            process=process, conn=parent_conn, started_at=time.time()
+        )
+        logger.info(f"Started worker {worker_id} (pid {process.pid})")
+
+    def _stop_worker(self, worker_id: int):
+        worker = self._workers.pop(worker_id)
+        if worker.process.is_alive():
+            worker.process.terminate()
+        worker.process.join(timeout=5)
+        worker.conn.close()
+
+    def _check_health(self):
+        now = time.time()
+        for worker_id, worker in list(self._workers.items()):
+            if not worker.process.is_alive():
+                logger.error(
+                    f"Worker {worker_id} exited with code {worker.process.exitcode}"
+                )
+            elif worker.status is None:
+                if now - worker.started_at < self._startup_timeout_s:
+                    continue
+                logger.error(f"Worker {worker_id} did not become ready")
+            elif now - worker.status.timestamp > self._health_timeout_s:
+                logger.error(f"Worker {worker_id} stopped reporting")
+            else:
+                continue
+
+            self._stop_worker(worker_id)
+            self._start_worker(worker_id)
+
+    def _log_load(self):
+        statuses = [w.status for w in self._workers.values() if w.status]
+        total = sum(s.sessions for s in statuses)
+        per_worker = ", ".join(
+            f"{s.worker_id}:{s.sessions}s/{s.queue_depth}q"
+            for s in sorted(statuses, key=lambda s: s.worker_id)
+        )
+        logger.info(
+            f"{len(statuses)}/{self._num_workers} workers ready, "
+            f"{total} sessions [{per_worker}]"
+        )
+
+    @property
+    def statuses(self) -> list[WorkerStatus]:
+        return [w.status for w in self._workers.values() if w.status is not None]
+
+    def run(self):
+        for worker_id in range(self._num_workers):
+            self._start_worker(worker_id)
+
+        last_log = time.time()
+        try:
+            while True:
+                conns = {w.conn: w for w in self._workers.values()}
+                for conn in wait(list(conns.keys()), timeout=1.0):
+                    try:
+                        status: WorkerStatus = conn.recv()  # type: ignore
+                        conns[conn].status = status  # type: ignore
+                    except EOFError:
+                        pass
+
+                self._check_health()
+                if time.time() - last_log >= self._log_interval_s:
+                    self._log_load()
+                    last_log = time.time()
+        finally:
+            for worker_id in list(self._workers.keys()):
+                self._stop_worker(worker_id)
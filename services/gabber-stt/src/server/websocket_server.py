@@ -1,9 +1,13 @@
 import asyncio
 import json
 import logging
+import socket
 
 from aiohttp import web
 
+from core import REGISTRY
+
+from .admission import AdmissionController, AdmissionSettings
 from .messages import Request, RequestPayload_StartSession
 from .session import SessionManager
 from engine import Engine
@@ -14,23 +18,53 @@ logger = logging.getLogger(__name__)
 
 class WebSocketServer:
     def __init__(
-        self, *, engine_factory: Callable[[RequestPayload_StartSession], Engine]
+        self,
+        *,
+        engine_factory: Callable[[RequestPayload_StartSession], Engine],
+        admission: AdmissionController | None = None,
+        serve_metrics: bool = True,
     ):
+        """serve_metrics adds /metrics next to the websocket endpoint. Worker
+        processes turn it off, since any worker could answer a scrape of the
+        shared port, and serve their metrics on their own port instead."""
         self.engine_factory = engine_factory
+        # Shared by every connection so limits apply server-wide
+        self.admission = admission or AdmissionController(settings=AdmissionSettings())
+        self._session_managers: set[SessionManager] = set()
         self.app = web.Application()
         self.app.router.add_get("/", self.endpoint)
+        if serve_metrics:
+            self.app.router.add_get("/metrics", self.metrics_endpoint)
+
+    async def metrics_endpoint(self, request):
+        return web.Response(
+            text=REGISTRY.render_prometheus(),
+            content_type="text/plain; version=0.0.4",
+        )
 
     async def endpoint(self, request):
         ws = web.WebSocketResponse()
         await ws.prepare(request)
+        # Shared memory is only offered to clients proven to be on this host
+        sock = None
+        if request.transport is not None:
+            sock = request.transport.get_extra_info("socket")
+        is_unix = sock is not None and sock.family == socket.AF_UNIX
         try:
-            await self.handle(ws)
+            await self.handle(ws, allow_shared_memory=is_unix)
         finally:
             await ws.close()
         return ws
 
-    async def handle(self, ws: web.WebSocketResponse):
-        session_manager = SessionManager(engine_factory=self.engine_factory)
+    async def handle(
+        self, ws: web.WebSocketResponse, allow_shared_memory: bool = False
+    ):
+        session_manager = SessionManager(
+            engine_factory=self.engine_factory,
+            admission=self.admission,
+            allow_shared_memory=allow_shared_memory,
+        )
+        self._session_managers.add(session_manager)
 
         async def send_task():
             async for message in session_manager:
@@ -53,12 +87,14 @@ class WebSocketServer:
         recv_t = asyncio.create_task(recv_task())
 
         try:
-            await asyncio.gather(send_t, recv_t)
+            await recv_t
         except Exception as e:
             logging.error(f"WebSocket error: {e}")
 
+        # The client has disconnected. Nothing else would end its sessions.
+        await session_manager.close()
         send_t.cancel()
-        recv_t.cancel()
+        self._session_managers.discard(session_manager)
 
         try:
             await send_t
@@ -67,19 +103,44 @@ class WebSocketServer:
         except Exception as e:
             logging.error(f"Send task error: {e}", exc_info=True)
 
-        try:
-            await recv_t
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            logging.error(f"Receive task error: {e}", exc_info=True)
+    @property
+    def session_count(self) -> int:
+        return sum(sm.session_count for sm in self._session_managers)
+
+    async def run(
+        self,
+        host="0.0.0.0",
+        port=7004,
+        reuse_port: bool = False,
+        uds: str | socket.socket | None = None,
+        metrics_port: int | None = None,
+    ):
+        """Serve on TCP and, if uds is given, also on a unix socket.
 
-    async def run(self, host="0.0.0.0", port=7004):
+        uds is either a path to bind or an already listening socket shared
+        between worker processes. metrics_port serves /metrics on a port of
+        its own.
+        """
         runner = web.AppRunner(self.app)
         await runner.setup()
-        site = web.TCPSite(runner, host, port)
+        site = web.TCPSite(runner, host, port, reuse_port=reuse_port)
         print(f"Starting editor server on [::]:{port}")
         await site.start()
+        runners = [runner]
+        if metrics_port is not None:
+            metrics_app = web.Application()
+            metrics_app.router.add_get("/metrics", self.metrics_endpoint)
+            metrics_runner = web.AppRunner(metrics_app)
+            await metrics_runner.setup()
+            await web.TCPSite(metrics_runner, host, metrics_port).start()
+            runners.append(metrics_runner)
+            logger.info(f"Serving metrics on port {metrics_port}")
+        if isinstance(uds, str):
+            await web.UnixSite(runner, uds).start()
+            logger.info(f"Listening on unix socket {uds}")
+        elif uds is not None:
+            await web.SockSite(runner, uds).start()
+            logger.info(f"Listening on shared unix socket {uds.getsockname()}")
 
         # Keep the server running
         try:
@@ -90,9 +151,10 @@ class WebSocketServer:
         except Exception as e:
             logger.error(f"Error in editor server: {e}", exc_info=True)
 
-        try:
-            await runner.cleanup()
-        except Exception as e:
-            logger.error(f"Error during editor server cleanup: {e}", exc_info=True)
+        for r in runners:
+            try:
+                await r.cleanup()
+            except Exception as e:
+                logger.error(f"Error during editor server cleanup: {e}", exc_info=True)
 
         logger.info("Editor server has been shut down.")
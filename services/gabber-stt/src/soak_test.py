@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import json
+import logging
+import time
+import wave
+
+import numpy as np
+from load_test import LoadTestClient
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Ramp sessions past capacity and report admission behaviour"
+    )
+    parser.add_argument("wav", help="16-bit mono speech file, looped per session")
+    parser.add_argument("--url", default="ws://127.0.0.1:7004")
+    parser.add_argument("--max-sessions", type=int, default=256)
+    parser.add_argument(
+        "--ramp-interval", type=float, default=0.5, help="Seconds between new sessions"
+    )
+    parser.add_argument("--hold", type=float, default=60.0)
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    parser.add_argument(
+        "--reconnect-hold",
+        type=float,
+        default=5.0,
+        help="Seconds to hold the sessions reopened after every client disconnected",
+    )
+    args = parser.parse_args()
+
+    with wave.open(args.wav, "rb") as wf:
+        sample_rate = wf.getframerate()
+        audio = wf.readframes(wf.getnframes())
+
+    clients: list[LoadTestClient] = []
+    tasks: list[asyncio.Task] = []
+    start = time.monotonic()
+    ramp_duration = args.max_sessions * args.ramp_interval
+    duration = ramp_duration + args.hold
+
+    async def report():
+        while True:
+            await asyncio.sleep(args.report_interval)
+            lags = np.array([lag for c in clients for lag in c.lags[-50:]])
+            print(
+                json.dumps(
+                    {
+                        "t_s": round(time.monotonic() - start, 1),
+                        "attempted": len(clients),
+                        "rejected": sum(1 for c in clients if c.rejected),
+                        "degraded": sum(1 for c in clients if c.degraded_count > 0),
+                        "recent_lag_p95_s": (
+                            float(np.percentile(lags, 95)) if lags.size else None
+                        ),
+                    }
+                )
+            )
+
+    report_t = asyncio.create_task(report())
+    for i in range(args.max_sessions):
+        client = LoadTestClient(url=args.url, audio=audio, sample_rate=sample_rate)
+        clients.append(client)
+        remaining = duration - (time.monotonic() - start)
+        tasks.append(asyncio.create_task(client.run(remaining)))
+        await asyncio.sleep(args.ramp_interval)
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    report_t.cancel()
+
+    accepted = [c for c in clients if not c.rejected]
+    lags = np.array([lag for c in accepted for lag in c.lags])
+
+    # The clients disconnected without sending end_session. The server must still
+    # end their sessions and release their admission slots, so as many sessions
+    # as were accepted get admitted again.
+    reconnected = [
+        LoadTestClient(url=args.url, audio=audio, sample_rate=sample_rate)
+        for _ in accepted
+    ]
+    await asyncio.gather(
+        *(c.run(args.reconnect_hold) for c in reconnected), return_exceptions=True
+    )
+    print(
+        json.dumps(
+            {
+                "attempted": len(clients),
+                "accepted": len(accepted),
+                "rejected": len(clients) - len(accepted),
+                "errors": sum(1 for r in results if isinstance(r, Exception)),
+                "degraded_sessions": sum(1 for c in accepted if c.degraded_count > 0),
+                "accepted_lag_p50_s": (
+                    float(np.percentile(lags, 50)) if lags.size else None
+                ),
+                "accepted_lag_p95_s": (
+                    float(np.percentile(lags, 95)) if lags.size else None
+                ),
+                "rejected_after_disconnect": sum(1 for c in reconnected if c.rejected),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,175 @@
+# Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
+# SPDX-License-Identifier: SUL-1.0
+
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+
+SENTENCES = [
+    "Hello there, thanks for calling in today.",
+    "I can help you with your order or your account.",
+    "Let me pull up the details for you right now.",
+    "It looks like your package shipped yesterday afternoon.",
+    "The tracking number should be in your inbox.",
+    "Delivery is expected by Thursday at the latest.",
+    "If it is late you can reply to that email.",
+    "We will send a replacement at no extra cost.",
+    "Is there anything else I can help you with?",
+    "Thanks again and have a wonderful day.",
+]
+
+# 20ms at 24kHz, 16-bit
+FIRST_CHUNK_BYTES = 960
+
+
+async def run_response(
+    http: aiohttp.ClientSession, url: str, voice: str, concurrency: int
+) -> dict:
+    """Synthesize SENTENCES the way the KittenTTS node does, with up to
+    concurrency requests in flight and audio consumed in sentence order."""
+    start = time.perf_counter()
+    first_audio: float | None = None
+    in_flight = asyncio.Semaphore(concurrency)
+    received = [asyncio.Queue[bytes | None]() for _ in SENTENCES]
+
+    async def synthesize(i: int, text: str):
+        try:
+            async with http.post(url, json={"text": text, "voice": voice}) as resp:
+                resp.raise_for_status()
+                async for data in resp.content.iter_any():
+                    received[i].put_nowait(data)
+        finally:
+            received[i].put_nowait(None)
+            in_flight.release()
+
+    async def generate():
+        tasks = []
+        for i, text in enumerate(SENTENCES):
+            await in_flight.acquire()
+            tasks.append(asyncio.create_task(synthesize(i, text)))
+        await asyncio.gather(*tasks)
+
+    gen_t = asyncio.create_task(generate())
+    total_bytes = 0
+    for q in received:
+        while (data := await q.get()) is not None:
+            total_bytes += len(data)
+            if first_audio is None and total_bytes >= FIRST_CHUNK_BYTES:
+                first_audio = time.perf_counter() - start
+    await gen_t
+
+    wall = time.perf_counter() - start
+    return {
+        "time_to_first_audio_s": first_audio,
+        "wall_time_s": wall,
+        "audio_s": total_bytes / 2 / 24000,
+    }
+
+
+async def run_client(
+    http: aiohttp.ClientSession,
+    url: str,
+    voice: str,
+    stream: bool,
+    end: float,
+    ttfbs: list[float],
+) -> float:
+    """Request two-sentence utterances back to back until end, returning the
+    seconds of audio received."""
+    audio_bytes = 0
+    i = 0
+    while time.perf_counter() < end:
+        text = f"{SENTENCES[i % len(SENTENCES)]} {SENTENCES[(i + 1) % len(SENTENCES)]}"
+        i += 1
+        start = time.perf_counter()
+        first = True
+        async with http.post(
+            url, json={"text": text, "voice": voice, "stream": stream}
+        ) as resp:
+            resp.raise_for_status()
+            async for data in resp.content.iter_any():
+                if first:
+                    ttfbs.append(time.perf_counter() - start)
+                    first = False
+                audio_bytes += len(data)
+    return audio_bytes / 2 / 24000
+
+
+async def run_load(
+    http: aiohttp.ClientSession,
+    url: str,
+    voice: str,
+    clients: int,
+    duration_s: float,
+    stream: bool,
+) -> dict:
+    ttfbs: list[float] = []
+    start = time.perf_counter()
+    audio_s = await asyncio.gather(
+        *(
+            run_client(http, url, voice, stream, start + duration_s, ttfbs)
+            for _ in range(clients)
+        )
+    )
+    wall = time.perf_counter() - start
+    ttfbs.sort()
+    return {
+        "clients": clients,
+        "stream": stream,
+        "requests": len(ttfbs),
+        "ttfb_p50_s": round(ttfbs[len(ttfbs) // 2], 3),
+        "ttfb_p95_s": round(ttfbs[int(len(ttfbs) * 0.95)], 3),
+        "audio_s_per_s": round(sum(audio_s) / wall, 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Time-to-first-audio and wall time for a 10-sentence response,"
+        " or with --clients time-to-first-byte and throughput under load"
+    )
+    parser.add_argument("--url", default="http://localhost:7003/tts")
+    parser.add_argument("--uds", default=None)
+    parser.add_argument("--voice", default="expr-voice-2-m")
+    parser.add_argument("--concurrency", default="1,2,3,4")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--clients", type=int, default=0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    args = parser.parse_args()
+
+    connector = aiohttp.UnixConnector(path=args.uds) if args.uds else None
+    async with aiohttp.ClientSession(connector=connector) as http:
+        if args.clients > 0:
+            for stream in (False, True):
+                res = await run_load(
+                    http, args.url, args.voice, args.clients, args.duration, stream
+                )
+                print(json.dumps(res))
+            return
+
+        # Warm the model and the connection pool
+        await run_response(http, args.url, args.voice, 1)
+        for k in [int(v) for v in args.concurrency.split(",")]:
+            runs = [
+                await run_response(http, args.url, args.voice, k)
+                for _ in range(args.repeats)
+            ]
+            print(
+                json.dumps(
+                    {
+                        "concurrency": k,
+                        "time_to_first_audio_s": round(
+                            min(r["time_to_first_audio_s"] or 0 for r in runs), 3
+                        ),
+                        "wall_time_s": round(min(r["wall_time_s"] for r in runs), 3),
+                        "audio_s": round(runs[0]["audio_s"], 3),
+                    }
+                )
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
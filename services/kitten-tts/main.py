@@ -1,9 +1,16 @@
 # Copyright 2025 Fluently AI, Inc. DBA Gabber. All rights reserved.
 # SPDX-License-Identifier: SUL-1.0
 
+import asyncio
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
 from kittentts import KittenTTS
 from fastapi import FastAPI, Body, Response
-from starlette.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import numpy as np
 import uvicorn
@@ -12,26 +19,175 @@ m = KittenTTS("KittenML/kitten-tts-nano-0.1")
 
 app = FastAPI()
 
+# Phrases longer than this are split at commas as well as sentence ends
+MAX_PHRASE_CHARS = 120
+MAX_BATCH = int(os.environ.get("KITTEN_TTS_MAX_BATCH", "8"))
+# How long the batcher waits for more requests once one arrives
+BATCH_WAIT_S = float(os.environ.get("KITTEN_TTS_BATCH_WAIT_S", "0.005"))
+
 
 class TTSRequest(BaseModel):
     text: str
     voice: str
+    # Emit PCM per phrase as it is synthesized instead of once at the end
+    stream: bool = True
+
+
+@dataclass
+class _Job:
+    text: str
+    voice: str
+    fut: asyncio.Future[np.ndarray] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class TTSBatcher:
+    """Runs model calls on one inference thread, grouping whatever requests
+    arrived together.
+
+    Backends with a generate_batch(texts, voices) method get the whole group
+    in one call. Otherwise the group runs back to back in a single thread
+    hop, which still avoids concurrent requests oversubscribing the CPU.
+    Streams submit one phrase at a time, so concurrent streams interleave and
+    each gets its first phrase early.
+    """
+
+    def __init__(self, model, *, max_batch: int, wait_s: float):
+        self._model = model
+        self._max_batch = max_batch
+        self._wait_s = wait_s
+        self._queue: asyncio.Queue[_Job] = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._run_t: asyncio.Task | None = None
+
+    async def generate(self, text: str, voice: str) -> np.ndarray:
+        if self._run_t is None:
+            self._run_t = asyncio.create_task(self._run())
+        job = _Job(text=text, voice=voice)
+        self._queue.put_nowait(job)
+        return await job.fut
+
+    def _generate_batch(self, batch: list[_Job], loop: asyncio.AbstractEventLoop):
+        generate_batch = getattr(self._model, "generate_batch", None)
+        if generate_batch is not None and len(batch) > 1:
+            try:
+                results = generate_batch(
+                    [j.text for j in batch], [j.voice for j in batch]
+                )
+            except Exception as e:
+                logging.error(f"TTS batch failed: {e}", exc_info=True)
+                for job in batch:
+                    loop.call_soon_threadsafe(self._reject, job, e)
+                return
+            for job, audio in zip(batch, results):
+                loop.call_soon_threadsafe(self._resolve, job, audio)
+            return
+
+        # Resolve each job as it finishes so the first in a group is not held
+        # back by the rest
+        for job in batch:
+            try:
+                audio = self._model.generate(job.text, voice=job.voice)
+            except Exception as e:
+                logging.error(f"TTS generation failed: {e}", exc_info=True)
+                loop.call_soon_threadsafe(self._reject, job, e)
+                continue
+            loop.call_soon_threadsafe(self._resolve, job, audio)
+
+    @staticmethod
+    def _resolve(job: _Job, audio: np.ndarray):
+        if not job.fut.done():
+            job.fut.set_result(audio)
+
+    @staticmethod
+    def _reject(job: _Job, e: Exception):
+        if not job.fut.done():
+            job.fut.set_exception(e)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            if self._wait_s > 0 and self._queue.empty():
+                await asyncio.sleep(self._wait_s)
+            while len(batch) < self._max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Skip phrases whose request went away while they were queued
+            batch = [job for job in batch if not job.fut.cancelled()]
+            if not batch:
+                continue
+            await loop.run_in_executor(
+                self._executor, self._generate_batch, batch, loop
+            )
+
+
+batcher = TTSBatcher(m, max_batch=MAX_BATCH, wait_s=BATCH_WAIT_S)
+
+
+def split_phrases(text: str) -> list[str]:
+    sentences = [s for s in re.split(r"(?<=[.!?;:])\s+", text.strip()) if s]
+    phrases: list[str] = []
+    for sentence in sentences:
+        if len(sentence) <= MAX_PHRASE_CHARS:
+            phrases.append(sentence)
+            continue
+        current = ""
+        for part in re.split(r"(?<=,)\s+", sentence):
+            if current and len(current) + len(part) > MAX_PHRASE_CHARS:
+                phrases.append(current)
+                current = ""
+            current = f"{current} {part}" if current else part
+        if current:
+            phrases.append(current)
+    return phrases or [text]
+
+
+def to_pcm(audio: np.ndarray) -> bytes:
+    # 16-bit PCM is always an even number of bytes
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
 
 
 @app.post("/tts")
 async def tts(request: TTSRequest = Body(...)):
-    audio = await run_in_threadpool(
-        lambda: m.generate(request.text, voice=request.voice)
-    )
+    phrases = split_phrases(request.text)
+
+    if not request.stream:
+        audio = await asyncio.gather(
+            *(batcher.generate(p, request.voice) for p in phrases)
+        )
+        return Response(
+            content=b"".join(to_pcm(a) for a in audio),
+            media_type="audio/l16;rate=24000",
+        )
+
+    async def stream():
+        # Next phrase is queued while the current one is being sent
+        next_t = asyncio.ensure_future(batcher.generate(phrases[0], request.voice))
+        try:
+            for i in range(len(phrases)):
+                audio = await next_t
+                if i + 1 < len(phrases):
+                    next_t = asyncio.ensure_future(
+                        batcher.generate(phrases[i + 1], request.voice)
+                    )
+                yield to_pcm(audio)
+        finally:
+            # The client disconnected mid-stream
+            next_t.cancel()
+
+    return StreamingResponse(stream(), media_type="audio/l16;rate=24000")
 
-    # Convert to 16-bit PCM (2 bytes per sample, ensuring byte length is divisible by 2)
-    audio_int16 = (audio * 32767).astype(np.int16)
-    audio_bytes = audio_int16.tobytes()
-    if len(audio_bytes) % 2 != 0:
-        audio_bytes += b"\x00"
 
-    return Response(content=audio_bytes, media_type="audio/l16;rate=24000")
+async def serve():
+    configs = [uvicorn.Config(app, host="0.0.0.0", port=7003)]
+    # Co-located clients can skip TCP by setting the same path on both ends
+    uds = os.environ.get("KITTEN_TTS_UDS")
+    if uds:
+        configs.append(uvicorn.Config(app, uds=uds))
+    await asyncio.gather(*(uvicorn.Server(c).serve() for c in configs))
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=7003)
+    asyncio.run(serve())
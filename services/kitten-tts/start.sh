@@ -9,8 +9,16 @@ docker rm kitten-tts
 
 docker build --tag kitten-tts:latest "$BASEDIR"
 
+# Optionally also serve on a unix socket, e.g. KITTEN_TTS_UDS=/tmp/gabber/kitten-tts.sock
+UDS_ARGS=()
+if [ -n "$KITTEN_TTS_UDS" ]; then
+  mkdir -p "$(dirname "$KITTEN_TTS_UDS")"
+  UDS_ARGS=(-v "$(dirname "$KITTEN_TTS_UDS")":"$(dirname "$KITTEN_TTS_UDS")" -e KITTEN_TTS_UDS="$KITTEN_TTS_UDS")
+fi
+
 docker run \
   --name kitten-tts \
   -p 127.0.0.1:7003:7003 \
   -v ~/.cache/huggingface:/root/.cache/huggingface \
+  "${UDS_ARGS[@]}" \
     kitten-tts:latest
\ No newline at end of file
@@ -11,16 +11,27 @@ docker rm local-llm
 
 docker build --tag local-llm:latest "$BASEDIR"
 
+# Optionally serve on a unix socket, e.g. LOCAL_LLM_UDS=/tmp/gabber/local-llm.sock
+UDS_ARGS=()
+UDS_MOUNT=()
+if [ -n "$LOCAL_LLM_UDS" ]; then
+  mkdir -p "$(dirname "$LOCAL_LLM_UDS")"
+  UDS_MOUNT=(-v "$(dirname "$LOCAL_LLM_UDS")":"$(dirname "$LOCAL_LLM_UDS")")
+  UDS_ARGS=(--uds "$LOCAL_LLM_UDS")
+fi
+
 # Run the new container
 docker run \
   --name local-llm \
   --gpus all \
   -v ~/.cache/huggingface:/root/.cache/huggingface \
   -v ~/.cache/vllm:/root/.cache/vllm \
+  "${UDS_MOUNT[@]}" \
   --network host \
   local-llm:latest \
   --model "$MODEL" \
   --port 7002 \
+  "${UDS_ARGS[@]}" \
   --gpu-memory-utilization 0.9 \
   --max-model-len 32000 \
   --enable-auto-tool-choice \
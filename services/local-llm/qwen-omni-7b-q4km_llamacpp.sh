@@ -4,6 +4,8 @@
 
 
 LLAMA_SERVER_PATH=${LLAMA_SERVER_PATH:-llama-server}
+# llama-server binds a unix socket when the host ends in .sock
+LLM_HOST=${LOCAL_LLM_UDS:-0.0.0.0}
 
  $LLAMA_SERVER_PATH \
   --hf-repo unsloth/Qwen2.5-Omni-7B-GGUF \
@@ -13,4 +15,4 @@ LLAMA_SERVER_PATH=${LLAMA_SERVER_PATH:-llama-server}
   -np 4 \
   -c 16384 \
   --port 7002 \
-  --host 0.0.0.0
+  --host "$LLM_HOST"